@@ -3,6 +3,7 @@ import strawberry
 
 from typing import Optional, List
 from strawberry.schema.config import StrawberryConfig
+from strawberry.types import Info
 from sdrdm_database.graphql import prepare_graphql
 
 # Prepare a single query
@@ -14,8 +15,8 @@ model = model_registry["Root"]
 @strawberry.type
 class Query:
     @strawberry.field
-    def roots(self, id: Optional[str] = None) -> List[model]:
-        return resolver_fun(id=id)
+    async def roots(self, info: Info, id: Optional[str] = None) -> List[model]:
+        return await resolver_fun(id=id, info=info)
 
 
 schema = strawberry.Schema(
@@ -4,6 +4,10 @@ import os
 from .dbconnector import DBConnector
 from .dbconnector import SupportedBackends
 from .tablecreator import create_tables
+from .tablecreator import TableIndex
+from .arrays import ArrayStorage
+from .blobstore import BlobStore, LocalBlobStore
+from .migration import plan_migration, apply_migration
 from .commands import PostgresCommands, MySQLCommands
 
 ibis.options.interactive = True  # type: ignore
@@ -0,0 +1,117 @@
+import io
+import numpy
+
+from enum import Enum
+from typing import Any, List, Union
+
+# Upper bound of the NPY header, which is parsed from a copy of the leading bytes
+_HEADER_LIMIT = 2**16
+
+
+class ArrayStorage(str, Enum):
+    """Storage layouts of list attributes with primitive values.
+
+    TABLE stores one row per value in a sub table. NATIVE stores all values
+    of a list in a single array column of the parent table, which is only
+    supported by PostgreSQL and DuckDB. BINARY stores numeric and boolean
+    lists as a single NPY-encoded binary column of the parent table.
+    """
+
+    TABLE = "table"
+    NATIVE = "native"
+    BINARY = "binary"
+
+
+def encode_array(array: Any) -> bytes:
+    """Encodes an array into the NPY format, which includes its dtype and shape.
+
+    Args:
+        array (Any): An array or a sequence of numeric or boolean values.
+
+    Returns:
+        bytes: The encoded array.
+
+    Raises:
+        ValueError: If the array holds objects, which would require pickling.
+    """
+
+    buffer = io.BytesIO()
+    numpy.lib.format.write_array(buffer, numpy.asarray(array), allow_pickle=False)
+
+    return buffer.getvalue()
+
+
+def decode_array(data: Union[bytes, memoryview]) -> numpy.ndarray:
+    """Decodes an NPY-encoded array without copying its data.
+
+    The returned array is a read-only view on the given buffer. Only the
+    header is copied, thus memory-mapped buffers are read lazily.
+
+    Args:
+        data (Union[bytes, memoryview]): The encoded array.
+
+    Returns:
+        numpy.ndarray: The decoded array.
+
+    Raises:
+        ValueError: If the data is not NPY-encoded or holds objects.
+    """
+
+    stream = io.BytesIO(memoryview(data)[:_HEADER_LIMIT])
+    version = numpy.lib.format.read_magic(stream)
+
+    if version == (1, 0):
+        header = numpy.lib.format.read_array_header_1_0(stream)
+    elif version == (2, 0):
+        header = numpy.lib.format.read_array_header_2_0(stream)
+    else:
+        raise ValueError(f"NPY format version {version} is not supported.")
+
+    shape, fortran_order, dtype = header
+
+    if dtype.hasobject:
+        raise ValueError("Arrays of objects can not be decoded without pickling.")
+
+    array = numpy.frombuffer(
+        data,
+        dtype=dtype,
+        count=int(numpy.prod(shape)),
+        offset=stream.tell(),
+    )
+
+    return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+def decode_list(value: Any) -> List[Any]:
+    """Converts the value of an inline list column into a list.
+
+    Args:
+        value (Any): An NPY-encoded array, a native array or None.
+
+    Returns:
+        List[Any]: The values of the list.
+    """
+
+    if value is None:
+        return []
+
+    if isinstance(value, (bytes, memoryview)):
+        return decode_array(value).tolist()
+
+    return numpy.asarray(value).tolist()
+
+
+def is_ndarray(dtype: Any) -> bool:
+    """Checks whether a type is numpy.ndarray or a union including it.
+
+    Args:
+        dtype (Any): The type to check.
+
+    Returns:
+        bool: Whether values of the type are arrays.
+    """
+
+    if dtype is numpy.ndarray:
+        return True
+
+    return any(arg is numpy.ndarray for arg in getattr(dtype, "__args__", ()))
@@ -0,0 +1,228 @@
+import hashlib
+import mmap
+import os
+import tempfile
+
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+# Payloads of at least this size are moved to the blob store
+DEFAULT_BLOB_THRESHOLD = 64 * 1024
+
+# Values starting with this marker are either references or escaped payloads
+BLOB_MARKER = b"sdrdm-blob:"
+
+# Columns of offloaded payloads hold this prefix followed by the content hash
+BLOB_REFERENCE_PREFIX = BLOB_MARKER + b"sha256:"
+
+# Inline payloads that start with the marker are escaped by this prefix
+BLOB_INLINE_PREFIX = BLOB_MARKER + b"inline:"
+
+
+class BlobStore(ABC):
+    """Content-addressed storage for large binary and array values.
+
+    Values of at least 'threshold' bytes are stored under their SHA-256 hash,
+    such that the column only holds a short reference and identical payloads
+    are stored once. Smaller values remain inline (see 'encode_blob').
+
+    Args:
+        threshold (int, optional): Minimum size of offloaded values in bytes. Defaults to DEFAULT_BLOB_THRESHOLD.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_BLOB_THRESHOLD):
+        if threshold < 1:
+            raise ValueError(f"Threshold must be positive, got {threshold}")
+
+        self.threshold = threshold
+
+    @abstractmethod
+    def put(self, key: str, data: bytes):
+        """Stores a payload under its content hash, unless it already exists."""
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Union[bytes, memoryview]:
+        """Returns the payload stored under the given content hash."""
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Checks whether a payload is stored under the given content hash."""
+        pass
+
+    def offload(self, data: bytes) -> bytes:
+        """Stores a payload if it exceeds the threshold.
+
+        Args:
+            data (bytes): The payload to store.
+
+        Returns:
+            bytes: A reference to the stored payload or the payload itself, if it is small.
+        """
+
+        if len(data) < self.threshold:
+            return _escape(data)
+
+        key = hashlib.sha256(data).hexdigest()
+
+        if not self.exists(key):
+            self.put(key, data)
+
+        return BLOB_REFERENCE_PREFIX + key.encode("ascii")
+
+    def resolve(self, value: Union[bytes, memoryview]) -> Union[bytes, memoryview]:
+        """Returns the payload of a reference, or the value itself if it is inline.
+
+        Args:
+            value (Union[bytes, memoryview]): The value of a column.
+
+        Returns:
+            Union[bytes, memoryview]: The payload.
+        """
+
+        return decode_blob(value, blob_store=self)
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store that keeps payloads as files in a local directory.
+
+    Payloads are sharded by the first two characters of their hash and are
+    memory-mapped on read, thus only the pages that are accessed are loaded.
+
+    Example:
+
+        >>> store = LocalBlobStore("./blobs", threshold=1024)
+        >>> db = DBConnector(..., blob_store=store)
+
+    Args:
+        path (str): Directory of the payloads.
+        threshold (int, optional): Minimum size of offloaded values in bytes. Defaults to DEFAULT_BLOB_THRESHOLD.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold: int = DEFAULT_BLOB_THRESHOLD,
+    ):
+        super().__init__(threshold=threshold)
+        self.path = os.path.expanduser(path)
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def put(self, key: str, data: bytes):
+        """Writes a payload atomically, such that concurrent writers of the same payload do not conflict."""
+
+        path = self._blob_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def get(self, key: str) -> memoryview:
+        """Returns a read-only memory map of a payload."""
+
+        path = self._blob_path(key)
+
+        if not os.path.exists(path):
+            raise KeyError(f"Blob '{key}' does not exist in '{self.path}'")
+
+        with open(path, "rb") as f:
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._blob_path(key))
+
+
+def encode_blob(data: bytes, blob_store: Optional[BlobStore] = None) -> bytes:
+    """Converts a payload into the value of its column.
+
+    Large payloads are replaced by a reference, if a store is given. Inline
+    payloads that happen to start with the marker of references are escaped,
+    such that every stored value is decoded unambiguously.
+
+    Args:
+        data (bytes): The payload.
+        blob_store (Optional[BlobStore], optional): Store of large payloads. Defaults to None.
+
+    Returns:
+        bytes: The value of the column.
+    """
+
+    if blob_store is None:
+        return _escape(data)
+
+    return blob_store.offload(data)
+
+
+def decode_blob(
+    value: Union[bytes, memoryview],
+    blob_store: Optional[BlobStore] = None,
+) -> Union[bytes, memoryview]:
+    """Converts the value of a column into its payload.
+
+    Args:
+        value (Union[bytes, memoryview]): The value of the column.
+        blob_store (Optional[BlobStore], optional): Store to fetch referenced payloads from. Defaults to None.
+
+    Returns:
+        Union[bytes, memoryview]: The payload.
+
+    Raises:
+        ValueError: If the value is a reference, but no store is given.
+        KeyError: If the referenced payload does not exist in the store.
+    """
+
+    if _has_prefix(value, BLOB_INLINE_PREFIX):
+        return value[len(BLOB_INLINE_PREFIX) :]
+
+    key = blob_key(value)
+
+    if key is None:
+        return value
+    elif blob_store is None:
+        raise ValueError(
+            f"Value references blob '{key}', but no blob store is configured. "
+            f"Pass the store the data was written with as 'blob_store'."
+        )
+
+    return blob_store.get(key)
+
+
+def blob_key(value) -> Optional[str]:
+    """Returns the content hash of a blob reference.
+
+    Args:
+        value: The value of a column.
+
+    Returns:
+        Optional[str]: The content hash or None, if the value is not a reference.
+    """
+
+    if not _has_prefix(value, BLOB_REFERENCE_PREFIX):
+        return None
+
+    return bytes(value[len(BLOB_REFERENCE_PREFIX) :]).decode("ascii")
+
+
+def _has_prefix(value, prefix: bytes) -> bool:
+    if not isinstance(value, (bytes, memoryview)):
+        return False
+
+    return bytes(value[: len(prefix)]) == prefix
+
+
+def _escape(data: bytes) -> bytes:
+    if _has_prefix(data, BLOB_MARKER):
+        return BLOB_INLINE_PREFIX + bytes(data)
+
+    return data
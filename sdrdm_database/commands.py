@@ -1,115 +1,166 @@
+import io
+import json
 import psycopg2
-from abc import ABC, abstractmethod
+
+from abc import ABC
+from enum import Enum
+from typing import Any, Dict, Iterator, List
+
+_COPY_NULL = "\\N"
 
 
 class MetaCommands(ABC):
-    @abstractmethod
-    def add_primary_key(
-        table_name: str,
-        primary_key: str,
-        con: "BaseAlchemyBackend",
-    ):
-        pass
-
-    @abstractmethod
-    def add_foreign_key(
-        table_name: str,
-        foreign_key: str,
-        reference_table: str,
-        reference_column: str,
-        dbconnector: "DBConnector",
-    ):
-        pass
+    pass
 
 
 class MySQLCommands(MetaCommands):
-    @staticmethod
-    def add_primary_key(
-        table_name: str,
-        primary_key: str,
-        dbconnector: "BaseAlchemyBackend",
-    ):
-        try:
-            dbconnector.connection.raw_sql(
-                f"ALTER TABLE {table_name} ADD COLUMN {primary_key} VARCHAR(36) PRIMARY KEY;"
-            )
-        except Exception as e:
-            print(f"Could not add primary key {primary_key} for table {table_name}: ")
-            raise e
-
-    @staticmethod
-    def add_foreign_key(
-        table_name: str,
-        foreign_key: str,
-        reference_table: str,
-        reference_column: str,
-        dbconnector: "DBConnector",
-    ):
-        try:
-            dbconnector.connection.raw_sql(
-                f"ALTER TABLE {table_name} ADD COLUMN {foreign_key} VARCHAR(36);"
-            )
-            dbconnector.connection.raw_sql(
-                f"ALTER TABLE {table_name} ADD FOREIGN KEY ({foreign_key}) REFERENCES {reference_table}({reference_column});"
-            )
-        except Exception as e:
-            print(
-                f"Could not add foreign key {foreign_key} for table {table_name} to {reference_table}({reference_column}): "
-            )
-            raise e
+    pass
 
 
 class PostgresCommands(MetaCommands):
     @staticmethod
-    def add_primary_key(
-        table_name: str,
-        primary_key: str,
+    def copy_rows(
+        batches: Dict[str, List[Dict[str, Any]]],
         dbconnector: "DBConnector",
     ):
-        try:
-            with psycopg2.connect(
-                dbname=dbconnector.db_name,
-                user=dbconnector.username,
-                password=dbconnector.password,
-                host=dbconnector.host,
-                port=dbconnector.port,
-            ) as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        f'ALTER TABLE "{table_name}" ADD COLUMN "{primary_key}" VARCHAR(36);'
-                    )
-                    cur.execute(
-                        f'ALTER TABLE "{table_name}" ADD PRIMARY KEY ("{primary_key}");'
-                    )
-        except Exception as e:
-            print(f"Could not add primary key {primary_key} for table {table_name}: ")
-            raise e
+        """Streams row batches into their tables using COPY ... FROM STDIN.
+
+        All tables are copied within a single transaction in the order given
+        by the batches, which has to be parent-before-child.
+
+        Args:
+            batches (Dict[str, List[Dict[str, Any]]]): Mapping of table names to aligned rows.
+            dbconnector (DBConnector): The database connector object.
+        """
+
+        with psycopg2.connect(
+            dbname=dbconnector.db_name,
+            user=dbconnector.username,
+            password=dbconnector.password,
+            host=dbconnector.host,
+            port=dbconnector.port,
+        ) as conn:
+            with conn.cursor() as cur:
+                for table_name, rows in batches.items():
+                    if not rows:
+                        continue
+
+                    columns = list(rows[0].keys())
+                    column_list = ", ".join(f'"{column}"' for column in columns)
+
+                    try:
+                        cur.copy_expert(
+                            f'COPY "{table_name}" ({column_list}) FROM STDIN '
+                            f"WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+                            _CSVRowStream(rows=rows, columns=columns),
+                        )
+                    except Exception as e:
+                        print(f"Could not copy rows into table {table_name}: ")
+                        raise e
+
+
+class _CSVRowStream(io.TextIOBase):
+    """File-like object that lazily encodes rows as CSV for COPY ... FROM STDIN."""
+
+    def __init__(self, rows: List[Dict[str, Any]], columns: List[str]):
+        self._lines = self._encode(rows, columns)
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+
+        if size < 0:
+            size = len(self._buffer)
+
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+
+        return chunk
 
     @staticmethod
-    def add_foreign_key(
-        table_name: str,
-        foreign_key: str,
-        reference_table: str,
-        reference_column: str,
-        dbconnector: "BaseAlchemyBackend",
-    ):
-        try:
-            with psycopg2.connect(
-                dbname=dbconnector.db_name,
-                user=dbconnector.username,
-                password=dbconnector.password,
-                host=dbconnector.host,
-                port=dbconnector.port,
-            ) as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        f'ALTER TABLE "{table_name}" ADD COLUMN "{foreign_key}" VARCHAR(36);'
-                    )
-                    cur.execute(
-                        f'ALTER TABLE "{table_name}" ADD FOREIGN KEY ("{foreign_key}") REFERENCES "{reference_table}"("{reference_column}");'
-                    )
-        except Exception as e:
-            print(
-                f"Could not add foreign key {foreign_key} for table {table_name} to {reference_table}({reference_column}): "
-            )
-            raise e
+    def _encode(rows: List[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+        for row in rows:
+            yield ",".join(_to_copy_field(row[column]) for column in columns) + "\r\n"
+
+
+def _to_copy_field(value: Any) -> str:
+    """Encodes a Python value as a field of the CSV stream.
+
+    PostgreSQL only reads unquoted fields that match the NULL string as NULL,
+    thus every other value is quoted and strings like '\\N' are kept.
+
+    Args:
+        value (Any): The value to encode.
+
+    Returns:
+        str: The encoded field.
+    """
+
+    if value is None:
+        return _COPY_NULL
+
+    field = str(_to_copy_value(value)).replace('"', '""')
+
+    return f'"{field}"'
+
+
+def _to_copy_value(value: Any) -> Any:
+    """Converts a Python value to its PostgreSQL CSV representation.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Any: The value to write into the CSV stream.
+    """
+
+    if value is None:
+        return _COPY_NULL
+    elif isinstance(value, Enum):
+        return _to_copy_value(value.value)
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    elif isinstance(value, (list, tuple)):
+        return _to_array_literal(value)
+    elif isinstance(value, dict):
+        return json.dumps(value)
+
+    return value
+
+
+def _to_array_literal(values: List[Any]) -> str:
+    """Encodes a list as a PostgreSQL array literal, such as '{1.0,2.0}'.
+
+    Non-numeric elements are quoted and escaped, such that commas, braces and
+    quotes within strings are kept. Nested lists are encoded as multidimensional arrays.
+
+    Args:
+        values (List[Any]): The elements of the array.
+
+    Returns:
+        str: The array literal.
+    """
+
+    elements = []
+
+    for value in values:
+        if value is None:
+            elements.append("NULL")
+        elif isinstance(value, (list, tuple)):
+            elements.append(_to_array_literal(value))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            elements.append(str(value))
+        else:
+            element = str(_to_copy_value(value))
+            element = element.replace("\\", "\\\\").replace('"', '\\"')
+            elements.append(f'"{element}"')
+
+    return "{" + ",".join(elements) + "}"
@@ -1,8 +1,37 @@
-from functools import partial
-from typing import Any, Callable, Dict, List, Optional, Tuple, get_origin
-from typing import get_origin
-from joblib import Parallel, delayed
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    get_origin,
+)
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+import ibis
+import numpy
+import uuid
 import pandas as pd
+import sqlalchemy as sa
+
+from ibis.formats.pandas import PandasData
+from pydantic.datetime_parse import parse_date, parse_datetime
+from sdrdm_database.arrays import decode_array, decode_list, encode_array, is_ndarray
+from sdrdm_database.blobstore import BlobStore, decode_blob, encode_blob
+from sdrdm_database.tablecreator import _create_table_schema
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Dates are stored as strings and parsed into the declared type on read
+_TEMPORAL_PARSERS = {date: parse_date, datetime: parse_datetime}
+
+# Maximum number of keys per IN list, which stays below the bind parameter
+# limits of PostgreSQL (65535) and SQLite (32766) and MySQL's packet size
+MAX_KEYS_PER_QUERY = 10000
 
 
 def insert_into_database(
@@ -11,6 +40,7 @@ def insert_into_database(
     table_name: str = None,
     parent_id: str = None,
     parent_col: str = None,
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
 ):
     """Inserts an instance of the sdRDM schema into the database.
 
@@ -20,14 +50,244 @@ def insert_into_database(
         table_name (str, optional): The name of the table to insert the data into. Defaults to None.
         parent_id (str, optional): The ID of the parent object. Defaults to None.
         parent_col (str, optional): The name of the column containing the parent object ID. Defaults to None.
+        chunk_size (Optional[int], optional): Maximum number of primitive array values per insert. Defaults to DEFAULT_CHUNK_SIZE.
     """
 
     if table_name is None:
         table_name = dataset.__class__.__name__
 
+    to_insert, primitive_arrays, sub_objects = _split_dataset(
+        dataset=dataset,
+        table_name=table_name,
+        parent_id=parent_id,
+        parent_col=parent_col,
+        inline_arrays=_inline_arrays(db=db, table_name=table_name),
+        blob_store=db.blob_store,
+    )
+
+    key_columns = _key_columns(type(dataset), table_name, parent=parent_col)
+
+    db.connection.insert(
+        table_name,
+        _encode_keys(
+            [to_insert],
+            columns=_binary_keys(
+                db=db, table_name=table_name, columns=key_columns[table_name]
+            ),
+        ),
+    )
+
+    for sub_table, column, array in primitive_arrays:
+        _insert_primitive_array(
+            table=sub_table,
+            column=column,
+            array=array,
+            db=db,
+            parent_col=f"{table_name}_id",
+            parent_id=str(dataset.__id__),
+            chunk_size=chunk_size,
+        )
+
+    for sub_table, sub_data in sub_objects.items():
+        for sub_dataset in sub_data:
+            if _is_empty(sub_dataset):
+                continue
+
+            insert_into_database(
+                dataset=sub_dataset,
+                db=db,
+                table_name=sub_table,
+                parent_id=str(dataset.__id__),
+                parent_col=table_name,
+                chunk_size=chunk_size,
+            )
+
+
+def bulk_insert_into_database(
+    datasets: Sequence["DataModel"],
+    db: "DBConnector",
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    use_copy: bool = False,
+):
+    """Inserts multiple instances of the sdRDM schema using one multi-row insert per table.
+
+    All datasets are flattened into per-table row batches first, which are then
+    written in parent-before-child order to satisfy the foreign key constraints.
+
+    Args:
+        datasets (Sequence[DataModel]): Instances of the sdRDM schema.
+        db (DBConnector): A connection to the database.
+        chunk_size (Optional[int], optional): Maximum number of rows per insert. Defaults to DEFAULT_CHUNK_SIZE.
+        use_copy (bool, optional): Whether to stream the batches using the backend's COPY command. Defaults to False.
+    """
+
+    key_columns = {}
+
+    for model in {type(dataset) for dataset in datasets}:
+        key_columns.update(_key_columns(model, model.__name__))
+
+    batches = {
+        table_name: _encode_keys(
+            _align_rows(rows),
+            columns=_binary_keys(
+                db=db, table_name=table_name, columns=key_columns[table_name]
+            ),
+        )
+        for table_name, rows in _flatten_datasets(datasets, db=db).items()
+    }
+
+    if use_copy:
+        db.__commands__.copy_rows(batches=batches, dbconnector=db)
+        return
+
+    for table_name, rows in batches.items():
+        for chunk in _chunk_rows(rows, chunk_size):
+            db.connection.insert(table_name, chunk)
+
+
+def _flatten_datasets(
+    datasets: Sequence["DataModel"],
+    db: Optional["DBConnector"] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Flattens datasets into row batches per table.
+
+    Tables are registered in the order they are first visited while walking
+    the datasets. Since a sub table can only be reached through its parent,
+    the resulting order is always parent-before-child.
+
+    Args:
+        datasets (Sequence[DataModel]): Instances of the sdRDM schema.
+        db (Optional[DBConnector], optional): A connection to the database, which is used to
+            detect lists stored in their parent table. Defaults to None, which uses sub tables.
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Mapping of table names to the rows to insert.
+    """
+
+    batches = {}
+
+    for dataset in datasets:
+        _collect_rows(dataset=dataset, batches=batches, db=db)
+
+    return batches
+
+
+def _collect_rows(
+    dataset: "DataModel",
+    batches: Dict[str, List[Dict[str, Any]]],
+    table_name: str = None,
+    parent_id: str = None,
+    parent_col: str = None,
+    db: Optional["DBConnector"] = None,
+):
+    """Recursively adds the rows of a dataset and its sub objects to the given batches.
+
+    Args:
+        dataset (DataModel): An instance of the sdRDM schema.
+        batches (Dict[str, List[Dict[str, Any]]]): Row batches to add the rows to.
+        table_name (str, optional): The name of the table the dataset belongs to. Defaults to None.
+        parent_id (str, optional): The ID of the parent object. Defaults to None.
+        parent_col (str, optional): The name of the parent table. Defaults to None.
+        db (Optional[DBConnector], optional): A connection to the database. Defaults to None.
+    """
+
+    if table_name is None:
+        table_name = dataset.__class__.__name__
+
+    to_insert, primitive_arrays, sub_objects = _split_dataset(
+        dataset=dataset,
+        table_name=table_name,
+        parent_id=parent_id,
+        parent_col=parent_col,
+        inline_arrays=_inline_arrays(db=db, table_name=table_name),
+        blob_store=db.blob_store if db is not None else None,
+    )
+
+    batches.setdefault(table_name, []).append(to_insert)
+
+    for sub_table, column, array in primitive_arrays:
+        batches.setdefault(sub_table, []).extend(
+            {column: value, f"{table_name}_id": str(dataset.__id__)} for value in array
+        )
+
+    for sub_table, sub_data in sub_objects.items():
+        for sub_dataset in sub_data:
+            if _is_empty(sub_dataset):
+                continue
+
+            _collect_rows(
+                dataset=sub_dataset,
+                batches=batches,
+                table_name=sub_table,
+                parent_id=str(dataset.__id__),
+                parent_col=table_name,
+                db=db,
+            )
+
+
+def _inline_arrays(
+    db: Optional["DBConnector"],
+    table_name: str,
+) -> Dict[str, bool]:
+    """Returns the columns of a table that may hold a list of primitive values.
+
+    Lists that are stored in their parent table, instead of a sub table, have
+    a column named after the attribute, which is either an array or a binary.
+
+    Args:
+        db (Optional[DBConnector]): The database connection object.
+        table_name (str): The name of the table.
+
+    Returns:
+        Dict[str, bool]: Mapping of column names to whether the column is binary.
+    """
+
+    if db is None:
+        return {}
+
+    return {
+        name: dtype.is_binary()
+        for name, dtype in db.table(table_name).schema().items()
+        if dtype.is_array() or dtype.is_binary()
+    }
+
+
+def _split_dataset(
+    dataset: "DataModel",
+    table_name: str,
+    parent_id: str = None,
+    parent_col: str = None,
+    inline_arrays: Optional[Dict[str, bool]] = None,
+    blob_store: Optional[BlobStore] = None,
+) -> Tuple[Dict[str, Any], List[Tuple[str, str, List[Any]]], Dict[str, List]]:
+    """Splits a dataset into its own row, its primitive arrays and its sub objects.
+
+    Arrays, such as numpy.ndarray values, are NPY-encoded. Lists of primitive
+    values that are stored in the row itself are passed on as a native array or
+    are NPY-encoded, depending on the type of their column. Large binaries and
+    arrays are moved to the blob store, if given.
+
+    Args:
+        dataset (DataModel): An instance of the sdRDM schema.
+        table_name (str): The name of the table the dataset belongs to.
+        parent_id (str, optional): The ID of the parent object. Defaults to None.
+        parent_col (str, optional): The name of the parent table. Defaults to None.
+        inline_arrays (Optional[Dict[str, bool]], optional): Columns of the table that may hold lists,
+            mapped to whether they are binary. Defaults to None.
+        blob_store (Optional[BlobStore], optional): Store of large binaries and arrays. Defaults to None.
+
+    Returns:
+        Tuple: The row of the dataset, a list of (table, column, values) tuples of
+        primitive arrays and a mapping of sub tables to their sub objects.
+    """
+
+    if inline_arrays is None:
+        inline_arrays = {}
+
     sub_objects = {}
+    primitive_arrays = []
+    inline_values = {}
     to_exclude = set(["id"])
-    post_insert = []
 
     for key, value in dataset:
         field_info = dataset.__fields__[key]
@@ -38,21 +298,19 @@ def insert_into_database(
         if is_obj:
             sub_objects[sub_key] = [value] if not is_mutliple else value
             to_exclude.add(key)
+        elif is_mutliple and key in inline_arrays:
+            inline_values[key] = _encode_inline(value, binary=inline_arrays[key])
+            to_exclude.add(key)
         elif is_mutliple and not is_obj:
-            kwargs = {
-                "table": sub_key,
-                "column": key,
-                "array": value,
-                "db": db,
-                "parent_col": f"{table_name}_id",
-                "parent_id": str(dataset.__id__),
-            }
-
-            post_insert.append(partial(_insert_primitive_array, **kwargs))
+            primitive_arrays.append((sub_key, key, value))
+            to_exclude.add(key)
+        elif isinstance(value, (bytes, numpy.ndarray)):
+            inline_values[key] = _encode_binary(value, blob_store=blob_store)
             to_exclude.add(key)
 
     to_insert = {
         **dataset.dict(exclude=to_exclude),
+        **inline_values,
         f"{table_name}_id": str(dataset.__id__),
     }
 
@@ -60,23 +318,61 @@ def insert_into_database(
         assert parent_col is not None, "Parent column must be specified"
         to_insert[f"{parent_col}_id"] = parent_id
 
-    db.connection.insert(table_name, to_insert)
+    return to_insert, primitive_arrays, sub_objects
 
-    for func in post_insert:
-        func()
 
-    for sub_table, sub_data in sub_objects.items():
-        for sub_dataset in sub_data:
-            if _is_empty(sub_dataset):
-                continue
+def _encode_inline(value: Optional[List[Any]], binary: bool) -> Any:
+    """Converts a list of primitive values into the value of its column.
+
+    Args:
+        value (Optional[List[Any]]): The list to convert.
+        binary (bool): Whether the column is binary or an array.
+
+    Returns:
+        Any: The NPY-encoded list, the list itself or None.
+    """
+
+    if value is None:
+        return None
+    elif binary:
+        return encode_array(value)
+
+    return list(value)
+
+
+def _encode_binary(
+    value: Any,
+    blob_store: Optional[BlobStore] = None,
+) -> bytes:
+    """Converts a binary or an array into the value of its column.
+
+    Args:
+        value (Any): A binary or an array, which is NPY-encoded.
+        blob_store (Optional[BlobStore], optional): Store of large values. Defaults to None.
+
+    Returns:
+        bytes: The encoded value or a reference to it within the blob store.
+    """
+
+    if isinstance(value, numpy.ndarray):
+        value = encode_array(value)
+
+    return encode_blob(value, blob_store=blob_store)
 
-            insert_into_database(
-                dataset=sub_dataset,
-                db=db,
-                table_name=sub_table,
-                parent_id=str(dataset.__id__),
-                parent_col=table_name,
-            )
+
+def _align_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Ensures all rows share the same columns, which multi-row inserts require.
+
+    Args:
+        rows (List[Dict[str, Any]]): The rows to align.
+
+    Returns:
+        List[Dict[str, Any]]: The rows with missing columns set to None.
+    """
+
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+
+    return [{column: row.get(column) for column in columns} for row in rows]
 
 
 def _is_empty(obj):
@@ -109,10 +405,14 @@ def _insert_primitive_array(
     db: "DBConnector",
     parent_col: str,
     parent_id: str,
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
 ) -> None:
     """
     Inserts a list of primitive values into a database table.
 
+    The values are written with one multi-row insert per chunk instead of
+    one insert per value.
+
     Args:
         table (str): The name of the table to insert the values into.
         column (str): The name of the column to insert the values into.
@@ -120,149 +420,790 @@ def _insert_primitive_array(
         db (DBConnector): The database connector object to use for the insertion.
         parent_col (str): The name of the column that contains the parent ID.
         parent_id (str): The ID of the parent object that the values belong to.
+        chunk_size (Optional[int], optional): Maximum number of values per insert. Defaults to DEFAULT_CHUNK_SIZE.
+    """
+
+    to_insert = _encode_keys(
+        [{column: value, parent_col: parent_id} for value in array],
+        columns=_binary_keys(db=db, table_name=table, columns=[parent_col]),
+    )
+
+    for chunk in _chunk_rows(to_insert, chunk_size):
+        db.connection.insert(table, chunk)
+
+
+@lru_cache(maxsize=128)
+def _key_columns(
+    model: "DataModel",
+    table_name: str,
+    parent: Optional[str] = None,
+) -> Dict[str, Tuple[str, ...]]:
+    """Returns the primary and foreign key columns of the tables of a model.
+
+    The keys are taken from the create instructions of the model, which only
+    depend on the model itself and are therefore cached.
+
+    Args:
+        model (DataModel): The model of the table.
+        table_name (str): The name of the table.
+        parent (Optional[str], optional): The name of the parent table. Defaults to None.
+
+    Returns:
+        Dict[str, Tuple[str, ...]]: Mapping of the table and its sub tables to their key columns.
+    """
+
+    instructions = _create_table_schema(
+        data_model=model,
+        table_name=table_name,
+        schemes=[],
+        parent=parent,
+    )
+
+    return {
+        instruction["name"]: tuple(
+            name
+            for name in [
+                instruction["primary_key"],
+                *[key["foreign_key"] for key in instruction["foreign_keys"]],
+            ]
+            if name is not None
+        )
+        for instruction in instructions
+    }
+
+
+def _binary_keys(
+    db: "DBConnector",
+    table_name: str,
+    columns: Sequence[str],
+) -> List[str]:
+    """Returns the key columns of a table that store UUIDs as 16 bytes, i.e. BINARY(16).
+
+    Native UUID columns accept the string representation and need no conversion.
+
+    Args:
+        db (DBConnector): The database connection object.
+        table_name (str): The name of the table.
+        columns (Sequence[str]): The key columns of the table.
+
+    Returns:
+        List[str]: The names of the binary key columns.
+    """
+
+    schema = db.table(table_name).schema()
+
+    return [name for name in columns if name in schema and schema[name].is_binary()]
+
+
+def _encode_keys(
+    rows: List[Dict[str, Any]],
+    columns: List[str],
+) -> List[Dict[str, Any]]:
+    """Converts the string keys of the given columns into 16 bytes in place.
+
+    Args:
+        rows (List[Dict[str, Any]]): The rows to convert.
+        columns (List[str]): The binary key columns.
+
+    Returns:
+        List[Dict[str, Any]]: The converted rows.
+    """
+
+    for row in rows:
+        for column in columns:
+            if row.get(column) is not None:
+                row[column] = uuid.UUID(row[column]).bytes
+
+    return rows
+
+
+def _decode_key(value: Any) -> Any:
+    """Converts a native key into its string representation.
+
+    Args:
+        value (Any): A key as read from the database, i.e. a string, a UUID or 16 bytes.
+
+    Returns:
+        Any: The key as a string, or the value itself if it is no native key.
+    """
+
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    elif isinstance(value, (bytes, memoryview)) and len(value) == 16:
+        return str(uuid.UUID(bytes=bytes(value)))
+
+    return value
+
+
+def _decode_key_columns(frame: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """Converts the native keys of the given key columns of a frame into strings.
+
+    Args:
+        frame (pd.DataFrame): The frame to convert.
+        columns (Sequence[str]): The key columns of the table the frame belongs to.
+
+    Returns:
+        pd.DataFrame: The frame with string keys.
+    """
+
+    columns = [
+        column
+        for column in columns
+        if column in frame.columns and frame[column].dtype == object
+    ]
+
+    if not columns:
+        return frame
+
+    return frame.assign(
+        **{column: frame[column].map(_decode_key) for column in columns}
+    )
+
+
+def _decode_blob_columns(
+    frame: pd.DataFrame,
+    db: "DBConnector",
+    table_name: str,
+) -> pd.DataFrame:
+    """Replaces blob references and escaped payloads in the binary columns of a frame.
+
+    Args:
+        frame (pd.DataFrame): The frame to convert.
+        db (DBConnector): The database connection object, which holds the blob store.
+        table_name (str): The name of the table the frame belongs to.
+
+    Returns:
+        pd.DataFrame: The frame with payloads in its binary columns.
+    """
+
+    columns = [
+        name
+        for name, binary in _inline_arrays(db=db, table_name=table_name).items()
+        if binary and name in frame.columns
+    ]
+
+    if not columns:
+        return frame
+
+    def decode(value):
+        if not isinstance(value, (bytes, memoryview)):
+            return value
+
+        return bytes(decode_blob(value, blob_store=db.blob_store))
+
+    return frame.assign(**{column: frame[column].map(decode) for column in columns})
+
+
+def _key_literal(column, value: Any):
+    """Converts a string key into a literal that is comparable to the given key column.
+
+    Keys that are no valid UUID cannot match a native key. They are converted
+    into NULL, which compares to no key, such that queries return no rows.
+
+    Args:
+        column (ibis.expr.types.Column): The key column.
+        value (Any): A key in its string representation or a list of such keys.
+
+    Returns:
+        The key as a literal of the type of the column, or the value itself for string keys.
+    """
+
+    if isinstance(value, list):
+        return [_key_literal(column, item) for item in value]
+
+    dtype = column.type()
+
+    if not dtype.is_uuid() and not dtype.is_binary():
+        return value
+
+    try:
+        key = uuid.UUID(value)
+    except (AttributeError, TypeError, ValueError):
+        return ibis.null().cast(dtype)
+
+    if dtype.is_uuid():
+        return ibis.literal(str(key), type=dtype)
+
+    return ibis.literal(key.bytes)
+
+
+def _chunk_rows(
+    rows: List[Dict[str, Any]],
+    chunk_size: Optional[int],
+) -> Iterator[List[Dict[str, Any]]]:
+    """Splits rows into chunks of at most chunk_size rows.
+
+    Args:
+        rows (List[Dict[str, Any]]): The rows to split.
+        chunk_size (Optional[int]): Maximum number of rows per chunk. If None, all rows are returned as a single chunk.
+
+    Yields:
+        List[Dict[str, Any]]: A chunk of rows.
     """
-    for value in array:
-        to_insert = {
-            column: value,
-            parent_col: parent_id,
-        }
-        db.connection.insert(table, to_insert)
+
+    if not rows:
+        return
+
+    if chunk_size is None:
+        yield rows
+        return
+
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start : start + chunk_size]
 
 
 def _extract_related_rows(
     table,
-    id_col: str,
+    table_name: str,
     db: "DBConnector",
     model: "DataModel",
     query_fun: Optional[Callable] = None,
-    n_jobs: int = -1,
-    MAX_ROWS: int = 20,
-) -> List[Tuple[int, Dict[str, Any]]]:
+    MAX_ROWS: Optional[int] = 20,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
     """Extracts related rows from a database table.
 
     Args:
         table: The database table to extract rows from.
-        id_col: The name of the column containing the row IDs.
+        table_name: The name of the table the rows belong to.
         db: The database connection object.
         model: The Pydantic model representing the table schema.
         query_fun: Optional function to filter rows before extraction.
-        n_jobs: Number of parallel jobs to use for extraction.
-        MAX_ROWS: Maximum number of rows to extract.
+        MAX_ROWS: Maximum number of rows to extract. If None, all rows are extracted.
+        offset: Number of rows to skip, ordered by the ID column.
 
     Returns:
-        A list of tuples, where each tuple contains the row ID and a dictionary
-        of the row's attribute values.
+        A list of dictionaries containing the attribute values of each row,
+        including all related objects.
     """
 
     # Extract data
     if query_fun:
         rows = table[query_fun(table)].execute()
     else:
-        rows = table.execute().iloc[0:MAX_ROWS]
+        rows = _limit_rows(
+            table=table,
+            id_col=f"{table_name}_id",
+            limit=MAX_ROWS,
+            offset=offset,
+        ).execute()
+
+    return _hydrate_rows(
+        rows=rows,
+        table_name=table_name,
+        db=db,
+        model=model,
+    )
+
+
+def _limit_rows(
+    table,
+    id_col: str,
+    limit: Optional[int],
+    offset: int = 0,
+):
+    """Pushes LIMIT and OFFSET into the query of a table expression.
+
+    Limited rows are ordered by their IDs, since databases otherwise return
+    an arbitrary subset that may change between queries.
+
+    Args:
+        table: The table expression to limit.
+        id_col: The name of the column containing the row IDs, used to order limited results.
+        limit: Maximum number of rows. If None, no limit is applied.
+        offset: Number of rows to skip.
+
+    Returns:
+        The limited table expression.
+    """
+
+    if limit is None and not offset:
+        return table
+
+    return table.order_by(id_col).limit(limit, offset=offset)
+
+
+def _stream_rows(
+    table,
+    db: "DBConnector",
+    batch_size: int,
+) -> Iterator[pd.DataFrame]:
+    """Streams the rows of a table expression in batches using a server-side cursor.
+
+    The query is executed with SQLAlchemy's 'stream_results' option, which uses
+    named cursors on PostgreSQL and unbuffered cursors on MySQL. Hence, only
+    a single batch is held in memory at a time.
+
+    Args:
+        table: The table expression to stream.
+        db (DBConnector): The database connection object.
+        batch_size (int): The number of rows per batch.
+
+    Yields:
+        pd.DataFrame: A batch of rows.
+    """
+
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, got {batch_size}")
+
+    schema = table.schema()
+    query = db.connection.compile(table)
+
+    with db.connection.con.connect() as con:
+        result = con.execution_options(
+            stream_results=True,
+            max_row_buffer=batch_size,
+        ).execute(query)
+
+        for partition in result.partitions(batch_size):
+            yield _to_frame(partition, schema)
+
+
+def _hydrate_rows(
+    rows: pd.DataFrame,
+    table_name: str,
+    db: "DBConnector",
+    model: "DataModel",
+) -> List[Dict[str, Any]]:
+    """Converts rows of a table into dictionaries and attaches their related objects.
+
+    Args:
+        rows (pd.DataFrame): The rows to convert.
+        table_name (str): The name of the table the rows belong to.
+        db (DBConnector): The database connection object.
+        model (DataModel): The model representing the table schema.
+
+    Returns:
+        List[Dict[str, Any]]: A dictionary per row, including all related objects.
+    """
+
+    frames = _fetch_frames(
+        rows=rows,
+        table_name=table_name,
+        db=db,
+        model=model,
+    )
+
+    return _assemble_records(
+        frames=frames,
+        table_name=table_name,
+        model=model,
+    )
+
+
+def _fetch_frames(
+    rows: pd.DataFrame,
+    table_name: str,
+    db: "DBConnector",
+    model: "DataModel",
+    frames: Optional[Dict[str, pd.DataFrame]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Fetches the rows of all sub tables that are related to the given rows.
+
+    Related rows are loaded level by level. Each sub table is queried once
+    for all rows of its parent table using the foreign key column. Thus, the
+    number of queries depends on the depth of the model and not on the number
+    of rows.
+
+    Args:
+        rows (pd.DataFrame): The rows of the table.
+        table_name (str): The name of the table the rows belong to.
+        db (DBConnector): The database connection object.
+        model (DataModel): The model representing the table schema.
+        frames (Optional[Dict[str, pd.DataFrame]], optional): Frames fetched so far. Defaults to None.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Mapping of table names to their related rows.
+    """
+
+    if frames is None:
+        frames = {}
+
+    frames[table_name] = rows
+
+    id_col = f"{table_name}_id"
+    ids = rows[id_col].tolist()
+
+    for sub_model, name, _, is_obj in _related_attributes(model):
+        if not is_obj and name in rows.columns:
+            continue
+
+        sub_table_name = f"{model.__name__}_{name}"
+        sub_rows = _fetch_related(
+            db=db,
+            table_name=sub_table_name,
+            key_col=id_col,
+            keys=ids,
+        )
+
+        if is_obj:
+            _fetch_frames(
+                rows=sub_rows,
+                table_name=sub_table_name,
+                db=db,
+                model=sub_model,
+                frames=frames,
+            )
+        else:
+            frames[sub_table_name] = sub_rows
+
+    return frames
+
+
+def _assemble_records(
+    frames: Dict[str, pd.DataFrame],
+    table_name: str,
+    model: "DataModel",
+) -> List[Dict[str, Any]]:
+    """Assembles nested dictionaries from the frames of a model and its sub tables.
+
+    Args:
+        frames (Dict[str, pd.DataFrame]): Mapping of table names to their rows.
+        table_name (str): The name of the table to assemble.
+        model (DataModel): The model representing the table schema.
+
+    Returns:
+        List[Dict[str, Any]]: A dictionary per row, including all related objects.
+    """
+
+    rows = frames[table_name]
+    id_col = f"{table_name}_id"
 
     subset = list(model.__fields__.keys())
     subset.remove("id")
 
-    # Find out, which attributes are objects
-    obj_subset = [
+    datasets = _rows_to_records(rows=rows, subset=subset, id_col=id_col)
+    ids = rows[id_col].tolist()
+
+    for sub_model, name, is_multi, is_obj in _related_attributes(model):
+        if not is_obj and name in rows.columns:
+            for dataset in datasets:
+                dataset[name] = decode_list(dataset.get(name))
+
+            continue
+
+        sub_table_name = f"{model.__name__}_{name}"
+        sub_rows = frames[sub_table_name]
+
+        if not is_obj:
+            children = _group_by_key(
+                keys=sub_rows[id_col].tolist(),
+                values=sub_rows[name].tolist(),
+            )
+
+            for dataset, row_id in zip(datasets, ids):
+                dataset[name] = children.get(row_id, [])
+
+            continue
+
+        children = _group_by_key(
+            keys=sub_rows[id_col].tolist(),
+            values=_assemble_records(
+                frames=frames,
+                table_name=sub_table_name,
+                model=sub_model,
+            ),
+        )
+
+        for dataset, row_id in zip(datasets, ids):
+            if is_multi:
+                dataset[name] = children.get(row_id, [])
+            elif row_id in children:
+                dataset[name] = children[row_id][0]
+
+    return datasets
+
+
+def _related_attributes(
+    model: "DataModel",
+) -> List[Tuple[Any, str, bool, bool]]:
+    """Returns the attributes of a model that are stored in sub tables.
+
+    Args:
+        model (DataModel): The model to inspect.
+
+    Returns:
+        List[Tuple[Any, str, bool, bool]]: The type, name, whether it is a list
+        and whether it is an object for each of these attributes.
+    """
+
+    return [
         (
             attr.type_,
             attr.name,
             get_origin(attr.outer_type_) == list,
+            hasattr(attr.type_, "__fields__"),
         )
         for attr in model.__fields__.values()
         if hasattr(attr.type_, "__fields__") or get_origin(attr.outer_type_) == list
     ]
 
-    if db.dbtype.value == "mysql":
-        data = []
-        for _, row in rows.iterrows():
-            data.append(
-                _process_row(
-                    row=row,
-                    subset=subset,
-                    obj_subset=obj_subset,
-                    id_col=id_col,
-                    model=model,
-                    db=db,
-                )
-            )
 
-        return data
+def _fetch_related(
+    db: "DBConnector",
+    table_name: str,
+    key_col: str,
+    keys: List[Any],
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Fetches all rows of a table whose key column is one of the given keys.
 
-    return Parallel(n_jobs=n_jobs, backend="threading")(
-        delayed(_process_row)(
-            row=row,
-            subset=subset,
-            obj_subset=obj_subset,
-            id_col=id_col,
-            model=model,
-            db=db,
-        )
-        for _, row in rows.iterrows()
+    The query is built with SQLAlchemy Core and an expanding IN parameter,
+    which avoids building one expression node per key. Keys are split into
+    chunks of MAX_KEYS_PER_QUERY, which are queried within one transaction.
+
+    Args:
+        db (DBConnector): The database connection object.
+        table_name (str): The name of the table to fetch rows from.
+        key_col (str): The name of the column to filter on, usually a foreign key.
+        keys (List[Any]): The keys to fetch rows for.
+        columns (Optional[List[str]], optional): The columns to select. Defaults to all columns.
+
+    Returns:
+        pd.DataFrame: The matching rows.
+    """
+
+    schema = db.table(table_name).schema()
+
+    if columns is not None:
+        schema = ibis.schema({name: schema[name] for name in columns})
+
+    if not keys:
+        return _to_frame([], schema)
+
+    table = sa.table(table_name, *(sa.column(name) for name in schema.names))
+    query = sa.select(table).where(
+        table.c[key_col].in_(sa.bindparam("keys", expanding=True))
     )
+    rows = []
 
+    with db.connection.begin() as con:
+        for chunk in _chunk_rows(keys, MAX_KEYS_PER_QUERY):
+            rows.extend(con.execute(query, {"keys": chunk}).fetchall())
 
-def _process_row(
-    row,
-    subset,
-    obj_subset,
-    id_col,
-    model,
-    db,
-):
+    return _to_frame(rows, schema)
+
+
+def _to_frame(rows, schema) -> pd.DataFrame:
+    """Converts raw result rows into a DataFrame with the dtypes of the ibis schema.
+
+    Args:
+        rows: The result rows.
+        schema: The ibis schema of the rows.
+
+    Returns:
+        pd.DataFrame: The converted rows.
+    """
+
+    frame = pd.DataFrame.from_records(
+        rows,
+        columns=schema.names,
+        coerce_float=True,
+    )
+
+    return PandasData.convert_table(frame, schema)
+
+
+def _rows_to_records(
+    rows: pd.DataFrame,
+    subset: List[str],
+    id_col: str,
+) -> List[Dict[str, Any]]:
     """
-    Processes a single row of data from a database table.
+    Converts the rows of a database table into dictionaries.
+
+    Nulls are normalized to None once for the whole frame, which is then
+    converted column-wise instead of row by row.
 
     Args:
-        row (pandas.Series): A single row of data from a database table.
+        rows (pd.DataFrame): The rows of a database table.
         subset (List[str]): A list of column names to include in the processed data.
-        obj_subset (List[Tuple[type, str, bool]]): A list of tuples representing related objects to include in the processed data. Each tuple contains:
-            - A reference to the related object's model class
-            - The name of the related object's attribute in the processed data
-            - A boolean indicating whether the related object is a single object or a list of objects
         id_col (str): The name of the column containing the primary key ID for the table.
-        model (type): The model class for the table being processed.
-        db (Database): The database object containing the table being processed.
 
     Returns:
-        dict: A dictionary containing the processed data for the input row, including related objects as specified in obj_subset.
+        List[Dict[str, Any]]: A dictionary per row, excluding related objects.
     """
 
-    subset = [col for col in subset if col in row]
-    row = row.where(pd.notnull(row), None)
-    dataset = row[subset].to_dict()
-    dataset["id"] = row[id_col]
+    columns = [col for col in subset if col in rows.columns]
+    records = _frame_to_records(rows[columns])
 
-    for (
-        sub_model,
-        name,
-        is_multi,
-    ) in obj_subset:
-        sub_table_name = f"{model.__name__}_{name}"
-        sub_table = db.connection.table(sub_table_name)
-        is_obj = hasattr(sub_model, "__fields__")
+    for record, row_id in zip(records, rows[id_col].tolist()):
+        record["id"] = _decode_key(row_id)
+
+    return records
+
+
+def _frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Converts a DataFrame into a list of dictionaries with nulls normalized to None.
+
+    Args:
+        frame (pd.DataFrame): The frame to convert.
+
+    Returns:
+        List[Dict[str, Any]]: A dictionary per row.
+    """
+
+    frame = frame.astype(object)
+    frame = frame.where(frame.notna(), None)
+
+    return frame.to_dict(orient="records")
+
+
+def _group_by_key(
+    keys: List[Any],
+    values: List[Any],
+) -> Dict[Any, List[Any]]:
+    """Groups values by their corresponding keys while preserving their order.
+
+    Args:
+        keys (List[Any]): The key of each value, e.g. a foreign key column.
+        values (List[Any]): The values to group.
+
+    Returns:
+        Dict[Any, List[Any]]: Mapping of each key to its values.
+    """
+
+    groups = {}
+
+    for key, value in zip(keys, values):
+        groups.setdefault(key, []).append(value)
+
+    return groups
+
+
+def _instantiate_models(
+    model: "DataModel",
+    datasets: List[Dict[str, Any]],
+    trusted: bool = False,
+    blob_store: Optional[BlobStore] = None,
+) -> List["DataModel"]:
+    """Creates model instances from hydrated rows.
+
+    Args:
+        model (DataModel): The model to instantiate.
+        datasets (List[Dict[str, Any]]): The hydrated rows.
+        trusted (bool, optional): Whether to skip validation, since the rows stem
+            from tables that have been created from the model. Defaults to False.
+        blob_store (Optional[BlobStore], optional): Store to fetch referenced binaries from. Defaults to None.
+
+    Returns:
+        List[DataModel]: The model instances.
+    """
+
+    for dataset in datasets:
+        _decode_binaries(model, dataset, blob_store=blob_store)
 
-        if is_multi and not is_obj:
-            filtered = sub_table[sub_table[id_col] == row[id_col]]
-            dataset[name] = filtered[name].execute().values.tolist()
+    if trusted:
+        return [_construct_model(model, dataset) for dataset in datasets]
+
+    return [model(**dataset) for dataset in datasets]
+
+
+def _decode_binaries(
+    model: "DataModel",
+    dataset: Dict[str, Any],
+    blob_store: Optional[BlobStore] = None,
+) -> None:
+    """Recursively resolves blob references and decodes NPY-encoded arrays of a hydrated row in place.
+
+    Blobs are fetched once all related rows are hydrated. The arrays are
+    read-only views on the fetched bytes or on the memory map of a blob, thus
+    no data is copied.
+
+    Args:
+        model (DataModel): The model the row belongs to.
+        dataset (Dict[str, Any]): A hydrated row including its related objects.
+        blob_store (Optional[BlobStore], optional): Store to fetch referenced binaries from. Defaults to None.
+    """
+
+    for name, field in model.__fields__.items():
+        value = dataset.get(name)
+
+        if value is None:
             continue
+        elif hasattr(field.type_, "__fields__"):
+            for sub in value if isinstance(value, list) else [value]:
+                _decode_binaries(field.type_, sub, blob_store=blob_store)
 
-        res = _extract_related_rows(
-            table=sub_table,
-            id_col=f"{sub_table_name}_id",
-            query_fun=lambda table: table[id_col] == row[id_col],
-            db=db,
-            model=sub_model,
-            n_jobs=1,
-        )
+            continue
+        elif not isinstance(value, (bytes, memoryview)):
+            continue
+
+        value = decode_blob(value, blob_store=blob_store)
+
+        if is_ndarray(field.type_):
+            dataset[name] = decode_array(value)
+        else:
+            dataset[name] = bytes(value)
+
+
+def _construct_model(
+    model: "DataModel",
+    dataset: Dict[str, Any],
+) -> "DataModel":
+    """Recursively constructs a model instance without validation.
+
+    Args:
+        model (DataModel): The model to construct.
+        dataset (Dict[str, Any]): A hydrated row including its related objects.
+
+    Returns:
+        DataModel: The constructed model instance.
+    """
+
+    values = {}
 
-        if not res:
+    for name, field in model.__fields__.items():
+        if name not in dataset:
             continue
 
-        if is_multi:
-            dataset[name] = res
+        value = dataset[name]
+        is_obj = hasattr(field.type_, "__fields__")
+        is_multiple = get_origin(field.outer_type_) is list
+
+        if value is None:
+            pass
+        elif is_obj and is_multiple:
+            value = [_construct_model(field.type_, sub) for sub in value]
+        elif is_obj:
+            value = _construct_model(field.type_, value)
+        elif is_multiple:
+            value = [_convert_scalar(model, field.type_, sub) for sub in value]
         else:
-            dataset[name] = res[0]
+            value = _convert_scalar(model, field.type_, value)
+
+        values[name] = value
+
+    instance = model.construct(**values)
+
+    if "id" in dataset and "__id__" in model.__private_attributes__:
+        instance.__id__ = dataset["id"]
+
+    return instance
+
+
+def _convert_scalar(model: "DataModel", dtype: Any, value: Any) -> Any:
+    """Converts a stored value into the declared type, as validation would.
+
+    Args:
+        model (DataModel): The model the field belongs to.
+        dtype (Any): The declared type of the field.
+        value (Any): The stored value.
+
+    Returns:
+        Any: The converted value.
+    """
+
+    if value is None:
+        return None
+    elif dtype in _TEMPORAL_PARSERS and isinstance(value, str):
+        return _TEMPORAL_PARSERS[dtype](value)
+    elif model.__config__.use_enum_values:
+        return value
+    elif isinstance(dtype, type) and issubclass(dtype, Enum):
+        return dtype(value)
 
-    return dataset
+    return value
@@ -2,17 +2,44 @@ import os
 import time
 from enum import Enum
 from itertools import cycle
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import ibis
+import pandas as pd
+import pyarrow as pa
 from ibis.backends.base.sql.alchemy import BaseAlchemyBackend
 from ibis.expr.types.relations import Table
 from pydantic import BaseModel, PrivateAttr
 
 from sdrdm_database import commands
-from sdrdm_database.dataio import _extract_related_rows, insert_into_database
+from sdrdm_database.arrays import ArrayStorage
+from sdrdm_database.blobstore import BlobStore
+from sdrdm_database.dataio import (
+    DEFAULT_CHUNK_SIZE,
+    _align_rows,
+    _assemble_records,
+    _decode_blob_columns,
+    _decode_key,
+    _decode_key_columns,
+    _extract_related_rows,
+    _fetch_frames,
+    _hydrate_rows,
+    _instantiate_models,
+    _key_columns,
+    _key_literal,
+    _limit_rows,
+    _stream_rows,
+    bulk_insert_into_database,
+    insert_into_database,
+)
+from sdrdm_database.migration import (
+    DEFAULT_BACKFILL_BATCH_SIZE,
+    MigrationPlan,
+    apply_migration,
+    plan_migration,
+)
 from sdrdm_database.modelutils import rebuild_api
-from sdrdm_database.tablecreator import create_tables
+from sdrdm_database.tablecreator import TableIndex, create_tables
 
 
 class SupportedBackends(str, Enum):
@@ -69,8 +96,16 @@ class DBConnector(BaseModel):
     address: Optional[str] = None
     dbtype: SupportedBackends = SupportedBackends.MYSQL
     connection: Optional[BaseAlchemyBackend] = None
+    cache_dir: Optional[str] = None
+    blob_store: Optional[BlobStore] = None
+    model_refresh_interval: float = 30.0
 
     __models__: Dict[str, Any] = PrivateAttr({})
+    __model_registry__: Dict[str, Tuple[str, str]] = PrivateAttr({})
+    __specifications__: Dict[str, Tuple[Any, str]] = PrivateAttr({})
+    __model_meta_version__: Optional[Tuple[int, Optional[int]]] = PrivateAttr(None)
+    __model_meta_checked__: float = PrivateAttr(0.0)
+    __tables__: Dict[str, Table] = PrivateAttr({})
     __commands__: Optional[commands.MetaCommands] = PrivateAttr(None)
 
     def __init__(self, **data) -> None:
@@ -140,30 +175,90 @@ class DBConnector(BaseModel):
         print(" " * 100, end="\r")
 
     def _build_models(self):
+        """Registers all models found in the __model_meta__ table.
+
+        Libraries are not generated here, but on first access through
+        'get_table_api', such that only the models actually used are built.
+        Cached table handles are invalidated, since the models are (re)loaded
+        after tables have been created or migrated.
+        """
+
+        self.__models__ = {}
+        self.__model_registry__ = {}
+        self.__specifications__ = {}
+        self.__model_meta_version__ = None
+        self.__model_meta_checked__ = time.monotonic()
+        self.invalidate_tables()
+
         if "__model_meta__" not in self.connection.list_tables():
             return
 
-        model_meta = (
-            self.connection.table("__model_meta__").execute().set_index("table")
+        model_meta = self.table("__model_meta__").execute().set_index("table")
+
+        self.__model_meta_version__ = _model_meta_version(
+            count=len(model_meta),
+            version=model_meta["version"].max() if "version" in model_meta else None,
         )
 
-        # Build root elements first
+        # Register root elements first
         root_models = model_meta[model_meta.part_of.isna()]
-        root_libs = {}
 
         for root_name, row in root_models.iterrows():
-            lib = rebuild_api(row.specifications, row.obj_name)
-            root_libs[root_name] = lib
-
-            self.__models__[row.obj_name] = getattr(lib, row.obj_name)
+            self.__specifications__[root_name] = (row.specifications, row.obj_name)
+            self.__model_registry__[row.obj_name] = (root_name, row.obj_name)
 
-        # Build sub models
+        # Register sub models
         sub_models = model_meta[model_meta.part_of.notna()]
         for sub_name, row in sub_models.iterrows():
             name = sub_name.split("_", 1)[-1]
 
-            self.__models__[sub_name] = getattr(root_libs[row.part_of], row.obj_name)
-            self.__models__[name] = getattr(root_libs[row.part_of], row.obj_name)
+            self.__model_registry__[sub_name] = (row.part_of, row.obj_name)
+            self.__model_registry__[name] = (row.part_of, row.obj_name)
+
+    def _refresh_models(self):
+        """Reloads the registered models if the __model_meta__ table has changed.
+
+        Writers stamp the rows they insert or update with an increasing version,
+        thus the row count and the highest version identify the state of the
+        table without fetching the specifications.
+        """
+
+        self.__model_meta_checked__ = time.monotonic()
+
+        if "__model_meta__" not in self.connection.list_tables():
+            return
+
+        model_meta = self.table("__model_meta__")
+
+        if "version" in model_meta.columns:
+            row = model_meta.aggregate(
+                count=model_meta.count(),
+                version=model_meta["version"].max(),
+            ).execute()
+            version = _model_meta_version(row["count"][0], row["version"][0])
+        else:
+            version = _model_meta_version(model_meta.count().execute(), None)
+
+        if version != self.__model_meta_version__:
+            self._build_models()
+
+    def _build_model(self, name: str):
+        """Builds a registered model from the specifications of its root model.
+
+        Args:
+            name (str): The name of the registered model.
+
+        Returns:
+            The model class.
+        """
+
+        root_name, obj_name = self.__model_registry__[name]
+        specifications, libname = self.__specifications__[root_name]
+        lib = rebuild_api(specifications, libname, cache_dir=self.cache_dir)
+
+        self.__models__[name] = getattr(lib, obj_name)
+
+        return self.__models__[name]
 
     def _connect_duckdb(self):
         if self.address is None and self.dbtype == SupportedBackends.DUCKDB:
@@ -226,12 +321,20 @@ class DBConnector(BaseModel):
         self,
         model: "DataModel",
         markdown_path: str,
+        indexes: Optional[List[TableIndex]] = None,
+        commit: Optional[str] = None,
+        array_storage: ArrayStorage = ArrayStorage.TABLE,
+        native_keys: bool = False,
     ):
         """Creates tables in the database from a DataModel.
 
         Args:
             model (DataModel): The DataModel to create tables from.
             markdown_path (str): The path/GitURL to the markdown file that contains the DataModel.
+            indexes (Optional[List[TableIndex]], optional): Additional indexes to create. Defaults to None.
+            commit (Optional[str], optional): Commit hash, tag or branch of a git-hosted model. Defaults to None.
+            array_storage (ArrayStorage, optional): How lists of primitive values are stored. Defaults to ArrayStorage.TABLE.
+            native_keys (bool, optional): Whether to store keys as UUID (PostgreSQL) or BINARY(16) (MySQL). Defaults to False.
         """
 
         try:
@@ -239,24 +342,138 @@ class DBConnector(BaseModel):
                 db_connector=self,
                 model=model,
                 markdown_path=markdown_path,
+                indexes=indexes,
+                commit=commit,
+                array_storage=array_storage,
+                native_keys=native_keys,
             )
         except ConnectionRefusedError as e:
             print(
                 "❌ Couldnt connect to database. Please check your credentials or status of the database."
             )
 
+    # ! Migrations
+    def plan_migration(
+        self,
+        model: "DataModel",
+        markdown_path: str,
+        commit: Optional[str] = None,
+        array_storage: ArrayStorage = ArrayStorage.TABLE,
+    ) -> MigrationPlan:
+        """Computes the steps that migrate the tables of a model to a new version.
+
+        Example:
+
+            >>> plan = db.plan_migration(model=lib.Root, markdown_path="./model.md")
+            >>> print(plan)
+            >>> db.migrate(plan, backfill={"Root": {"new_field": 0.0}})
+
+        Args:
+            model (DataModel): The new version of the root model.
+            markdown_path (str): The path/GitURL to the markdown file of the new version.
+            commit (Optional[str], optional): Commit hash, tag or branch of a git-hosted model. Defaults to None.
+            array_storage (ArrayStorage, optional): How lists of primitive values are stored. Defaults to ArrayStorage.TABLE.
+
+        Returns:
+            MigrationPlan: The plan to apply by 'migrate'.
+        """
+
+        return plan_migration(
+            db_connector=self,
+            model=model,
+            markdown_path=markdown_path,
+            commit=commit,
+            array_storage=array_storage,
+        )
+
+    def migrate(
+        self,
+        plan: MigrationPlan,
+        drop: bool = False,
+        alter_types: bool = False,
+        backfill: Optional[Dict[str, Dict[str, Any]]] = None,
+        indexes: Optional[List[TableIndex]] = None,
+        batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE,
+    ):
+        """Applies a migration plan. See 'apply_migration' for details.
+
+        Args:
+            plan (MigrationPlan): The plan computed by 'plan_migration'.
+            drop (bool, optional): Whether to drop removed columns and tables. Defaults to False.
+            alter_types (bool, optional): Whether to change the type of columns. Defaults to False.
+            backfill (Optional[Dict[str, Dict[str, Any]]], optional): Values for added columns. Defaults to None.
+            indexes (Optional[List[TableIndex]], optional): Additional indexes to create. Defaults to None.
+            batch_size (int, optional): The number of rows to backfill per transaction. Defaults to 10000.
+        """
+
+        apply_migration(
+            db_connector=self,
+            plan=plan,
+            drop=drop,
+            alter_types=alter_types,
+            backfill=backfill,
+            indexes=indexes,
+            batch_size=batch_size,
+        )
+
     # ! Getters and inserters
-    def insert(self, *datasets: "DataModel", verbose: bool = False):
+    def insert(
+        self,
+        *datasets: "DataModel",
+        verbose: bool = False,
+        bulk: bool = False,
+        chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+        copy: bool = False,
+    ):
         """Inserts data into the database.
 
         Args:
-            table_name (str): The name of the table to insert the data into.
-            data (dict): The data to insert into the database.
+            datasets (DataModel): The datasets to insert into the database.
+            verbose (bool, optional): Whether to print each inserted dataset. Defaults to False.
+            bulk (bool, optional): Whether to flatten all datasets into per-table batches
+                and write each table with a single multi-row insert. Defaults to False.
+            chunk_size (Optional[int], optional): Maximum number of rows per insert
+                statement. None writes each table in one statement. Defaults to DEFAULT_CHUNK_SIZE.
+            copy (bool, optional): Whether to stream the flattened rows of each table
+                using COPY ... FROM STDIN. Only supported for PostgreSQL. Defaults to False.
+
+        Raises:
+            ValueError: If 'copy' is set for a database other than PostgreSQL.
         """
 
+        dbtype = getattr(self.dbtype, "value", self.dbtype)
+
+        if copy and dbtype != "postgres":
+            raise ValueError(
+                f"Inserting with COPY is only supported for PostgreSQL, not '{dbtype}'."
+            )
+
+        if bulk or copy:
+            try:
+                bulk_insert_into_database(
+                    datasets=datasets,
+                    db=self,
+                    chunk_size=chunk_size,
+                    use_copy=copy,
+                )
+            except Exception as e:
+                raise ValueError(f"Could not insert data into database: {e}") from e
+
+            if verbose:
+                for dataset in datasets:
+                    print(
+                        f"Added dataset {dataset.__class__.__name__} ({str(dataset.__id__)})"
+                    )
+
+            return
+
         for dataset in datasets:
             try:
-                insert_into_database(dataset=dataset, db=self)
+                insert_into_database(
+                    dataset=dataset,
+                    db=self,
+                    chunk_size=chunk_size,
+                )
 
                 if verbose:
                     print(
@@ -269,8 +486,10 @@ class DBConnector(BaseModel):
         self,
         table_name: str,
         filtered_table: Optional[Table] = None,
-        max_rows: int = 10,
+        max_rows: Optional[int] = 10,
         model: Optional["DataModel"] = None,
+        offset: int = 0,
+        trusted: bool = False,
     ) -> List["DataModel"]:
         """
         Retrieves rows from the specified table that match the given attribute and value.
@@ -278,7 +497,9 @@ class DBConnector(BaseModel):
         Args:
             table_name (str): The name of the table to retrieve rows from.
             filtered_table (Optional[Table], optional): A filtered table. Defaults to None.
-            max_rows (int, optional): The maximum number of rows to retrieve. Defaults to 10.
+            max_rows (Optional[int], optional): The maximum number of rows to retrieve. If None, all rows are retrieved. Defaults to 10.
+            offset (int, optional): The number of rows to skip, ordered by ID. Defaults to 0.
+            trusted (bool, optional): Whether to construct the models without validation. Defaults to False.
 
         Returns:
             List[DataModel]: A list of DataModel objects that contain the retrieved rows.
@@ -290,25 +511,304 @@ class DBConnector(BaseModel):
         if filtered_table is not None:
             table = filtered_table
         else:
-            table = self.connection.table(table_name)
+            table = self.table(table_name)
 
         if model is None:
             model = self.get_table_api(table_name)
 
         datasets = _extract_related_rows(
             table=table,
-            id_col=f"{table_name}_id",
+            table_name=table_name,
             db=self,
             model=model,
             MAX_ROWS=max_rows,
+            offset=offset,
+        )
+
+        return _instantiate_models(
+            model, datasets, trusted=trusted, blob_store=self.blob_store
+        )
+
+    def get_page(
+        self,
+        table_name: str,
+        limit: int = 10,
+        after: Optional[str] = None,
+        filtered_table: Optional[Table] = None,
+        model: Optional["DataModel"] = None,
+        trusted: bool = False,
+    ) -> Tuple[List["DataModel"], Optional[str]]:
+        """Retrieves a page of rows using keyset pagination on the ID column.
+
+        Other than offsets, the cost of each page is constant, since the database
+        can seek directly to the first row after the given ID.
+
+        Example:
+
+            >>> page, token = db.get_page("Test", limit=100)
+            >>> while token is not None:
+            >>>     page, token = db.get_page("Test", limit=100, after=token)
+
+        Args:
+            table_name (str): The name of the table to retrieve rows from.
+            limit (int, optional): The maximum number of rows per page. Defaults to 10.
+            after (Optional[str], optional): Continuation token of the previous page. Defaults to None.
+            filtered_table (Optional[Table], optional): A filtered table. Defaults to None.
+            model (Optional[DataModel], optional): The model to use. Defaults to None.
+            trusted (bool, optional): Whether to construct the models without validation. Defaults to False.
+
+        Returns:
+            Tuple[List[DataModel], Optional[str]]: The models of the page and the continuation
+            token for the next page, which is None if there are no more rows.
+
+        Raises:
+            ValueError: If the limit is not positive or the requested model is not registered.
+        """
+
+        if limit < 1:
+            raise ValueError(f"Limit must be positive, got {limit}")
+
+        if filtered_table is not None:
+            table = filtered_table
+        else:
+            table = self.table(table_name)
+
+        if model is None:
+            model = self.get_table_api(table_name)
+
+        id_col = f"{table_name}_id"
+
+        if after is not None:
+            table = table[table[id_col] > _key_literal(table[id_col], after)]
+
+        # Fetch one additional row to find out whether there is a next page
+        rows = table.order_by(id_col).limit(limit + 1).execute()
+        has_next = len(rows) > limit
+        rows = rows.iloc[:limit]
+
+        datasets = _hydrate_rows(
+            rows=rows,
+            table_name=table_name,
+            db=self,
+            model=model,
+        )
+
+        token = str(_decode_key(rows[id_col].iloc[-1])) if has_next else None
+
+        models = _instantiate_models(
+            model, datasets, trusted=trusted, blob_store=self.blob_store
+        )
+
+        return models, token
+
+    def iter_models(
+        self,
+        table_name: str,
+        batch_size: int = 1000,
+        filtered_table: Optional[Table] = None,
+        model: Optional["DataModel"] = None,
+        trusted: bool = False,
+    ) -> Iterator["DataModel"]:
+        """Iterates over all rows of a table without loading the table into memory.
+
+        Root rows are read in batches through a server-side cursor and the related
+        objects of each batch are loaded with one query per sub table.
+
+        Example:
+
+            >>> for dataset in db.iter_models("Test", batch_size=500):
+            >>>     print(dataset.name)
+
+        Args:
+            table_name (str): The name of the table to iterate over.
+            batch_size (int, optional): The number of root rows per batch. Defaults to 1000.
+            filtered_table (Optional[Table], optional): A filtered table. Defaults to None.
+            model (Optional[DataModel], optional): The model to use. Defaults to None.
+            trusted (bool, optional): Whether to construct the models without validation. Defaults to False.
+
+        Yields:
+            DataModel: The model of each row.
+
+        Raises:
+            ValueError: If the requested model is not registered.
+        """
+
+        if filtered_table is not None:
+            table = filtered_table
+        else:
+            table = self.table(table_name)
+
+        if model is None:
+            model = self.get_table_api(table_name)
+
+        for rows in _stream_rows(table=table, db=self, batch_size=batch_size):
+            datasets = _hydrate_rows(
+                rows=rows,
+                table_name=table_name,
+                db=self,
+                model=model,
+            )
+
+            yield from _instantiate_models(
+                model, datasets, trusted=trusted, blob_store=self.blob_store
+            )
+
+    # ! Columnar getters
+    def get_frame(
+        self,
+        table_name: str,
+        filtered_table: Optional[Table] = None,
+        max_rows: Optional[int] = 10,
+        offset: int = 0,
+        model: Optional["DataModel"] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Retrieves rows and their related rows as one DataFrame per table.
+
+        The frames of sub tables only contain rows that are related to the
+        retrieved rows and can be joined using the '<table>_id' columns.
+        Binary columns hold their payloads, thus offloaded blobs are fetched.
+
+        Args:
+            table_name (str): The name of the table to retrieve rows from.
+            filtered_table (Optional[Table], optional): A filtered table. Defaults to None.
+            max_rows (Optional[int], optional): The maximum number of rows to retrieve. If None, all rows are retrieved. Defaults to 10.
+            offset (int, optional): The number of rows to skip, ordered by ID. Defaults to 0.
+            model (Optional[DataModel], optional): The model to use. Defaults to None.
+
+        Returns:
+            Dict[str, pd.DataFrame]: Mapping of table names to their rows.
+
+        Raises:
+            ValueError: If the requested model is not registered.
+        """
+
+        if filtered_table is not None:
+            table = filtered_table
+        else:
+            table = self.table(table_name)
+
+        if model is None:
+            model = self.get_table_api(table_name)
+
+        rows = _limit_rows(
+            table=table,
+            id_col=f"{table_name}_id",
+            limit=max_rows,
+            offset=offset,
+        ).execute()
+
+        frames = _fetch_frames(
+            rows=rows,
+            table_name=table_name,
+            db=self,
+            model=model,
         )
 
-        return [model(**d) for d in datasets]
+        key_columns = _key_columns(model, table_name)
+
+        return {
+            name: _decode_blob_columns(
+                _decode_key_columns(frame, columns=key_columns[name]),
+                db=self,
+                table_name=name,
+            )
+            for name, frame in frames.items()
+        }
+
+    def get_arrow(
+        self,
+        table_name: str,
+        filtered_table: Optional[Table] = None,
+        max_rows: Optional[int] = 10,
+        offset: int = 0,
+        model: Optional["DataModel"] = None,
+        nested: bool = False,
+    ) -> Union[Dict[str, pa.Table], pa.Table]:
+        """Retrieves rows and their related rows as Arrow tables.
+
+        Args:
+            table_name (str): The name of the table to retrieve rows from.
+            filtered_table (Optional[Table], optional): A filtered table. Defaults to None.
+            max_rows (Optional[int], optional): The maximum number of rows to retrieve. If None, all rows are retrieved. Defaults to 10.
+            offset (int, optional): The number of rows to skip, ordered by ID. Defaults to 0.
+            model (Optional[DataModel], optional): The model to use. Defaults to None.
+            nested (bool, optional): Whether to return a single table with related objects
+                as struct and list columns instead of one table per model table. Defaults to False.
+
+        Returns:
+            Union[Dict[str, pa.Table], pa.Table]: Mapping of table names to Arrow tables or a single nested Arrow table.
+
+        Raises:
+            ValueError: If the requested model is not registered.
+        """
+
+        if model is None:
+            model = self.get_table_api(table_name)
+
+        frames = self.get_frame(
+            table_name=table_name,
+            filtered_table=filtered_table,
+            max_rows=max_rows,
+            offset=offset,
+            model=model,
+        )
+
+        if not nested:
+            return {
+                name: pa.Table.from_pandas(frame, preserve_index=False)
+                for name, frame in frames.items()
+            }
+
+        records = _assemble_records(
+            frames=frames,
+            table_name=table_name,
+            model=model,
+        )
+
+        return pa.Table.from_pylist(_align_rows(records))
+
+    # ! Table handles
+    def table(self, name: str) -> Table:
+        """Returns a cached table expression for the specified table.
+
+        Creating a table expression reflects the table and its schema from the
+        database catalog. Handles are therefore cached and reused until they are
+        invalidated, which happens whenever tables are created or altered.
+
+        Args:
+            name (str): The name of the table.
+
+        Returns:
+            Table: The table expression.
+        """
+
+        if name not in self.__tables__:
+            self.__tables__[name] = self.connection.table(name)
+
+        return self.__tables__[name]
+
+    def invalidate_tables(self, *names: str):
+        """Removes table expressions from the cache.
+
+        Args:
+            names (str): The names of the tables to invalidate. If none are given, all tables are invalidated.
+        """
+
+        if not names:
+            self.__tables__.clear()
+            return
+
+        for name in names:
+            self.__tables__.pop(name, None)
 
     # ! API Tools
     def get_table_api(self, name: str):
         """Returns an API for the specified table.
 
+        Unknown names, and any name once 'model_refresh_interval' seconds have
+        passed, trigger a check of the __model_meta__ table, such that models
+        added or migrated by other connectors are picked up.
+
         Args:
             name (str): The name of the table.
 
@@ -318,11 +818,28 @@ class DBConnector(BaseModel):
         Raises:
             ValueError: If the requested model is not registered.
         """
-        model_meta = (
-            self.connection.table("__model_meta__").to_pandas().set_index("table")
+
+        expired = (
+            time.monotonic() - self.__model_meta_checked__
+            >= self.model_refresh_interval
         )
 
-        if name not in self.__models__:
+        if name not in self.__model_registry__ or expired:
+            self._refresh_models()
+
+        if name in self.__models__:
+            return self.__models__[name]
+
+        if name not in self.__model_registry__:
             raise ValueError(f"Requested model '{name}' is not registered.")
 
-        return self.__models__[name]
+        return self._build_model(name)
+
+
+def _model_meta_version(count: int, version: Any) -> Tuple[int, Optional[int]]:
+    """Combines the row count and highest version of the __model_meta__ table.
+
+    The count covers removed rows and rows written before versions were recorded.
+    """
+
+    return int(count), None if pd.isna(version) else int(version)
@@ -1,16 +1,51 @@
+import asyncio
+import operator
+import time
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date, datetime
 from enum import Enum
+from functools import partial
+import sqlalchemy as sa
 import strawberry
+from strawberry.scalars import Base64
 
 from sdrdm_database import DBConnector
-from typing import Any, Callable, Optional, Tuple, get_args, get_origin, List
-from pydantic import create_model
+from typing import Any, Callable, Dict, Optional, Tuple, get_args, get_origin, List
+from strawberry.dataloader import DataLoader
+from strawberry.extensions import QueryDepthLimiter
+from strawberry.types import Info
+from strawberry.types.nodes import SelectedField, Selection
 
+from sdrdm_database.arrays import decode_list, is_ndarray
+from sdrdm_database.blobstore import decode_blob
+from sdrdm_database.dataio import (
+    _TEMPORAL_PARSERS,
+    _decode_key,
+    _fetch_related,
+    _frame_to_records,
+    _group_by_key,
+    _key_literal,
+)
 from sdrdm_database.dbconnector import SupportedBackends
 from sdrdm_database.tablecreator import _deconstruct_union_type
 
+# Should not exceed the connection pool size of the engine, which is 5 by default
+DEFAULT_MAX_WORKERS = 4
 
-from typing import Tuple, List, Any, Optional, Callable
-import strawberry
+# Seconds the row counts used for cost estimation are cached
+STATISTICS_TTL = 300
+
+# Catalog statistics that estimate the row count of a table without scanning it
+_ROW_ESTIMATES = {
+    "postgres": sa.text(
+        "SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"
+    ),
+    "mysql": sa.text(
+        "SELECT table_rows FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = :name"
+    ),
+}
 
 
 def prepare_graphql(
@@ -21,10 +56,54 @@ def prepare_graphql(
     db_name: str,
     host: str,
     dbtype: SupportedBackends,
+    connection: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    row_budget: Optional[int] = None,
+    truncate: bool = False,
 ) -> Tuple[strawberry.type, Callable[[Optional[str]], List[Any]]]:
     """
     Prepares a GraphQL schema and resolver function for a given database table.
 
+    Nested objects are resolved lazily through DataLoaders, which batch the
+    rows of each sub table by the keys of their parents. Hence, a query costs
+    one statement per requested sub table, regardless of the number of rows.
+    Since these resolvers are asynchronous, the schema has to be executed
+    asynchronously, e.g. by 'strawberry server' or 'schema.execute'.
+
+    The returned resolver function is a coroutine function. All blocking
+    database I/O is run on a thread pool of at most 'max_workers' threads,
+    such that slow queries do not stall the event loop of the server.
+
+    If a 'row_budget' is given, the number of rows a query fetches is estimated
+    from the requested page size and the row counts of the involved tables.
+    Queries that exceed the budget are rejected or, if 'truncate' is set, their
+    page size is reduced to fit the budget. To limit the depth of queries, add
+    strawberry's 'QueryDepthLimiter' extension to the schema.
+
+    If the resolver function is given the 'info' of the field it resolves,
+    only the columns requested by the selection set are fetched.
+
+    If 'connection' is set, the resolver function returns a Relay-style
+    connection instead of a list. It accepts the arguments 'first', 'after'
+    and 'filter', which are compiled into the WHERE and LIMIT clauses of the
+    query. The connection type and the filter input are registered as
+    '<table>Connection' and '<table>Filter' within the model registry.
+
+    Example:
+
+        >>> registry, resolver_fun = prepare_graphql(table="Root", connection=True, **env)
+        >>> @strawberry.type
+        >>> class Query:
+        >>>     @strawberry.field
+        >>>     async def roots(
+        >>>         self,
+        >>>         info: Info,
+        >>>         first: int = 10,
+        >>>         after: Optional[str] = None,
+        >>>         filter: Optional[registry["RootFilter"]] = None,
+        >>>     ) -> registry["RootConnection"]:
+        >>>         return await resolver_fun(first=first, after=after, filter=filter, info=info)
+
     Args:
         table (str): The name of the database table to create a schema for.
         username (str): The username to use when connecting to the database.
@@ -33,6 +112,10 @@ def prepare_graphql(
         db_name (str): The name of the database to connect to.
         host (str): The hostname or IP address of the database server.
         dbtype (SupportedBackends): The type of database backend to use.
+        connection (bool, optional): Whether to resolve into a paginated connection. Defaults to False.
+        max_workers (int, optional): The maximum number of concurrent database queries. Defaults to 4.
+        row_budget (Optional[int], optional): The maximum estimated number of rows per query. Defaults to None.
+        truncate (bool, optional): Whether to reduce the page size of queries over budget instead of rejecting them. Defaults to False.
 
     Returns:
         Tuple[strawberry.type, Callable[[Optional[str]], List[Any]]]: A tuple containing the GraphQL schema type and a resolver function for the schema.
@@ -49,43 +132,295 @@ def prepare_graphql(
 
     model_registry = {}
     model = db.get_table_api(table)
-    dtype = _convert_model(model, model_registry)
+    _convert_model(model, model_registry)
+    executor = _create_executor(db, max_workers)
+    estimator = _create_estimator(db, row_budget, truncate)
 
-    for name, submodel in model_registry.items():
-        schema_type = strawberry.experimental.pydantic.type(
-            model=submodel, all_fields=True
-        )(type(name + "Type", (), {}))
+    if connection:
+        connection_type, filter_type = _connection_types(
+            name=table,
+            dtype=model_registry[table],
+        )
+
+        model_registry[f"{table}Connection"] = connection_type
+        model_registry[f"{table}Filter"] = filter_type
+
+        async def _resolve_connection(
+            first: int = 10,
+            after: Optional[str] = None,
+            filter: Optional[Any] = None,
+            info: Optional[Info] = None,
+        ):
+            return await _run_blocking(
+                executor,
+                _connection_resolver_fun,
+                db=db,
+                table_name=table,
+                dtype=model_registry[table],
+                connection_type=connection_type,
+                first=first,
+                after=after,
+                filter=filter,
+                info=info,
+                executor=executor,
+                estimator=estimator,
+            )
 
-        model_registry[name] = schema_type
+        return model_registry, _resolve_connection
 
-    def _resolve(id: Optional[str] = None):
-        return _resolver_fun(
+    async def _resolve(id: Optional[str] = None, info: Optional[Info] = None):
+        return await _run_blocking(
+            executor,
+            _resolver_fun,
             db=db,
             table_name=table,
             dtype=model_registry[table],
             id=id,
-            model=dtype,
+            info=info,
+            executor=executor,
+            estimator=estimator,
         )
 
     return model_registry, _resolve
 
 
+def build_graphql_schema(
+    db: DBConnector,
+    connection: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_depth: Optional[int] = None,
+    row_budget: Optional[int] = None,
+    truncate: bool = False,
+    **kwargs,
+) -> strawberry.Schema:
+    """
+    Builds a single GraphQL schema that covers all models registered in a database.
+
+    All models are converted with one shared registry, such that sub models
+    used by several roots are only converted once. The query type offers one
+    field per root table, named after the table with a lowercase first letter.
+    Database queries of all fields share one thread pool of 'max_workers' threads.
+
+    Recursive models can lead to deeply nested queries that fan out across
+    many sub tables. Thus, the depth of queries can be limited by 'max_depth',
+    which counts the 'edges' and 'node' levels of connections too. The number
+    of fetched rows can be limited by 'row_budget' (see 'prepare_graphql').
+
+    Example:
+
+        >>> db = DBConnector(**env)
+        >>> schema = build_graphql_schema(db, connection=True)
+
+    Args:
+        db (DBConnector): The database connector to resolve queries with.
+        connection (bool, optional): Whether to resolve root fields into paginated
+            connections (see 'prepare_graphql'). Defaults to False.
+        max_workers (int, optional): The maximum number of concurrent database queries. Defaults to 4.
+        max_depth (Optional[int], optional): The maximum depth of queries. Defaults to None.
+        row_budget (Optional[int], optional): The maximum estimated number of rows per query. Defaults to None.
+        truncate (bool, optional): Whether to reduce the page size of queries over budget instead of rejecting them. Defaults to False.
+        **kwargs: Additional keyword arguments passed to strawberry.Schema.
+
+    Returns:
+        strawberry.Schema: The schema covering all registered root tables.
+    """
+
+    model_registry = {}
+    namespace = {}
+    executor = _create_executor(db, max_workers)
+    estimator = _create_estimator(db, row_budget, truncate)
+
+    for table, (_, obj_name) in db.__specifications__.items():
+        dtype = _convert_model(db.get_table_api(obj_name), model_registry)
+        field_name = table[0].lower() + table[1:]
+
+        if connection:
+            connection_type, filter_type = _connection_types(name=table, dtype=dtype)
+            namespace[field_name] = _connection_field(
+                db=db,
+                table_name=table,
+                dtype=dtype,
+                connection_type=connection_type,
+                filter_type=filter_type,
+                executor=executor,
+                estimator=estimator,
+            )
+        else:
+            namespace[field_name] = _list_field(
+                db=db,
+                table_name=table,
+                dtype=dtype,
+                executor=executor,
+                estimator=estimator,
+            )
+
+    if not namespace:
+        raise ValueError("There are no models registered in the database.")
+
+    query = strawberry.type(type("Query", (), namespace))
+    extensions = list(kwargs.pop("extensions", []))
+
+    if max_depth is not None:
+        extensions.append(QueryDepthLimiter(max_depth=max_depth))
+
+    return strawberry.Schema(query=query, extensions=extensions, **kwargs)
+
+
+def _list_field(
+    db: DBConnector,
+    table_name: str,
+    dtype: strawberry.type,
+    executor: Executor,
+    estimator: Optional["_CostEstimator"],
+):
+    """Creates a root field that lists the rows of a table."""
+
+    async def resolve(info: Info, id: Optional[str] = None) -> List[dtype]:
+        return await _run_blocking(
+            executor,
+            _resolver_fun,
+            db=db,
+            table_name=table_name,
+            dtype=dtype,
+            id=id,
+            info=info,
+            executor=executor,
+            estimator=estimator,
+        )
+
+    return strawberry.field(resolver=resolve)
+
+
+def _connection_field(
+    db: DBConnector,
+    table_name: str,
+    dtype: strawberry.type,
+    connection_type: strawberry.type,
+    filter_type: strawberry.type,
+    executor: Executor,
+    estimator: Optional["_CostEstimator"],
+):
+    """Creates a root field that resolves a table into a paginated connection."""
+
+    async def resolve(
+        info: Info,
+        first: int = 10,
+        after: Optional[str] = None,
+        filter: Optional[filter_type] = None,
+    ) -> connection_type:
+        return await _run_blocking(
+            executor,
+            _connection_resolver_fun,
+            db=db,
+            table_name=table_name,
+            dtype=dtype,
+            connection_type=connection_type,
+            first=first,
+            after=after,
+            filter=filter,
+            info=info,
+            executor=executor,
+            estimator=estimator,
+        )
+
+    return strawberry.field(resolver=resolve)
+
+
+def _create_executor(db: DBConnector, max_workers: int) -> ThreadPoolExecutor:
+    """Creates the thread pool that runs the database queries of resolvers.
+
+    DuckDB shares a single connection across threads, which does not support
+    concurrent transactions. Hence, its queries are run on a single thread.
+    """
+
+    if max_workers < 1:
+        raise ValueError(f"Argument 'max_workers' must be positive, got {max_workers}.")
+
+    if db.dbtype == SupportedBackends.DUCKDB:
+        max_workers = 1
+
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="sdrdm-graphql",
+    )
+
+
+async def _run_blocking(executor: Optional[Executor], fun: Callable, /, **kwargs):
+    """Runs a blocking function on an executor without blocking the event loop.
+
+    Args:
+        executor (Optional[Executor]): The executor to use. Runs the function inline if None.
+        fun (Callable): The function to run.
+        **kwargs: Keyword arguments passed to the function.
+
+    Returns:
+        The result of the function.
+    """
+
+    if executor is None:
+        return fun(**kwargs)
+
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(executor, partial(fun, **kwargs))
+
+
 def _convert_model(model, registered_models={}):
     """
     Converts a Pydantic model to a Strawberry type.
 
+    Scalar attributes become plain fields, whereas attributes that are stored
+    in sub tables become fields with resolvers that load their rows on demand.
+
     Args:
         model (pydantic.BaseModel): The Pydantic model to convert.
 
     Returns:
         strawberry.type: The converted Strawberry type.
     """
-    to_model = {}
+
+    if model.__name__ in registered_models:
+        return registered_models[model.__name__]
+
+    namespace = {"__annotations__": {}}
+    scalars = []
+    relations = {}
+    parsers = {}
+    binaries = []
+
     for attr in model.__fields__.values():
+        is_multiple = get_origin(attr.outer_type_) is list
+        is_obj = hasattr(attr.type_, "__fields__")
         dtype = _prepare_dtype(attr, registered_models)
-        to_model[attr.name] = (dtype, ...)
 
-    converted = create_model(model.__name__, **to_model)
+        if is_obj or is_multiple:
+            namespace[attr.name] = strawberry.field(
+                resolver=_related_resolver(
+                    model=model,
+                    attr=attr,
+                    dtype=dtype,
+                    registered_models=registered_models,
+                )
+            )
+            relations[attr.name] = (
+                f"{model.__name__}_{attr.name}",
+                registered_models[attr.type_.__name__] if is_obj else None,
+            )
+        else:
+            namespace["__annotations__"][attr.name] = Optional[dtype]
+            namespace[attr.name] = None
+            scalars.append(attr.name)
+
+            if dtype in _TEMPORAL_PARSERS:
+                parsers[attr.name] = _TEMPORAL_PARSERS[dtype]
+            elif dtype is Base64:
+                binaries.append(attr.name)
+
+    converted = strawberry.type(type(model.__name__ + "Type", (), namespace))
+    converted._scalar_fields = scalars
+    converted._parsers = parsers
+    converted._binary_fields = binaries
+    converted._relations = relations
     registered_models[model.__name__] = converted
 
     return converted
@@ -112,8 +447,9 @@ def _prepare_dtype(
     elif is_obj and dtype.__name__ in registered_models:
         dtype = registered_models[dtype.__name__]
 
-    if dtype == bytes:
-        dtype = str
+    # Binaries and NPY-encoded arrays are exposed as their base64-encoded payload
+    if dtype == bytes or is_ndarray(dtype):
+        dtype = Base64
 
     if is_multiple:
         return List[dtype]
@@ -121,34 +457,771 @@ def _prepare_dtype(
         return dtype
 
 
+def _related_resolver(
+    model,
+    attr,
+    dtype,
+    registered_models,
+):
+    """Creates the resolver of an attribute that is stored in a sub table.
+
+    Lists of primitive values that are stored in a column of the parent table
+    are loaded from the parent table instead.
+
+    Args:
+        model (pydantic.BaseModel): The model the attribute belongs to.
+        attr: The attribute to resolve.
+        dtype: The GraphQL type of the attribute.
+        registered_models (Dict): The registry of converted types.
+
+    Returns:
+        Callable: An asynchronous resolver function.
+    """
+
+    is_multiple = get_origin(attr.outer_type_) is list
+    is_obj = hasattr(attr.type_, "__fields__")
+    sub_table_name = f"{model.__name__}_{attr.name}"
+
+    async def resolve(root, info: Info):
+        key_col = f"{root._table}_id"
+
+        if not is_obj and attr.name in root._loaders.db.table(root._table).columns:
+            rows = await root._loaders.load(
+                table_name=root._table,
+                key_col=key_col,
+                key=root._row_id,
+                columns=[attr.name, key_col],
+            )
+
+            return decode_list(rows[0][attr.name]) if rows else []
+
+        if is_obj:
+            columns = _projection(
+                info=info,
+                dtype=registered_models[attr.type_.__name__],
+                table_name=sub_table_name,
+            )
+        else:
+            columns = [attr.name]
+
+        rows = await root._loaders.load(
+            table_name=sub_table_name,
+            key_col=key_col,
+            key=root._row_id,
+            columns=list(dict.fromkeys([*columns, key_col])),
+        )
+
+        if not is_obj:
+            return [row[attr.name] for row in rows]
+
+        children = [
+            _to_instance(
+                dtype=registered_models[attr.type_.__name__],
+                row=row,
+                table_name=sub_table_name,
+                loaders=root._loaders,
+            )
+            for row in rows
+        ]
+
+        if is_multiple:
+            return children
+
+        return children[0] if children else None
+
+    resolve.__annotations__["return"] = dtype if is_multiple else Optional[dtype]
+
+    return resolve
+
+
+def _to_instance(
+    dtype: strawberry.type,
+    row: Dict[str, Any],
+    table_name: str,
+    loaders: "_RowLoaders",
+):
+    """Creates an instance of a converted type from a row of its table.
+
+    Args:
+        dtype (strawberry.type): The converted type.
+        row (Dict[str, Any]): The row to convert.
+        table_name (str): The name of the table the row belongs to.
+        loaders (_RowLoaders): The loaders used to resolve related objects.
+
+    Returns:
+        An instance of the converted type.
+    """
+
+    row_id = row[f"{table_name}_id"]
+    values = {name: row.get(name) for name in dtype._scalar_fields}
+
+    if "id" in values:
+        values["id"] = _decode_key(row_id)
+
+    for name, parse in dtype._parsers.items():
+        if isinstance(values[name], str):
+            values[name] = parse(values[name])
+
+    for name in dtype._binary_fields:
+        if isinstance(values[name], (bytes, memoryview)):
+            values[name] = decode_blob(values[name], blob_store=loaders.db.blob_store)
+
+    instance = dtype(**values)
+    instance._table = table_name
+    instance._row_id = row_id
+    instance._loaders = loaders
+
+    return instance
+
+
+def _projection(
+    info: Info,
+    dtype: strawberry.type,
+    table_name: str,
+    path: Tuple[str, ...] = (),
+) -> List[str]:
+    """Returns the columns of a table that are requested by the selection set of a field.
+
+    Args:
+        info (Info): The info of the resolved field.
+        dtype (strawberry.type): The converted type of the table.
+        table_name (str): The name of the table.
+        path (Tuple[str, ...], optional): Names of the fields that lead from the resolved
+            field to the objects of the table, e.g. ('edges', 'node'). Defaults to ().
+
+    Returns:
+        List[str]: The primary key column and the requested scalar columns.
+    """
+
+    selections = _node_selections(info, path)
+    requested = {field.name for field in _selected_fields(selections)}
+    converter = info.schema.config.name_converter
+
+    columns = [
+        name
+        for name in dtype._scalar_fields
+        if name != "id" and converter.apply_naming_config(name) in requested
+    ]
+
+    return [f"{table_name}_id", *columns]
+
+
+def _node_selections(info: Info, path: Tuple[str, ...] = ()) -> List[Selection]:
+    """Returns the selections of the objects a field resolves to.
+
+    Args:
+        info (Info): The info of the resolved field.
+        path (Tuple[str, ...], optional): Names of the fields that lead from the resolved
+            field to the objects, e.g. ('edges', 'node'). Defaults to ().
+
+    Returns:
+        List[Selection]: The selections of the objects.
+    """
+
+    selections = info.selected_fields[0].selections
+
+    for name in path:
+        selections = [
+            child
+            for field in _selected_fields(selections)
+            if field.name == name
+            for child in field.selections
+        ]
+
+    return selections
+
+
+def _selected_fields(selections: List[Selection]) -> List[SelectedField]:
+    """Collects all fields within a selection set, including those of fragments.
+
+    Args:
+        selections (List[Selection]): The selections to inspect.
+
+    Returns:
+        List[SelectedField]: The selected fields.
+    """
+
+    fields = []
+
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            fields.append(selection)
+        else:
+            fields += _selected_fields(selection.selections)
+
+    return fields
+
+
+class _RowLoaders:
+    """Registry of DataLoaders that batch the rows of sub tables by their foreign key.
+
+    A registry is created for each resolved root field, so that the loaders
+    only cache rows within a single request. Batches are fetched on the given
+    executor, such that the event loop is not blocked.
+    """
+
+    def __init__(self, db: "DBConnector", executor: Optional[Executor] = None):
+        self.db = db
+        self.executor = executor
+        self._loaders = {}
+
+    def load(
+        self,
+        table_name: str,
+        key_col: str,
+        key: Any,
+        columns: Optional[List[str]] = None,
+    ):
+        """Schedules the rows of a sub table that belong to the given key.
+
+        Args:
+            table_name (str): The name of the sub table.
+            key_col (str): The name of the foreign key column.
+            key (Any): The primary key of the parent row.
+            columns (Optional[List[str]], optional): The columns to fetch. Defaults to all columns.
+
+        Returns:
+            Awaitable[List[Dict[str, Any]]]: The rows belonging to the key.
+        """
+
+        if columns is not None:
+            columns = tuple(columns)
+
+        loader_key = (table_name, key_col, columns)
+
+        if loader_key not in self._loaders:
+            self._loaders[loader_key] = DataLoader(
+                load_fn=partial(self._load_rows, table_name, key_col, columns)
+            )
+
+        return self._loaders[loader_key].load(key)
+
+    async def _load_rows(
+        self,
+        table_name: str,
+        key_col: str,
+        columns: Optional[Tuple[str, ...]],
+        keys: List[Any],
+    ) -> List[List[Dict[str, Any]]]:
+        frame = await _run_blocking(
+            self.executor,
+            _fetch_related,
+            db=self.db,
+            table_name=table_name,
+            key_col=key_col,
+            keys=list(keys),
+            columns=list(columns) if columns is not None else None,
+        )
+
+        rows = _frame_to_records(frame)
+        groups = _group_by_key(
+            keys=[row[key_col] for row in rows],
+            values=rows,
+        )
+
+        return [groups.get(key, []) for key in keys]
+
+
 def _resolver_fun(
     db: "DBConnector",
     table_name: str,
     dtype: strawberry.type,
     model: Any = None,
     id=None,
+    max_rows: int = 10,
+    info: Optional[Info] = None,
+    executor: Optional[Executor] = None,
+    estimator: Optional["_CostEstimator"] = None,
 ):
     """
     Resolves a GraphQL query by fetching data from the database.
 
+    Only the rows of the requested table are fetched here. Related objects are
+    loaded by the resolvers of the nested fields, once they are requested.
+
     Args:
         db (DBConnector): The database connector object.
         table_name (str): The name of the table to fetch data from.
         dtype (strawberry.type): The GraphQL type to convert the data to.
         id (int, optional): The ID of the row to fetch. Defaults to None.
+        max_rows (int, optional): The maximum number of rows to fetch. Defaults to 10.
+        info (Optional[Info], optional): The info of the resolved field. If given, only
+            the requested columns are fetched. Defaults to None.
+        executor (Optional[Executor], optional): The executor nested fields are loaded on. Defaults to None.
+        estimator (Optional[_CostEstimator], optional): Enforces the row budget of the query. Defaults to None.
 
     Returns:
         List[dtype]: A list of objects of the specified GraphQL type.
     """
 
+    table = db.table(table_name)
+
     if id is not None:
-        table = db.connection.table(table_name)
-        filtered = table[table[f"{table_name}_id"] == id]
-        result = db.get(
+        id_col = table[f"{table_name}_id"]
+        table = table[id_col == _key_literal(id_col, id)]
+
+    if info is not None:
+        table = table.select(_projection(info=info, dtype=dtype, table_name=table_name))
+
+    if info is not None and estimator is not None:
+        max_rows = estimator.page_size(
+            info=info,
+            dtype=dtype,
             table_name=table_name,
-            filtered_table=filtered,
+            rows=max_rows,
         )
-    else:
-        result = db.get(table_name)
 
-    return [dtype.from_pydantic(row) for row in result]
+    rows = _frame_to_records(table.limit(max_rows).execute())
+    loaders = _RowLoaders(db, executor)
+
+    return [
+        _to_instance(
+            dtype=dtype,
+            row=row,
+            table_name=table_name,
+            loaders=loaders,
+        )
+        for row in rows
+    ]
+
+
+# ! Connections and filters
+
+
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    end_cursor: Optional[str] = None
+
+
+def _comparison_filter(name: str, dtype: type, ordered: bool = True):
+    """Creates an input type that holds comparisons of a scalar field.
+
+    Args:
+        name (str): The name of the input type.
+        dtype (type): The type of the compared values.
+        ordered (bool, optional): Whether to support range comparisons. Defaults to True.
+
+    Returns:
+        strawberry.input: The input type.
+    """
+
+    operators = ["eq", "ne", "gt", "gte", "lt", "lte"] if ordered else ["eq", "ne"]
+    namespace = {"__annotations__": {}}
+
+    for comparison in operators:
+        namespace["__annotations__"][comparison] = Optional[dtype]
+        namespace[comparison] = None
+
+    namespace["__annotations__"]["in_"] = Optional[List[dtype]]
+    namespace["in_"] = strawberry.field(default=None, name="in")
+
+    return strawberry.input(type(name, (), namespace))
+
+
+_SCALAR_FILTERS = {
+    str: _comparison_filter("StringFilter", str),
+    int: _comparison_filter("IntFilter", int),
+    float: _comparison_filter("FloatFilter", float),
+    bool: _comparison_filter("BooleanFilter", bool, ordered=False),
+    date: _comparison_filter("DateFilter", date),
+    datetime: _comparison_filter("DateTimeFilter", datetime),
+}
+
+_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in_": lambda column, values: column.isin(values),
+}
+
+
+def _connection_types(name: str, dtype: strawberry.type):
+    """Creates the connection type and the filter input of a converted type.
+
+    Args:
+        name (str): The name of the model.
+        dtype (strawberry.type): The converted type of the model.
+
+    Returns:
+        Tuple[strawberry.type, strawberry.input]: The connection type and the filter input.
+    """
+
+    filter_namespace = {"__annotations__": {}}
+
+    for field in dtype._scalar_fields:
+        scalar_type = get_args(dtype.__annotations__[field])[0]
+
+        if scalar_type in _SCALAR_FILTERS:
+            filter_namespace["__annotations__"][field] = Optional[
+                _SCALAR_FILTERS[scalar_type]
+            ]
+            filter_namespace[field] = None
+
+    filter_type = strawberry.input(type(f"{name}Filter", (), filter_namespace))
+
+    edge_type = strawberry.type(
+        type(
+            f"{name}Edge",
+            (),
+            {"__annotations__": {"node": dtype, "cursor": str}},
+        )
+    )
+
+    async def total_count(root) -> int:
+        count = await _run_blocking(root._executor, root._filtered.count().execute)
+        return int(count)
+
+    connection_type = strawberry.type(
+        type(
+            f"{name}Connection",
+            (),
+            {
+                "__annotations__": {
+                    "edges": List[edge_type],
+                    "page_info": PageInfo,
+                },
+                "total_count": strawberry.field(resolver=total_count),
+            },
+        )
+    )
+
+    connection_type._edge = edge_type
+
+    return connection_type, filter_type
+
+
+def _compile_filter(table, table_name: str, filter) -> List[Any]:
+    """Compiles a filter input into predicates on the given table.
+
+    Args:
+        table (ibis.expr.types.Table): The table to filter.
+        table_name (str): The name of the table.
+        filter (strawberry.input): The filter input of the table.
+
+    Returns:
+        List[ibis.expr.types.BooleanValue]: The predicates of all given comparisons.
+    """
+
+    predicates = []
+
+    for field, comparisons in vars(filter).items():
+        if comparisons is None:
+            continue
+
+        column = table[f"{table_name}_id" if field == "id" else field]
+
+        for name, fun in _OPERATORS.items():
+            value = getattr(comparisons, name)
+
+            if value is not None and field == "id":
+                predicates.append(fun(column, _key_literal(column, value)))
+            elif value is not None:
+                predicates.append(fun(column, _filter_literal(value)))
+
+    return predicates
+
+
+def _filter_literal(value: Any) -> Any:
+    """Converts a filter value into a literal that is comparable to its column.
+
+    Dates are stored as strings in the format drivers render them in, which
+    sorts chronologically, thus they are compared as strings of the same format.
+
+    Args:
+        value (Any): The value of a comparison.
+
+    Returns:
+        Any: The literal to compare the column to.
+    """
+
+    if isinstance(value, list):
+        return [_filter_literal(item) for item in value]
+
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+
+    if isinstance(value, date):
+        return value.isoformat()
+
+    return value
+
+
+def _connection_resolver_fun(
+    db: "DBConnector",
+    table_name: str,
+    dtype: strawberry.type,
+    connection_type: strawberry.type,
+    first: int = 10,
+    after: Optional[str] = None,
+    filter: Optional[Any] = None,
+    info: Optional[Info] = None,
+    executor: Optional[Executor] = None,
+    estimator: Optional["_CostEstimator"] = None,
+):
+    """
+    Resolves a page of a table into a Relay-style connection.
+
+    Rows are paginated by their primary key, such that the cursor of each
+    edge is the ID of its node. The filter and the page are compiled into
+    a single query, and the total count is only queried when requested.
+
+    Args:
+        db (DBConnector): The database connector object.
+        table_name (str): The name of the table to fetch data from.
+        dtype (strawberry.type): The GraphQL type to convert the data to.
+        connection_type (strawberry.type): The connection type of dtype.
+        first (int, optional): The maximum number of nodes to return. Defaults to 10.
+        after (Optional[str], optional): The cursor to continue after. Defaults to None.
+        filter (Optional[Any], optional): The filter input of the table. Defaults to None.
+        info (Optional[Info], optional): The info of the resolved field. If given, only
+            the requested columns are fetched. Defaults to None.
+        executor (Optional[Executor], optional): The executor nested fields and the total
+            count are loaded on. Defaults to None.
+        estimator (Optional[_CostEstimator], optional): Enforces the row budget of the query.
+            If it truncates the page, 'has_next_page' remains accurate. Defaults to None.
+
+    Returns:
+        connection_type: The requested page of the table.
+    """
+
+    if first < 0:
+        raise ValueError(f"Argument 'first' must not be negative, got {first}.")
+
+    table = db.table(table_name)
+    id_col = f"{table_name}_id"
+
+    if filter is not None:
+        predicates = _compile_filter(table, table_name, filter)
+
+        if predicates:
+            table = table.filter(predicates)
+
+    filtered = table
+
+    if after is not None:
+        table = table[table[id_col] > _key_literal(table[id_col], after)]
+
+    if info is not None:
+        table = table.select(
+            _projection(
+                info=info,
+                dtype=dtype,
+                table_name=table_name,
+                path=("edges", "node"),
+            )
+        )
+
+    if info is not None and estimator is not None:
+        first = estimator.page_size(
+            info=info,
+            dtype=dtype,
+            table_name=table_name,
+            rows=first,
+            path=("edges", "node"),
+        )
+
+    # Fetch one additional row to find out whether there is a next page
+    rows = _frame_to_records(table.order_by(id_col).limit(first + 1).execute())
+    has_next = len(rows) > first
+    loaders = _RowLoaders(db, executor)
+
+    edges = [
+        connection_type._edge(
+            node=_to_instance(
+                dtype=dtype,
+                row=row,
+                table_name=table_name,
+                loaders=loaders,
+            ),
+            cursor=str(_decode_key(row[id_col])),
+        )
+        for row in rows[:first]
+    ]
+
+    connection = connection_type(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=has_next,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+    )
+    connection._filtered = filtered
+    connection._executor = executor
+
+    return connection
+
+
+# ! Cost analysis
+
+
+def _create_estimator(
+    db: DBConnector,
+    row_budget: Optional[int],
+    truncate: bool,
+) -> Optional["_CostEstimator"]:
+    """Creates the cost estimator of a schema, if a row budget is given."""
+
+    if row_budget is None:
+        return None
+
+    if row_budget < 1:
+        raise ValueError(f"Argument 'row_budget' must be positive, got {row_budget}.")
+
+    return _CostEstimator(db=db, row_budget=row_budget, truncate=truncate)
+
+
+class _CostEstimator:
+    """Estimates the number of rows a query fetches and enforces a row budget.
+
+    The rows of a sub table are estimated from the rows of its parent and the
+    average number of children per parent, which is derived from the row counts
+    of both tables. Row counts are read from the catalog statistics of PostgreSQL
+    and MySQL, such that tables are not scanned, and are cached for 'ttl' seconds.
+    """
+
+    def __init__(
+        self,
+        db: DBConnector,
+        row_budget: int,
+        truncate: bool = False,
+        ttl: float = STATISTICS_TTL,
+    ):
+        self.db = db
+        self.row_budget = row_budget
+        self.truncate = truncate
+        self.ttl = ttl
+        self._row_counts = {}
+
+    def page_size(
+        self,
+        info: Info,
+        dtype: strawberry.type,
+        table_name: str,
+        rows: int,
+        path: Tuple[str, ...] = (),
+    ) -> int:
+        """Returns the page size that keeps the query within the row budget.
+
+        Args:
+            info (Info): The info of the resolved root field.
+            dtype (strawberry.type): The converted type of the root table.
+            table_name (str): The name of the root table.
+            rows (int): The requested page size.
+            path (Tuple[str, ...], optional): Path from the field to its objects. Defaults to ().
+
+        Returns:
+            int: The requested page size, or a smaller one if the query is truncated.
+
+        Raises:
+            ValueError: If the query exceeds the row budget and cannot be truncated.
+        """
+
+        estimate = self.estimate(
+            selections=_node_selections(info, path),
+            dtype=dtype,
+            table_name=table_name,
+            rows=rows,
+            converter=info.schema.config.name_converter,
+        )
+
+        if estimate <= self.row_budget:
+            return rows
+
+        # The estimate is linear in the number of root rows
+        allowed = int(rows * self.row_budget / estimate)
+
+        if self.truncate and allowed > 0:
+            return allowed
+
+        raise ValueError(
+            f"Query on '{table_name}' exceeds the row budget of {self.row_budget} rows "
+            f"with an estimated {int(estimate)} rows. Request fewer rows or fields."
+        )
+
+    def estimate(
+        self,
+        selections: List[Selection],
+        dtype: strawberry.type,
+        table_name: str,
+        rows: float,
+        converter,
+    ) -> float:
+        """Estimates the number of rows fetched for a selection set.
+
+        Args:
+            selections (List[Selection]): The selections on the objects of the table.
+            dtype (strawberry.type): The converted type of the table.
+            table_name (str): The name of the table.
+            rows (float): The number of rows fetched from the table.
+            converter (NameConverter): The name converter of the schema.
+
+        Returns:
+            float: The estimated number of rows, including those of sub tables.
+        """
+
+        total = rows
+
+        for field in _selected_fields(selections):
+            for name, (sub_table, sub_dtype) in dtype._relations.items():
+                if converter.apply_naming_config(name) != field.name:
+                    continue
+
+                sub_rows = rows * self._fan_out(sub_table, table_name)
+
+                if sub_dtype is None:
+                    total += sub_rows
+                else:
+                    total += self.estimate(
+                        selections=field.selections,
+                        dtype=sub_dtype,
+                        table_name=sub_table,
+                        rows=sub_rows,
+                        converter=converter,
+                    )
+
+        return total
+
+    def _fan_out(self, table_name: str, parent_table: str) -> float:
+        """Returns the average number of rows of a sub table per parent row."""
+
+        return self._row_count(table_name) / max(self._row_count(parent_table), 1)
+
+    def _row_count(self, table_name: str) -> int:
+        cached = self._row_counts.get(table_name)
+
+        if cached is not None and time.monotonic() - cached[1] < self.ttl:
+            return cached[0]
+
+        count = self._estimated_row_count(table_name)
+
+        if count is None:
+            count = int(self.db.table(table_name).count().execute())
+
+        self._row_counts[table_name] = (count, time.monotonic())
+
+        return count
+
+    def _estimated_row_count(self, table_name: str) -> Optional[int]:
+        """Returns the row count of the catalog statistics, if the backend keeps them."""
+
+        query = _ROW_ESTIMATES.get(self.db.connection.name)
+
+        if query is None:
+            return None
+
+        # PostgreSQL resolves quoted names case-sensitively
+        if self.db.connection.name == "postgres":
+            table_name = f'"{table_name}"'
+
+        with self.db.connection.begin() as con:
+            count = con.execute(query, {"name": table_name}).scalar()
+
+        # Tables that have never been analyzed report -1 on PostgreSQL
+        if count is None or count < 0:
+            return None
+
+        return int(count)
@@ -0,0 +1,662 @@
+import ibis
+import sqlalchemy as sa
+
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, PrivateAttr
+
+from sdrdm_database.arrays import ArrayStorage
+from sdrdm_database.tablecreator import (
+    KEY_TYPE,
+    TableIndex,
+    _MODEL_META_TABLE,
+    _build_model_content,
+    _concurrent_index_bind,
+    _create_indexes,
+    _create_table_schema,
+    _get_md_content,
+    _index_name,
+    _model_meta_row,
+    _next_model_meta_version,
+    _upgrade_model_meta,
+    _parent_id_indexes,
+    _stored_key_type,
+    _to_sqla_table,
+    _validate_index,
+    _validate_input,
+)
+
+DEFAULT_BACKFILL_BATCH_SIZE = 10_000
+
+# Columns that identify the rows of tables without primary key
+_ROW_IDENTIFIERS = {"postgres": "ctid", "sqlite": "rowid", "duckdb": "rowid"}
+
+
+class MigrationOperation(str, Enum):
+    CREATE_TABLE = "create_table"
+    ADD_COLUMN = "add_column"
+    ALTER_COLUMN_TYPE = "alter_column_type"
+    DROP_COLUMN = "drop_column"
+    DROP_TABLE = "drop_table"
+
+
+class MigrationStep(BaseModel):
+    """A single change of the database schema.
+
+    Args:
+        operation (MigrationOperation): The kind of change.
+        table (str): The name of the affected table.
+        column (Optional[str], optional): The name of the affected column. Defaults to None.
+        dtype (Optional[str], optional): The new type of the column. Defaults to None.
+        old_dtype (Optional[str], optional): The previous type of the column. Defaults to None.
+        obj_name (Optional[str], optional): The object of a created table. Defaults to None.
+    """
+
+    operation: MigrationOperation
+    table: str
+    column: Optional[str] = None
+    dtype: Optional[str] = None
+    old_dtype: Optional[str] = None
+    obj_name: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self.column is None:
+            return f"{self.operation.value} '{self.table}'"
+        elif self.operation == MigrationOperation.ALTER_COLUMN_TYPE:
+            return f"{self.operation.value} '{self.table}.{self.column}' ({self.old_dtype} -> {self.dtype})"
+
+        return f"{self.operation.value} '{self.table}.{self.column}' ({self.dtype or self.old_dtype})"
+
+
+class MigrationPlan(BaseModel):
+    """The steps that migrate the tables of a root model to a new model version.
+
+    Args:
+        root (str): The name of the root table.
+        specifications (Any): The specifications of the new model version.
+        steps (List[MigrationStep]): The steps to apply, in order of execution.
+        github_url (Optional[str], optional): The repository of the new model version. Defaults to None.
+        commit_hash (Optional[str], optional): The commit of the new model version. Defaults to None.
+    """
+
+    root: str
+    specifications: Any
+    steps: List[MigrationStep] = []
+    github_url: Optional[str] = None
+    commit_hash: Optional[str] = None
+
+    _instructions: List[Dict] = PrivateAttr(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self.steps) == 0
+
+    def __str__(self) -> str:
+        if self.is_empty:
+            return f"Model '{self.root}' is up to date."
+
+        return "\n".join(
+            [f"Migration of model '{self.root}':"]
+            + [f"├── {step}" for step in self.steps]
+        )
+
+
+def plan_migration(
+    db_connector: "DBConnector",
+    model: "DataModel",
+    markdown_path: str,
+    commit: Optional[str] = None,
+    array_storage: ArrayStorage = ArrayStorage.TABLE,
+) -> MigrationPlan:
+    """Computes the steps that migrate the tables of a model to a new version.
+
+    The tables of the stored model, which is rebuilt from the specifications in
+    __model_meta__, are compared to the tables of the new model. Tables that
+    are added or removed, columns that are added or removed and columns whose
+    type changed are turned into steps. Changes of the nullability of a column
+    are not considered, since added columns are always nullable.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+        model (DataModel): The new version of the root model, or its name.
+        markdown_path (str): The path/GitURL to the markdown file of the new version.
+        commit (Optional[str], optional): Commit hash, tag or branch of a git-hosted model. Defaults to None.
+        array_storage (ArrayStorage, optional): How lists of primitive values are stored. Must
+            match the storage the tables have been created with. Defaults to ArrayStorage.TABLE.
+
+    Returns:
+        MigrationPlan: The plan to apply by 'apply_migration'.
+
+    Raises:
+        ValueError: If the model has not been created in the database before.
+    """
+
+    _validate_input(db_connector=db_connector, model=model)
+
+    table_name = model if isinstance(model, str) else model.__name__
+    md_content, github_url, commit_hash = _get_md_content(
+        markdown_path=markdown_path,
+        commit=commit,
+        cache_dir=db_connector.cache_dir,
+    )
+
+    if isinstance(model, str):
+        model = _build_model_content(md_content=md_content, name=model)
+
+    if table_name not in db_connector.__specifications__:
+        db_connector._refresh_models()
+
+    if table_name not in db_connector.__specifications__:
+        raise ValueError(
+            f"Model '{table_name}' does not exist in the database. Use 'create_tables' instead."
+        )
+
+    old_instructions = _create_table_schema(
+        data_model=db_connector.get_table_api(table_name),
+        table_name=table_name,
+        schemes=[],
+        array_storage=array_storage,
+    )
+
+    new_instructions = _create_table_schema(
+        data_model=model,
+        table_name=table_name,
+        schemes=[],
+        array_storage=array_storage,
+    )
+
+    plan = MigrationPlan(
+        root=table_name,
+        specifications=_model_meta_row(
+            table_name=table_name,
+            obj_name=table_name,
+            md_content=md_content,
+        )["specifications"],
+        steps=_diff_instructions(old_instructions, new_instructions),
+        github_url=github_url,
+        commit_hash=commit_hash,
+    )
+    plan._instructions = new_instructions
+
+    return plan
+
+
+def _diff_instructions(
+    old_instructions: List[Dict],
+    new_instructions: List[Dict],
+) -> List[MigrationStep]:
+    """Compares the create instructions of two model versions.
+
+    Tables are created parent-first and dropped child-first, such that
+    foreign keys can always be resolved.
+
+    Args:
+        old_instructions (List[Dict]): The create instructions of the stored model.
+        new_instructions (List[Dict]): The create instructions of the new model.
+
+    Returns:
+        List[MigrationStep]: The steps to migrate from the old to the new model.
+    """
+
+    old_tables = {
+        instruction["name"]: _table_columns(instruction)
+        for instruction in old_instructions
+    }
+
+    creates, alters, drops = [], [], []
+
+    for instruction in new_instructions[::-1]:
+        table_name = instruction["name"]
+        columns = _table_columns(instruction)
+
+        if table_name not in old_tables:
+            creates.append(
+                MigrationStep(
+                    operation=MigrationOperation.CREATE_TABLE,
+                    table=table_name,
+                    obj_name=None
+                    if instruction["is_primitive"]
+                    else instruction["obj_name"],
+                )
+            )
+            continue
+
+        old_columns = old_tables[table_name]
+
+        for column, dtype in columns.items():
+            old_dtype = old_columns.get(column)
+
+            if old_dtype is None:
+                operation = MigrationOperation.ADD_COLUMN
+            elif old_dtype.lstrip("!") != dtype.lstrip("!"):
+                operation = MigrationOperation.ALTER_COLUMN_TYPE
+            else:
+                continue
+
+            alters.append(
+                MigrationStep(
+                    operation=operation,
+                    table=table_name,
+                    column=column,
+                    dtype=dtype,
+                    old_dtype=old_dtype,
+                )
+            )
+
+        for column, old_dtype in old_columns.items():
+            if column not in columns:
+                drops.append(
+                    MigrationStep(
+                        operation=MigrationOperation.DROP_COLUMN,
+                        table=table_name,
+                        column=column,
+                        old_dtype=old_dtype,
+                    )
+                )
+
+    new_tables = {instruction["name"] for instruction in new_instructions}
+
+    for instruction in old_instructions:
+        if instruction["name"] not in new_tables:
+            drops.append(
+                MigrationStep(
+                    operation=MigrationOperation.DROP_TABLE,
+                    table=instruction["name"],
+                )
+            )
+
+    return creates + alters + drops
+
+
+def _table_columns(instruction: Dict) -> Dict[str, str]:
+    """Returns the columns of a create instruction, including its keys."""
+
+    columns = dict(instruction["schema"] or {"placeholder": "string"})
+
+    if instruction["primary_key"] is not None:
+        columns[instruction["primary_key"]] = "key"
+
+    for foreign_key in instruction["foreign_keys"]:
+        columns[foreign_key["foreign_key"]] = "key"
+
+    return columns
+
+
+def apply_migration(
+    db_connector: "DBConnector",
+    plan: MigrationPlan,
+    drop: bool = False,
+    alter_types: bool = False,
+    backfill: Optional[Dict[str, Dict[str, Any]]] = None,
+    indexes: Optional[List[TableIndex]] = None,
+    batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE,
+):
+    """Applies a migration plan with the least intrusive operations.
+
+    Only online-safe operations are applied by default:
+
+    * New tables are created with their keys and parent-id indexes.
+    * New columns are added as nullable columns, which does not rewrite the table.
+    * Values given by 'backfill' are written to added columns in batches of 'batch_size'
+      rows, each within its own transaction, such that locks are held briefly.
+    * Indexes are built concurrently on PostgreSQL, which does not block writes.
+
+    Type changes rewrite the table and are only applied if 'alter_types' is set.
+    Dropping columns and tables loses data and is only applied if 'drop' is set.
+    Skipped steps are reported, but do not fail the migration.
+
+    Added parent-id columns are declared as foreign keys, like those created by
+    'create_tables'. Since SQLite and DuckDB cannot add constraints to existing
+    tables, and existing rows cannot be given a primary key, such steps are rejected.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+        plan (MigrationPlan): The plan computed by 'plan_migration'.
+        drop (bool, optional): Whether to drop removed columns and tables. Defaults to False.
+        alter_types (bool, optional): Whether to change the type of columns. Defaults to False.
+        backfill (Optional[Dict[str, Dict[str, Any]]], optional): Values for columns added by the plan,
+            given as a mapping of tables to columns and values. Defaults to None.
+        indexes (Optional[List[TableIndex]], optional): Additional indexes to create. Defaults to None.
+        batch_size (int, optional): The number of rows to backfill per transaction. Defaults to 10000.
+
+    Raises:
+        ValueError: If the plan or the backfill values cannot be applied. Nothing is changed in this case.
+    """
+
+    print(f"\n🚀 Migrating data model {plan.root}\n│")
+
+    backfill = backfill or {}
+    instructions = {
+        instruction["name"]: instruction for instruction in plan._instructions
+    }
+    connection = db_connector.connection
+    dialect = connection.con.dialect
+    dbtype = getattr(db_connector.dbtype, "value", db_connector.dbtype)
+
+    for spec in indexes or []:
+        _validate_index(spec=spec, instructions=plan._instructions)
+
+    added_columns = {
+        (step.table, step.column)
+        for step in plan.steps
+        if step.operation == MigrationOperation.ADD_COLUMN
+    }
+
+    for table_name, values in backfill.items():
+        for column, value in values.items():
+            if (table_name, column) not in added_columns:
+                raise ValueError(
+                    f"Cannot backfill '{table_name}.{column}', which is not added by the plan."
+                )
+            elif value is None:
+                raise ValueError(
+                    f"Cannot backfill '{table_name}.{column}' with None, since added columns are empty already."
+                )
+
+    foreign_keys = {}
+
+    for step in plan.steps:
+        if step.operation == MigrationOperation.ADD_COLUMN and step.dtype == "key":
+            foreign_keys[(step.table, step.column)] = _added_foreign_key(
+                step=step,
+                instruction=instructions[step.table],
+                dbtype=dbtype,
+            )
+
+    _upgrade_model_meta(db_connector)
+
+    # New tables and key columns use the key type of the existing tables
+    key_type = _stored_key_type(db_connector=db_connector, table_name=plan.root)
+    metadata = sa.MetaData()
+    new_tables, meta_rows, dropped_tables = [], [], []
+
+    with connection.begin() as bind:
+        for step in plan.steps:
+            if step.operation == MigrationOperation.CREATE_TABLE:
+                new_tables.append(
+                    _to_sqla_table(
+                        db_connector=db_connector,
+                        metadata=metadata,
+                        instruction=instructions[step.table],
+                        key_type=key_type,
+                    )
+                )
+
+                if step.obj_name is not None:
+                    meta_rows.append(
+                        _model_meta_row(
+                            table_name=step.table,
+                            obj_name=step.obj_name,
+                            md_content="",
+                            part_of=plan.root,
+                        )
+                    )
+
+            elif step.operation == MigrationOperation.ADD_COLUMN:
+                bind.execute(
+                    sa.text(
+                        f"ALTER TABLE {_quote(dialect, step.table)} ADD COLUMN "
+                        f"{_quote(dialect, step.column)} {_column_type(db_connector, step.dtype, dialect, key_type)}"
+                    )
+                )
+
+                if (step.table, step.column) in foreign_keys:
+                    reference_table, reference_column = foreign_keys[
+                        (step.table, step.column)
+                    ]
+                    bind.execute(
+                        sa.text(
+                            f"ALTER TABLE {_quote(dialect, step.table)} ADD CONSTRAINT "
+                            f"{_quote(dialect, _index_name(step.table, [step.column], prefix='fk'))} "
+                            f"FOREIGN KEY ({_quote(dialect, step.column)}) REFERENCES "
+                            f"{_quote(dialect, reference_table)} ({_quote(dialect, reference_column)})"
+                        )
+                    )
+
+            elif step.operation == MigrationOperation.ALTER_COLUMN_TYPE:
+                if not alter_types:
+                    print(f"├── Skipping {step}. Set 'alter_types' to apply it.")
+                    continue
+
+                bind.execute(
+                    sa.text(
+                        _alter_type_statement(
+                            table_name=step.table,
+                            column=step.column,
+                            dtype=_column_type(
+                                db_connector, step.dtype, dialect, key_type
+                            ),
+                            dbtype=dbtype,
+                            dialect=dialect,
+                        )
+                    )
+                )
+
+            elif not drop:
+                print(f"├── Skipping {step}. Set 'drop' to apply it.")
+                continue
+
+            elif step.operation == MigrationOperation.DROP_COLUMN:
+                bind.execute(
+                    sa.text(
+                        f"ALTER TABLE {_quote(dialect, step.table)} "
+                        f"DROP COLUMN {_quote(dialect, step.column)}"
+                    )
+                )
+
+            elif step.operation == MigrationOperation.DROP_TABLE:
+                bind.execute(sa.text(f"DROP TABLE {_quote(dialect, step.table)}"))
+                dropped_tables.append(step.table)
+
+            if step.operation != MigrationOperation.CREATE_TABLE:
+                print(f"├── Applied {step}")
+
+        metadata.create_all(bind, tables=new_tables)
+
+        for table in new_tables:
+            print(f"├── Created table '{table.name}'")
+
+        version = _next_model_meta_version(bind)
+
+        bind.execute(
+            sa.update(_MODEL_META_TABLE)
+            .where(_MODEL_META_TABLE.c.table == plan.root)
+            .values(
+                specifications=plan.specifications,
+                github_url=plan.github_url,
+                commit_hash=plan.commit_hash,
+                version=version,
+            )
+        )
+
+        if meta_rows:
+            bind.execute(
+                sa.insert(_MODEL_META_TABLE),
+                [{**row, "version": version} for row in meta_rows],
+            )
+
+        if dropped_tables:
+            bind.execute(
+                sa.delete(_MODEL_META_TABLE).where(
+                    _MODEL_META_TABLE.c.table.in_(dropped_tables)
+                )
+            )
+
+    db_connector.invalidate_tables()
+
+    for table_name, values in backfill.items():
+        for column, value in values.items():
+            _backfill_column(
+                db_connector=db_connector,
+                table_name=table_name,
+                column=column,
+                value=value,
+                instruction=instructions[table_name],
+                batch_size=batch_size,
+            )
+
+    with _concurrent_index_bind(db_connector) as bind:
+        created_indexes = _create_indexes(
+            bind=bind,
+            specs=_parent_id_indexes(plan._instructions) + list(indexes or []),
+            dbtype=dbtype,
+            concurrently=True,
+        )
+
+    for index in created_indexes:
+        print(f"├── Created index '{index.name}' on table {index.table.name}")
+
+    db_connector.invalidate_tables()
+    db_connector._build_models()
+
+    print(f"│\n╰── 🎉 Migrated data model {plan.root}\n")
+
+
+def _added_foreign_key(
+    step: MigrationStep,
+    instruction: Dict,
+    dbtype: str,
+) -> Tuple[str, str]:
+    """Returns the table and column referenced by an added key column.
+
+    Args:
+        step (MigrationStep): The step that adds the key column.
+        instruction (Dict): The create instruction of the table.
+        dbtype (str): The type of the database.
+
+    Returns:
+        Tuple[str, str]: The referenced table and column.
+
+    Raises:
+        ValueError: If the column is a primary key or the database cannot add foreign keys to existing tables.
+    """
+
+    for foreign_key in instruction["foreign_keys"]:
+        if foreign_key["foreign_key"] != step.column:
+            continue
+
+        if dbtype not in ("postgres", "mysql"):
+            raise ValueError(
+                f"Cannot apply {step}, since '{dbtype}' cannot add foreign keys to existing tables."
+            )
+
+        return foreign_key["reference_table"], foreign_key["reference_column"]
+
+    raise ValueError(
+        f"Cannot apply {step}, since existing rows cannot be given a primary key."
+    )
+
+
+def _quote(dialect: sa.Dialect, name: str) -> str:
+    return dialect.identifier_preparer.quote(name)
+
+
+def _column_type(
+    db_connector: "DBConnector",
+    dtype: str,
+    dialect: sa.Dialect,
+    key_type: sa.types.TypeEngine = KEY_TYPE,
+) -> str:
+    """Returns the SQL type of a column, which is always nullable."""
+
+    if dtype == "key":
+        sqla_type = key_type
+    else:
+        translator = db_connector.connection.compiler.translator_class
+        sqla_type = translator.get_sqla_type(ibis.dtype(dtype.lstrip("!")))
+
+    return sa.types.to_instance(sqla_type).compile(dialect=dialect)
+
+
+def _alter_type_statement(
+    table_name: str,
+    column: str,
+    dtype: str,
+    dbtype: str,
+    dialect: sa.Dialect,
+) -> str:
+    """Returns the statement that changes the type of a column."""
+
+    table_name, column = _quote(dialect, table_name), _quote(dialect, column)
+
+    if dbtype == "mysql":
+        return f"ALTER TABLE {table_name} MODIFY {column} {dtype}"
+
+    return (
+        f"ALTER TABLE {table_name} ALTER COLUMN {column} "
+        f"TYPE {dtype} USING {column}::{dtype}"
+    )
+
+
+def _backfill_column(
+    db_connector: "DBConnector",
+    table_name: str,
+    column: str,
+    value: Any,
+    instruction: Dict,
+    batch_size: int,
+):
+    """Sets a column to a value in batches, each within its own transaction.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+        table_name (str): The name of the table.
+        column (str): The name of the column to fill.
+        value (Any): The value to fill empty rows with.
+        instruction (Dict): The create instruction of the table.
+        batch_size (int): The number of rows to update per transaction.
+    """
+
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be at least 1, got {batch_size}.")
+
+    dbtype = getattr(db_connector.dbtype, "value", db_connector.dbtype)
+    table = sa.table(table_name, sa.column(column))
+    statement = (
+        sa.update(table).where(table.c[column].is_(None)).values({column: value})
+    )
+
+    if dbtype == "mysql":
+        statement = statement.with_dialect_options(mysql_limit=batch_size)
+    else:
+        # Tables without primary key address their batches by the physical row id
+        key = (
+            instruction["primary_key"] or _ROW_IDENTIFIERS[db_connector.connection.name]
+        )
+        key_table = sa.table(table_name, sa.column(key), sa.column(column))
+        batch = (
+            sa.select(key_table.c[key])
+            .where(key_table.c[column].is_(None))
+            .limit(batch_size)
+        )
+        statement = (
+            sa.update(key_table)
+            .where(key_table.c[key].in_(batch.scalar_subquery()))
+            .values({column: value})
+        )
+
+    # DuckDB does not report updated rows, which are derived from the empty rows left
+    empty_rows = (
+        sa.select(sa.func.count()).select_from(table).where(table.c[column].is_(None))
+    )
+    reports_rows = db_connector.connection.name != "duckdb"
+    total, pending = 0, None
+
+    if not reports_rows:
+        with db_connector.connection.begin() as bind:
+            pending = bind.execute(empty_rows).scalar()
+
+    while True:
+        with db_connector.connection.begin() as bind:
+            updated = bind.execute(statement).rowcount
+
+            if not reports_rows:
+                left = bind.execute(empty_rows).scalar()
+                updated, pending = pending - left, left
+
+        total += updated
+
+        if updated < batch_size:
+            break
+
+    print(f"├── Backfilled {total} rows of '{table_name}.{column}'")
@@ -1,6 +1,9 @@
+import hashlib
+import importlib.metadata
+import json
 import os
 import tempfile
-from typing import Dict
+from typing import Any, Dict, Optional, Union
 from io import StringIO
 
 from sdRDM import DataModel
@@ -8,6 +11,9 @@ from sdRDM.generator.codegen import generate_api_from_parser
 from sdRDM.markdown.markdownparser import MarkdownParser
 from sdRDM.tools.gitutils import _import_library
 
+# Libraries that have already been imported in this process
+_API_CACHE: Dict[str, Any] = {}
+
 
 def convert_md_to_json(
     md_content: str,
@@ -26,29 +32,137 @@ def convert_md_to_json(
 def rebuild_api(
     specifications: Dict,
     libname: str,
+    cache_dir: Optional[str] = None,
 ):
     """
     Rebuilds the API from the given JSON string and library name.
 
+    Generated libraries are cached on disk, keyed by a hash of the
+    specifications, the library name and the installed sdRDM version.
+    Subsequent calls with the same specifications import the cached
+    library instead of generating it again.
+
     Args:
         specifications (dict): The API specifications.
         libname (str): The name of the library.
+        cache_dir (Optional[str], optional): The directory to cache generated libraries in.
+            Defaults to the SDRDM_DB_CACHE_DIR environment variable or '~/.cache/sdrdm_database'.
 
     Returns:
         The extracted modules from the rebuilt API.
     """
+
+    key = _specifications_hash(specifications, libname)
+
+    if key in _API_CACHE:
+        return _API_CACHE[key]
+
+    api_dir = os.path.join(get_cache_dir(cache_dir), "apis", key)
+    api_loc = os.path.join(api_dir, libname)
+
+    if not os.path.isdir(api_loc):
+        _generate_api(
+            specifications=specifications,
+            libname=libname,
+            api_dir=api_dir,
+        )
+
+    lib = DataModel._extract_modules(
+        _import_library(api_loc, libname),
+        links={},
+    )
+
+    _API_CACHE[key] = lib
+
+    return lib
+
+
+def get_cache_dir(cache_dir: Optional[str] = None) -> str:
+    """Returns the directory used to cache generated libraries and specifications.
+
+    Args:
+        cache_dir (Optional[str], optional): Explicit cache directory. Defaults to None.
+
+    Returns:
+        str: The cache directory.
+    """
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(
+            "SDRDM_DB_CACHE_DIR",
+            os.path.join("~", ".cache", "sdrdm_database"),
+        )
+
+    return os.path.expanduser(cache_dir)
+
+
+def _generate_api(
+    specifications: Dict,
+    libname: str,
+    api_dir: str,
+):
+    """Generates a library into a temporary directory and moves it into the cache.
+
+    The final move is an atomic rename, such that concurrent processes never
+    import a partially written library.
+
+    Args:
+        specifications (dict): The API specifications.
+        libname (str): The name of the library.
+        api_dir (str): The cache directory of the library.
+    """
+
+    os.makedirs(api_dir, exist_ok=True)
     parser = MarkdownParser.parse_obj(specifications)
 
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with tempfile.TemporaryDirectory(dir=api_dir) as tmpdir:
         generate_api_from_parser(
             parser=parser,
             dirpath=tmpdir,
             libname=libname,
         )
 
-        api_loc = os.path.join(tmpdir, libname)
+        try:
+            os.rename(
+                os.path.join(tmpdir, libname),
+                os.path.join(api_dir, libname),
+            )
+        except OSError:
+            # Another process has already cached the library
+            if not os.path.isdir(os.path.join(api_dir, libname)):
+                raise
 
-        return DataModel._extract_modules(
-            _import_library(api_loc, libname),
-            links={},
-        )
+
+def _specifications_hash(
+    specifications: Union[Dict, str],
+    libname: str,
+) -> str:
+    """Computes the cache key of a library.
+
+    Args:
+        specifications (Union[Dict, str]): The API specifications.
+        libname (str): The name of the library.
+
+    Returns:
+        str: The hex digest of the cache key.
+    """
+
+    if not isinstance(specifications, str):
+        specifications = json.dumps(specifications, sort_keys=True)
+
+    digest = hashlib.sha256()
+
+    for part in (specifications, libname, _sdrdm_version()):
+        digest.update(part.encode())
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+def _sdrdm_version() -> str:
+    """Returns the installed sdRDM version, since generated code depends on it."""
+
+    try:
+        return importlib.metadata.version("sdRDM")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
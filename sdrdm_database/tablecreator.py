@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from enum import Enum
 import json
 import os
@@ -7,15 +8,18 @@ import tempfile
 import numpy
 import validators
 import glob
+import hashlib
+import re
+import sqlalchemy as sa
 
 from sdRDM import DataModel
-from typing import Optional, List, Dict, get_args
+from typing import Optional, Iterator, List, Dict, Set, Tuple, get_args
 from datetime import datetime, date
-from functools import partial
 from typing import get_origin
-from pydantic import PositiveFloat, PositiveInt, StrictBool, create_model
+from pydantic import BaseModel, PositiveFloat, PositiveInt, StrictBool, create_model
 
-from sdrdm_database.modelutils import convert_md_to_json, rebuild_api
+from sdrdm_database.arrays import ArrayStorage
+from sdrdm_database.modelutils import convert_md_to_json, get_cache_dir, rebuild_api
 
 
 TYPE_MAPPING = {
@@ -32,20 +36,119 @@ TYPE_MAPPING = {
     numpy.ndarray: "bytes",
 }
 
+# Primary and foreign keys hold UUIDs in their string representation
+KEY_TYPE = sa.String(36)
+
+# Native key types, which store UUIDs in 16 bytes
+NATIVE_KEY_TYPES = {
+    "postgres": sa.Uuid(),
+    "mysql": sa.BINARY(16),
+}
+
+MODEL_META_SCHEMA = {
+    "table": "!string",
+    "specifications": "json",
+    "github_url": "string",
+    "commit_hash": "string",
+    "part_of": "string",
+    "obj_name": "string",
+    "version": "int64",
+}
+
+# Untyped columns pass the JSON specifications through to the driver as is
+_MODEL_META_TABLE = sa.table(
+    "__model_meta__",
+    *[sa.column(name) for name in MODEL_META_SCHEMA],
+)
+
+_COMMIT_HASH = re.compile(r"^[0-9a-f]{40}$")
+
+# Shortest identifier limit of the supported databases (PostgreSQL)
+MAX_IDENTIFIER_LENGTH = 63
+
+# Backends that support array columns
+NATIVE_ARRAY_BACKENDS = {"postgres", "duckdb"}
+
+# Element types that can be stored as NPY-encoded arrays
+BINARY_ARRAY_TYPES = {"int64", "float64", "boolean"}
+
+
+class TableIndex(BaseModel):
+    """Declares an additional index on the columns of a table.
+
+    Example:
+
+        >>> TableIndex(table="Root_nested", columns=["name", "value"])
+        >>> TableIndex(table="Root", columns=["value"], where="value > 0")
+
+    Args:
+        table (str): The name of the table to index.
+        columns (List[str]): The columns to index, in order of precedence.
+        name (Optional[str], optional): The name of the index. Defaults to 'ix_<table>_<columns>'.
+        unique (bool, optional): Whether the index is unique. Defaults to False.
+        where (Optional[str], optional): SQL predicate of a partial index. Only supported
+            by PostgreSQL and SQLite. Defaults to None.
+    """
+
+    table: str
+    columns: List[str]
+    name: Optional[str] = None
+    unique: bool = False
+    where: Optional[str] = None
+
 
 def create_tables(
     db_connector: "DBConnector",
     model: "DataModel",
     markdown_path: str,
+    indexes: Optional[List[TableIndex]] = None,
+    commit: Optional[str] = None,
+    array_storage: ArrayStorage = ArrayStorage.TABLE,
+    native_keys: bool = False,
 ):
     """Creates tables according to the given sdRDM data model.
 
+    All tables are created by a single DDL script, in which primary and foreign
+    keys are declared inline, and are registered in the __model_meta__ table
+    within the same transaction. Thus, a failure does not leave partially built
+    tables behind on databases with transactional DDL, such as PostgreSQL.
+    Note, that MySQL commits DDL statements implicitly.
+
+    Every parent-id column is indexed, since all reads of sub tables filter on
+    them. Additional indexes, such as composite or partial ones, can be declared
+    by 'indexes'. Missing indexes are also added to already existing tables,
+    which is done concurrently on PostgreSQL, such that writes are not blocked.
+
+    By default, lists of primitive values are stored in sub tables with one row
+    per value. Using 'array_storage', they can instead be stored in a single
+    column of the parent table, either as native arrays or NPY-encoded binaries.
+    Arrays of numpy.ndarray attributes are always stored NPY-encoded, which
+    preserves their dtype and shape.
+
+    Primary and foreign keys are UUIDs, which are stored as VARCHAR(36) by
+    default. Using 'native_keys', they are stored as UUID on PostgreSQL or as
+    BINARY(16) on MySQL, which halves the size of key indexes.
+    Keys are converted transparently when rows are inserted and read. Tables
+    added to an existing model use the key type of its tables.
+
     Args:
         db_connector (DBConnector): Active Database connection to add tables to.
         model (DataModel): The model to create tables for.
+        indexes (Optional[List[TableIndex]], optional): Additional indexes to create. Defaults to None.
+        commit (Optional[str], optional): Commit hash, tag or branch of a git-hosted model. The
+            resolved commit is recorded in __model_meta__. Defaults to the default branch.
+        array_storage (ArrayStorage, optional): How lists of primitive values are stored.
+            Defaults to ArrayStorage.TABLE.
+        native_keys (bool, optional): Whether to store keys with a native UUID type. Defaults to False.
+
+    Raises:
+        ValueError: If native arrays or keys are requested for a backend that does not support
+            them, or if 'native_keys' conflicts with the key type of existing tables.
     """
 
     _validate_input(db_connector=db_connector, model=model)
+    _validate_array_storage(db_connector=db_connector, array_storage=array_storage)
+    key_type = _key_type(db_connector=db_connector, native_keys=native_keys)
 
     if isinstance(model, str):
         table_name = model
@@ -54,103 +157,528 @@ def create_tables(
 
     print(f"\n🚀 Creating tables for data model {table_name}\n│")
 
-    md_content = _get_md_content(markdown_path=markdown_path)
+    md_content, github_url, commit_hash = _get_md_content(
+        markdown_path=markdown_path,
+        commit=commit,
+        cache_dir=db_connector.cache_dir,
+    )
 
     if isinstance(model, str):
         model = _build_model_content(md_content=md_content, name=model)
 
-    _add_to_model_table(
-        table_name=table_name,
-        db_connector=db_connector,
-        md_content=md_content,
-        obj_name=table_name,
-    )
-
     # Create schemes for each object found within the data model
     create_instructions = _create_table_schema(
-        db_connector=db_connector,
         data_model=model,
         table_name=table_name,
         schemes=[],  # type: ignore
+        array_storage=array_storage,
     )
 
-    # Create tables and add foreign keys
-    fk_commands, pk_commands = [], []
+    index_specs = _parent_id_indexes(create_instructions) + list(indexes or [])
+
+    for spec in index_specs:
+        _validate_index(spec=spec, instructions=create_instructions)
+
+    _upgrade_model_meta(db_connector)
+
     tables = db_connector.connection.list_tables()
+    registered = _get_registered_models(db_connector=db_connector, tables=tables)
+    key_type = _existing_key_type(
+        db_connector=db_connector,
+        instructions=create_instructions,
+        tables=tables,
+        key_type=key_type,
+    )
+    metadata = sa.MetaData()
+    new_tables, meta_rows = [], []
 
-    for instruction in create_instructions[::-1]:
-        table_name = instruction["name"]
+    if "__model_meta__" not in tables:
+        print("├── Table __model_meta__ not existing. Adding to DB!")
+        new_tables.append(
+            _to_sqla_table(
+                db_connector=db_connector,
+                metadata=metadata,
+                instruction={
+                    "name": "__model_meta__",
+                    "schema": MODEL_META_SCHEMA,
+                    "primary_key": None,
+                    "foreign_keys": [],
+                    "is_primitive": True,
+                },
+            )
+        )
 
-        if instruction["schema"] == {}:
-            instruction["schema"] = {"placeholder": "string"}
+    if table_name in registered:
+        print(f"├── Model '{table_name}' already registered. Skipping.")
+    else:
+        meta_rows.append(
+            _model_meta_row(
+                table_name=table_name,
+                obj_name=table_name,
+                md_content=md_content,
+                github_url=github_url,
+                commit_hash=commit_hash,
+            )
+        )
+        registered.add(table_name)
 
-        schema = ibis.schema(instruction["schema"])  # type: ignore
+    for instruction in create_instructions[::-1]:
+        table_name = instruction["name"]
 
         if table_name in tables:
             print(f"├── Table '{table_name}'. Already exists in database. Skipping.")
             continue
 
         # Register the sub model
-        if not instruction["is_primitive"]:
-            _add_to_model_table(
+        if not instruction["is_primitive"] and table_name not in registered:
+            meta_rows.append(
+                _model_meta_row(
+                    table_name=table_name,
+                    obj_name=instruction["obj_name"],
+                    md_content=md_content,
+                    part_of=model.__name__,
+                )
+            )
+            registered.add(table_name)
+
+        new_tables.append(
+            _to_sqla_table(
                 db_connector=db_connector,
-                md_content=md_content,
-                table_name=table_name,
-                part_of=model.__name__,
-                obj_name=instruction["obj_name"],
+                metadata=metadata,
+                instruction=instruction,
+                key_type=key_type,
+            )
+        )
+
+        tables.append(table_name)
+
+    # Indexes of new tables are built within the transaction that creates them
+    created_tables = {table.name for table in new_tables}
+    new_specs = [spec for spec in index_specs if spec.table in created_tables]
+    existing_specs = [spec for spec in index_specs if spec.table not in created_tables]
+
+    with db_connector.connection.begin() as bind:
+        metadata.create_all(bind, tables=new_tables)
+
+        if meta_rows:
+            version = _next_model_meta_version(bind)
+            bind.execute(
+                sa.insert(_MODEL_META_TABLE),
+                [{**row, "version": version} for row in meta_rows],
             )
 
-        # Create the table
-        db_connector.connection.create_table(
-            table_name,
-            schema=schema,
+        created_indexes = _create_indexes(
+            bind=bind,
+            specs=new_specs,
+            dbtype=db_connector.dbtype,
         )
 
-        if instruction["is_primitive"] is False:
-            pk_commands.append(instruction["pk_command"])
+    if existing_specs:
+        with _concurrent_index_bind(db_connector) as bind:
+            created_indexes += _create_indexes(
+                bind=bind,
+                specs=existing_specs,
+                dbtype=db_connector.dbtype,
+                concurrently=True,
+            )
+
+    for table in new_tables:
+        print(f"├── Created table '{table.name}'")
 
-        tables.append(table_name)
+    for row in meta_rows:
+        print(f"├── Added table model '{row['table']}' to __model_meta__ table")
+
+    for index in created_indexes:
+        print(f"├── Created index '{index.name}' on table {index.table.name}")
 
-        print(f"├── Created table '{table_name}'")
+    db_connector.invalidate_tables()
+    db_connector._build_models()
+
+    print(f"│\n╰── 🎉 Created all tables for data model {model.__name__}\n")
+
+
+def _to_sqla_table(
+    db_connector: "DBConnector",
+    metadata: sa.MetaData,
+    instruction: Dict,
+    key_type: sa.types.TypeEngine = KEY_TYPE,
+) -> sa.Table:
+    """Converts a create instruction into a table with inline primary and foreign keys.
 
-        fk_commands += instruction["fk_commands"]
+    Tables referenced by a foreign key that are not part of the metadata already
+    exist in the database and are added as stubs, which are not created.
 
-    for command in pk_commands:
-        primary_key = command.keywords["primary_key"]
-        table_name = command.keywords["table_name"]
-        command()
+    Args:
+        db_connector (DBConnector): The database connector object.
+        metadata (sa.MetaData): The metadata to add the table to.
+        instruction (Dict): The create instruction of the table.
+        key_type (sa.types.TypeEngine, optional): The type of primary and foreign keys. Defaults to KEY_TYPE.
+
+    Returns:
+        sa.Table: The table to create.
+    """
 
-        print(f"├── Added primary key '{primary_key}' to table {table_name}")
+    table_name = instruction["name"]
 
-    for command in fk_commands:
-        foreign_key = command.keywords["foreign_key"]
-        reference_table = command.keywords["reference_table"]
-        table_name = command.keywords["table_name"]
-        table = db_connector.connection.table(table_name)
+    if instruction["schema"] == {}:
+        instruction["schema"] = {"placeholder": "string"}
 
-        if foreign_key in table.columns:
-            print(
-                f"├── Skipping foreign key '{foreign_key}'({reference_table}). Already exists in table {table_name}"
+    schema = ibis.schema(instruction["schema"])  # type: ignore
+    translator = db_connector.connection.compiler.translator_class
+    columns = [
+        sa.Column(name, translator.get_sqla_type(dtype), nullable=dtype.nullable)
+        for name, dtype in schema.items()
+    ]
+
+    if instruction["primary_key"] is not None:
+        columns.append(
+            sa.Column(instruction["primary_key"], key_type, primary_key=True)
+        )
+
+    for foreign_key in instruction["foreign_keys"]:
+        reference_table = foreign_key["reference_table"]
+        reference_column = foreign_key["reference_column"]
+
+        if reference_table not in metadata.tables:
+            sa.Table(
+                reference_table,
+                metadata,
+                sa.Column(reference_column, key_type, primary_key=True),
+            )
+
+        columns.append(
+            sa.Column(
+                foreign_key["foreign_key"],
+                key_type,
+                sa.ForeignKey(metadata.tables[reference_table].c[reference_column]),
             )
+        )
+
+    return sa.Table(table_name, metadata, *columns)
+
+
+def _key_type(
+    db_connector: "DBConnector",
+    native_keys: bool,
+) -> sa.types.TypeEngine:
+    """Returns the type of primary and foreign keys.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+        native_keys (bool): Whether to use the native UUID type of the backend.
+
+    Returns:
+        sa.types.TypeEngine: The key type.
+
+    Raises:
+        ValueError: If native keys are requested for a backend that does not support them.
+    """
+
+    if not native_keys:
+        return KEY_TYPE
+
+    dbtype = getattr(db_connector.dbtype, "value", db_connector.dbtype)
+
+    if dbtype not in NATIVE_KEY_TYPES:
+        raise ValueError(f"Backend '{dbtype}' does not support native keys.")
+
+    return NATIVE_KEY_TYPES[dbtype]
+
+
+def _stored_key_type(
+    db_connector: "DBConnector",
+    table_name: str,
+) -> sa.types.TypeEngine:
+    """Returns the key type an existing table has been created with.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+        table_name (str): The name of a table with a primary key.
+
+    Returns:
+        sa.types.TypeEngine: The key type.
+    """
+
+    dtype = db_connector.table(table_name).schema()[f"{table_name}_id"]
+
+    if dtype.is_uuid():
+        return sa.Uuid()
+    elif dtype.is_binary():
+        return sa.BINARY(16)
+
+    return KEY_TYPE
+
+
+def _existing_key_type(
+    db_connector: "DBConnector",
+    instructions: List[Dict],
+    tables: List[str],
+    key_type: sa.types.TypeEngine,
+) -> sa.types.TypeEngine:
+    """Returns the key type of the existing tables of a model, which new tables must reference.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+        instructions (List[Dict]): The create instructions of the model.
+        tables (List[str]): The tables that exist in the database.
+        key_type (sa.types.TypeEngine): The requested key type.
+
+    Returns:
+        sa.types.TypeEngine: The key type of the existing tables, or the requested one if there are none.
+
+    Raises:
+        ValueError: If the existing tables have been created with another key type.
+    """
+
+    existing = [
+        instruction["name"]
+        for instruction in instructions
+        if instruction["name"] in tables and instruction["primary_key"] is not None
+    ]
+
+    if not existing:
+        return key_type
+
+    stored_key_type = _stored_key_type(
+        db_connector=db_connector, table_name=existing[0]
+    )
+
+    if type(stored_key_type) is not type(key_type):
+        native_keys = stored_key_type is not KEY_TYPE
+        raise ValueError(
+            f"Table '{existing[0]}' has been created {'with' if native_keys else 'without'} native keys, "
+            f"which new tables must reference. Set 'native_keys={native_keys}' to add tables to it."
+        )
+
+    return stored_key_type
+
+
+def _parent_id_indexes(instructions: List[Dict]) -> List[TableIndex]:
+    """Returns an index for each parent-id column of the given create instructions."""
+
+    return [
+        TableIndex(
+            table=instruction["name"],
+            columns=[foreign_key["foreign_key"]],
+        )
+        for instruction in instructions
+        for foreign_key in instruction["foreign_keys"]
+    ]
+
+
+def _validate_index(spec: TableIndex, instructions: List[Dict]):
+    """Checks that an index refers to a table of the model and its columns.
+
+    Args:
+        spec (TableIndex): The index to validate.
+        instructions (List[Dict]): The create instructions of the model.
+
+    Raises:
+        ValueError: If the table or one of the columns is not part of the model.
+    """
+
+    tables = {instruction["name"]: instruction for instruction in instructions}
+
+    if spec.table not in tables:
+        raise ValueError(
+            f"Cannot index table '{spec.table}', which is not part of the model."
+        )
+
+    instruction = tables[spec.table]
+    columns = set(instruction["schema"])
+    columns |= {
+        foreign_key["foreign_key"] for foreign_key in instruction["foreign_keys"]
+    }
+
+    if instruction["primary_key"] is not None:
+        columns.add(instruction["primary_key"])
+
+    unknown = [column for column in spec.columns if column not in columns]
+
+    if not spec.columns or unknown:
+        raise ValueError(
+            f"Cannot index columns {unknown or spec.columns} of table '{spec.table}'. "
+            f"Available columns are: {sorted(columns)}"
+        )
+
+
+@contextmanager
+def _concurrent_index_bind(db_connector: "DBConnector") -> Iterator[sa.Connection]:
+    """Yields a connection to build indexes of existing tables concurrently.
+
+    PostgreSQL does not allow concurrent index builds within a transaction, thus
+    they use an AUTOCOMMIT connection. Other backends, some of which do not support
+    AUTOCOMMIT, build indexes within a transaction.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+
+    Yields:
+        sa.Connection: The connection to create the indexes with.
+    """
+
+    dbtype = getattr(db_connector.dbtype, "value", db_connector.dbtype)
+
+    if dbtype == "postgres":
+        engine = db_connector.connection.con.execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+
+        with engine.connect() as bind:
+            yield bind
+    else:
+        with db_connector.connection.begin() as bind:
+            yield bind
+
+
+def _create_indexes(
+    bind: sa.Connection,
+    specs: List[TableIndex],
+    dbtype: str,
+    concurrently: bool = False,
+) -> List[sa.Index]:
+    """Creates all indexes that do not exist yet.
+
+    Args:
+        bind (sa.Connection): The connection to create the indexes with.
+        specs (List[TableIndex]): The indexes to create.
+        dbtype (str): The type of the database.
+        concurrently (bool, optional): Whether to build indexes without blocking writes. Only
+            supported by PostgreSQL, outside of transactions. Defaults to False.
+
+    Returns:
+        List[sa.Index]: The indexes that have been created.
+    """
+
+    # Index DDL only renders names, thus untyped stub tables suffice
+    metadata = sa.MetaData()
+    inspector = sa.inspect(bind)
+    existing, created = {}, []
+
+    for spec in specs:
+        if spec.table not in metadata.tables:
+            sa.Table(spec.table, metadata)
+            existing[spec.table] = _existing_indexes(
+                bind=bind, inspector=inspector, table_name=spec.table
+            )
+
+        table = metadata.tables[spec.table]
+
+        for column in spec.columns:
+            if column not in table.c:
+                table.append_column(sa.Column(column))
+
+        index = _to_sqla_index(
+            spec=spec,
+            table=table,
+            dbtype=dbtype,
+            concurrently=concurrently,
+        )
+
+        if index.name in existing[spec.table]:
             continue
 
-        print(
-            f"├── Added foreign key '{foreign_key}'({reference_table}) to table {table_name}"
+        index.create(bind)
+        existing[spec.table].add(index.name)
+        created.append(index)
+
+    return created
+
+
+def _existing_indexes(
+    bind: sa.Connection,
+    inspector: sa.Inspector,
+    table_name: str,
+) -> Set[str]:
+    """Returns the names of the indexes of a table.
+
+    DuckDB does not support the reflection of indexes, thus they are read from its catalog.
+    """
+
+    if bind.dialect.name == "duckdb":
+        rows = bind.execute(
+            sa.text("SELECT index_name FROM duckdb_indexes() WHERE table_name = :name"),
+            {"name": table_name},
         )
-        command()
+        return {row[0] for row in rows}
 
-    db_connector._build_models()
+    return {index["name"] for index in inspector.get_indexes(table_name)}
 
-    print(f"│\n╰── 🎉 Created all tables for data model {model.__name__}\n")
 
+def _to_sqla_index(
+    spec: TableIndex,
+    table: sa.Table,
+    dbtype: str,
+    concurrently: bool = False,
+) -> sa.Index:
+    """Converts an index declaration into an index of the given table."""
+
+    dialects = {"postgres": "postgresql", "sqlite": "sqlite"}
+    dbtype = getattr(dbtype, "value", dbtype)
+    kwargs = {}
+
+    if spec.where is not None:
+        if dbtype not in dialects:
+            raise ValueError(f"Partial indexes are not supported by '{dbtype}'.")
+
+        kwargs[f"{dialects[dbtype]}_where"] = sa.text(spec.where)
+
+    if concurrently and dbtype == "postgres":
+        kwargs["postgresql_concurrently"] = True
+
+    return sa.Index(
+        spec.name or _index_name(spec.table, spec.columns),
+        *[table.c[column] for column in spec.columns],
+        unique=spec.unique,
+        **kwargs,
+    )
+
+
+def _index_name(table_name: str, columns: List[str], prefix: str = "ix") -> str:
+    """Returns the default name of an index or constraint, shortened by a hash if too long."""
+
+    name = f"{prefix}_{table_name}_{'_'.join(columns)}"
+
+    if len(name) <= MAX_IDENTIFIER_LENGTH:
+        return name
+
+    digest = hashlib.sha1(name.encode()).hexdigest()[:8]
+
+    return f"{name[:MAX_IDENTIFIER_LENGTH - 9]}_{digest}"
+
+
+def _get_md_content(
+    markdown_path: str,
+    commit: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+) -> Tuple[str, Optional[str], Optional[str]]:
+    """Reads a markdown model from a file or a git repository.
+
+    Args:
+        markdown_path (str): The path to the markdown file or the URL of a git repository.
+        commit (Optional[str], optional): Commit hash, tag or branch of the repository. Defaults to None.
+        cache_dir (Optional[str], optional): The directory to cache specifications in. Defaults to None.
+
+    Returns:
+        Tuple[str, Optional[str], Optional[str]]: The markdown model and, if fetched
+        from a git repository, its URL and commit hash.
+    """
 
-def _get_md_content(markdown_path: str) -> str:
     if validators.url(markdown_path):
-        print("├── Fetching markdown model from GitHub")
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            return _fetch_specs(markdown_path, tmpdirname)
-    else:
-        return open(markdown_path).read()
+        md_content, commit_hash = _fetch_specs(
+            url=markdown_path,
+            ref=commit,
+            cache_dir=cache_dir,
+        )
+
+        return md_content, markdown_path, commit_hash
+
+    if commit is not None:
+        raise ValueError(
+            "Commits can only be pinned for models hosted in git repositories."
+        )
+
+    return open(markdown_path).read(), None, None
 
 
 def _build_model_content(md_content: str, name: str) -> str:
@@ -158,10 +686,157 @@ def _build_model_content(md_content: str, name: str) -> str:
     return getattr(lib, name)
 
 
-def _fetch_specs(url: str, tmpdirname: str):
-    git.Repo.clone_from(url, tmpdirname)
+def _fetch_specs(
+    url: str,
+    ref: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+) -> Tuple[str, str]:
+    """Returns the markdown model of a git repository, using a local cache.
+
+    Specifications are cached by the URL of the repository and the hash of the
+    commit they were fetched from. Branches and tags are resolved to commits by
+    'git ls-remote', which is skipped for full commit hashes. If the repository
+    is unreachable, the commit a reference was last resolved to is used, such
+    that the cache works offline once it is warm. Uncached commits are fetched
+    by a shallow clone, or from the full history if the server does not allow
+    fetching commits that are not the tip of a branch or tag.
+
+    Args:
+        url (str): The URL of the git repository.
+        ref (Optional[str], optional): Full commit hash, tag or branch. Defaults to the default branch.
+        cache_dir (Optional[str], optional): The directory to cache specifications in. Defaults to None.
+
+    Returns:
+        Tuple[str, str]: The markdown model and the hash of its commit.
+    """
+
+    repo_dir = os.path.join(
+        get_cache_dir(cache_dir),
+        "specs",
+        hashlib.sha256(url.encode()).hexdigest()[:16],
+    )
+
+    if ref is not None and _COMMIT_HASH.match(ref):
+        commit = ref
+    else:
+        commit = _resolve_ref(url=url, ref=ref or "HEAD", repo_dir=repo_dir)
+
+    spec_path = os.path.join(repo_dir, f"{commit}.md")
+
+    if os.path.exists(spec_path):
+        print(f"├── Using cached markdown model of commit {commit[:7]}")
+        return open(spec_path).read(), commit
+
+    print(f"├── Fetching markdown model of commit {commit[:7]} from repository")
+
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        repo = git.Repo.init(tmpdirname)
+
+        try:
+            repo.git.fetch(url, commit, depth=1)
+        except git.GitCommandError:
+            # Servers may not allow fetching commits that are not a branch or tag tip,
+            # which are then found in the full history of all branches and tags
+            repo.git.fetch(
+                url,
+                "+refs/heads/*:refs/remotes/origin/*",
+                "+refs/tags/*:refs/tags/*",
+            )
+
+        repo.git.checkout(commit)
+        md_content = _read_specs(tmpdirname)
+
+    _write_atomic(spec_path, md_content)
+
+    return md_content, commit
+
+
+def _resolve_ref(url: str, ref: str, repo_dir: str) -> str:
+    """Resolves a branch or tag of a repository to a commit hash.
+
+    Resolved references are recorded in the cache, which serves as a
+    fallback if the repository is unreachable.
+
+    Args:
+        url (str): The URL of the git repository.
+        ref (str): The branch or tag to resolve.
+        repo_dir (str): The cache directory of the repository.
+
+    Returns:
+        str: The commit hash the reference points to.
+    """
+
+    refs_path = os.path.join(repo_dir, "refs.json")
+    refs = {}
+
+    if os.path.exists(refs_path):
+        with open(refs_path) as file:
+            refs = json.load(file)
+
+    try:
+        # Peeled entries of annotated tags are only listed if requested
+        lines = git.cmd.Git().ls_remote(url, ref, f"{ref}^{{}}").splitlines()
+    except git.GitCommandError:
+        if ref in refs:
+            print(f"├── Repository unreachable. Using cached reference '{ref}'")
+            return refs[ref]
+
+        raise ValueError(
+            f"Repository '{url}' is unreachable and reference '{ref}' is not cached."
+        )
+
+    matches = _match_ref(lines=lines, ref=ref)
+
+    if not matches:
+        raise ValueError(
+            f"Reference '{ref}' not found in repository '{url}'. Commits have to be given by their full hash."
+        )
+    elif len(matches) > 1:
+        raise ValueError(
+            f"Reference '{ref}' is ambiguous in repository '{url}', since it matches {sorted(matches)}. "
+            f"Use the full name of the reference instead."
+        )
+
+    (commit,) = matches.values()
+
+    if refs.get(ref) != commit:
+        refs[ref] = commit
+        _write_atomic(refs_path, json.dumps(refs, indent=2))
+
+    return commit
+
+
+def _match_ref(lines: List[str], ref: str) -> Dict[str, str]:
+    """Returns the references of 'git ls-remote' that a branch or tag name denotes.
+
+    Since 'git ls-remote' matches patterns by their trailing components, only
+    entries named exactly like the reference, its branch or its tag are kept.
+    Annotated tags are listed twice, where the peeled entry holds the commit.
+
+    Args:
+        lines (List[str]): The output lines of 'git ls-remote'.
+        ref (str): The branch or tag name, or the full name of a reference.
+
+    Returns:
+        Dict[str, str]: The commit hashes of the matching references.
+    """
+
+    candidates = {ref, f"refs/heads/{ref}", f"refs/tags/{ref}"}
+    matches = {}
+
+    for line in lines:
+        commit, name = line.split("\t")
+        peeled = name.endswith("^{}")
+        name = name[: -len("^{}")] if peeled else name
+
+        if name in candidates and (peeled or name not in matches):
+            matches[name] = commit
+
+    return matches
 
-    schema_loc = os.path.join(tmpdirname, "specifications")
+
+def _read_specs(repo_dir: str) -> str:
+    schema_loc = os.path.join(repo_dir, "specifications")
     md_files = glob.glob(f"{schema_loc}/*.md")
 
     if len(md_files) == 0:
@@ -172,6 +847,19 @@ def _fetch_specs(url: str, tmpdirname: str):
     return open(md_files[0]).read()
 
 
+def _write_atomic(path: str, content: str):
+    """Writes a file by an atomic rename, such that readers never see partial content."""
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(path), delete=False
+    ) as file:
+        file.write(content)
+
+    os.replace(file.name, path)
+
+
 def _validate_input(
     db_connector: "DBConnector",
     model: DataModel,
@@ -193,111 +881,155 @@ def _validate_input(
         raise Exception(f"Could not connect to database. Error: {e}")
 
 
-def _add_to_model_table(
+def _get_registered_models(
     db_connector: "DBConnector",
+    tables: List[str],
+) -> Set[str]:
+    """Returns the names of all tables registered in the __model_meta__ table.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+        tables (List[str]): The tables existing in the database.
+
+    Returns:
+        Set[str]: The names of the registered tables.
+    """
+
+    if "__model_meta__" not in tables:
+        return set()
+
+    model_meta = db_connector.table("__model_meta__")
+
+    return set(model_meta.select("table").execute()["table"])
+
+
+def _upgrade_model_meta(db_connector: "DBConnector"):
+    """Adds the version column to __model_meta__ tables created without it.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+    """
+
+    connection = db_connector.connection
+
+    if "__model_meta__" not in connection.list_tables():
+        return
+
+    if "version" in connection.table("__model_meta__").columns:
+        return
+
+    with connection.begin() as bind:
+        bind.execute(sa.text("ALTER TABLE __model_meta__ ADD COLUMN version BIGINT"))
+
+    db_connector.invalidate_tables("__model_meta__")
+
+
+def _next_model_meta_version(bind: sa.Connection) -> int:
+    """Returns the version to record for a write to the __model_meta__ table.
+
+    Every write stamps its rows with a version above all existing ones, such
+    that connectors detect updated and replaced models, not only added ones.
+
+    Args:
+        bind (sa.Connection): The connection of the writing transaction.
+
+    Returns:
+        int: The version of the write.
+    """
+
+    current = bind.execute(sa.select(sa.func.max(_MODEL_META_TABLE.c.version)))
+
+    return (current.scalar() or 0) + 1
+
+
+def _validate_array_storage(
+    db_connector: "DBConnector",
+    array_storage: ArrayStorage,
+):
+    """Checks whether the backend supports the given array storage.
+
+    Args:
+        db_connector (DBConnector): The database connector object.
+        array_storage (ArrayStorage): The requested array storage.
+
+    Raises:
+        ValueError: If native arrays are requested for a backend that does not support them.
+    """
+
+    dbtype = getattr(db_connector.dbtype, "value", db_connector.dbtype)
+
+    if array_storage == ArrayStorage.NATIVE and dbtype not in NATIVE_ARRAY_BACKENDS:
+        raise ValueError(
+            f"Backend '{dbtype}' does not support array columns. "
+            f"Use ArrayStorage.BINARY or ArrayStorage.TABLE instead."
+        )
+
+
+def _model_meta_row(
     table_name: str,
     obj_name: str,
     md_content: str,
     github_url: Optional[str] = None,
     commit_hash: Optional[str] = None,
     part_of: Optional[str] = None,
-):
-    """Adds a table model to the __model_meta__ table in the database.
+) -> Dict:
+    """Creates the row of a table model for the __model_meta__ table.
 
     Args:
-        db_connector (DBConnector): The database connector object.
         table_name (str): The name of the table.
         obj_name (str): The name of the object.
-        markdown_path (str): The path to the markdown file.
+        md_content (str): The content of the markdown model.
         github_url (Optional[str], optional): The URL of the GitHub repository. Defaults to None.
         commit_hash (Optional[str], optional): The commit hash of the repository. Defaults to None.
         part_of (Optional[str], optional): The name of the parent object. Defaults to None.
-    """
 
-    _create_model_meta_table(db_connector=db_connector)
-    model_meta_table = db_connector.connection.table("__model_meta__").to_pandas()
+    Returns:
+        Dict: The row to insert into __model_meta__.
+    """
 
     if not part_of:
         api_schema = convert_md_to_json(md_content)
     else:
         api_schema = None
 
-    if table_name in model_meta_table["table"].values:
-        print(f"├── Model '{table_name}' already registered. Skipping.")
-        return
-
-    db_connector.connection.insert(
-        "__model_meta__",
-        [
-            {
-                "table": table_name,
-                "specifications": api_schema,
-                "github_url": github_url,
-                "commit_hash": commit_hash,
-                "part_of": part_of,
-                "obj_name": obj_name,
-            }
-        ],
-    )
-
-    print(f"├── Added table model '{table_name}' to __model_meta__ table")
-
-
-def _create_model_meta_table(
-    db_connector: "DBConnector",
-):
-    """Creates a table named __model_meta__ in the database if it doesn't exist.
-
-    Args:
-        db_connector (DBConnector): A database connector object.
-    """
-    schema = ibis.schema(
-        {
-            "table": "!string",
-            "specifications": "json",
-            "github_url": "string",
-            "commit_hash": "string",
-            "part_of": "string",
-            "obj_name": "string",
-        }
-    )
-
-    if "__model_meta__" not in db_connector.connection.list_tables():
-        print("├── Table __model_meta__ not existing. Adding to DB!")
-        db_connector.connection.create_table(
-            name="__model_meta__",
-            schema=schema,
-        )
+    return {
+        "table": table_name,
+        "specifications": api_schema,
+        "github_url": github_url,
+        "commit_hash": commit_hash,
+        "part_of": part_of,
+        "obj_name": obj_name,
+    }
 
 
 def _create_table_schema(
-    db_connector: "DBConnector",
     data_model: "DataModel",
     table_name: str,
     schemes: List[Dict],
     parent: Optional[str] = None,
     is_primitive: bool = False,
+    array_storage: ArrayStorage = ArrayStorage.TABLE,
 ):
     """Creates a table schema for a given DataModel object.
 
     Args:
-        db_connector (DBConnector): A database connector object.
-        obj (DataModel): A DataModel object.
+        data_model (DataModel): A DataModel object.
         table_name (str): The name of the table to create.
         schemes (List[Dict]): A list of table schema dictionaries.
         parent (Optional[str], optional): The name of the parent table. Defaults to None.
+        array_storage (ArrayStorage, optional): How lists of primitive values are stored.
+            Defaults to ArrayStorage.TABLE.
 
     Returns:
         List[Dict]: A list of table schema dictionaries.
     """
 
-    schema, fk_commands = {}, []
+    schema, foreign_keys = {}, []
 
     _handle_foreign_keys(
         parent=parent,
         table_name=table_name,
-        db_connector=db_connector,
-        fk_commands=fk_commands,
+        foreign_keys=foreign_keys,
     )
 
     for attr in data_model.__fields__.values():
@@ -307,9 +1039,12 @@ def _create_table_schema(
 
         if attr.name == "id":
             continue
+        elif is_multiple and not is_obj and _is_inline_array(attr, array_storage):
+            _populate_array_schema(
+                attr=attr, schema=schema, array_storage=array_storage
+            )
         elif is_multiple and not is_obj:
             _create_table_schema(
-                db_connector=db_connector,
                 data_model=create_model(
                     attr.name,
                     **{attr.name: (attr.type_, ...)},
@@ -321,29 +1056,22 @@ def _create_table_schema(
             )
         elif is_obj:
             _create_table_schema(
-                db_connector=db_connector,
                 data_model=attr.type_,
                 table_name=sub_table_name,
                 schemes=schemes,
                 parent=table_name,
+                array_storage=array_storage,
             )
         else:
             _populate_schema(attr=attr, schema=schema)
 
-    pk_fun = partial(
-        db_connector.__commands__.add_primary_key,
-        table_name=table_name,
-        primary_key=f"{table_name}_id",
-        dbconnector=db_connector,
-    )
-
     schemes.append(
         {
             "name": table_name,
             "obj_name": data_model.__name__,
             "schema": schema,
-            "pk_command": pk_fun,
-            "fk_commands": fk_commands,
+            "primary_key": None if is_primitive else f"{table_name}_id",
+            "foreign_keys": foreign_keys,
             "is_primitive": is_primitive,
         }
     )
@@ -354,17 +1082,15 @@ def _create_table_schema(
 def _handle_foreign_keys(
     parent: str,
     table_name: str,
-    db_connector: "DBConnector",
-    fk_commands: List,
+    foreign_keys: List[Dict],
 ):
-    """Add a foreign key to the table schema and create a command to add the foreign key to the database.
+    """Adds the foreign key that references the parent table to the keys of a table.
 
     Args:
         parent (str): The name of the parent table.
         table_name (str): The name of the table to add the foreign key to.
-        schema (Dict): The schema of the table.
-        db_connector (DBConnector): The database connector object.
-        fk_commands (List): The list of commands to add foreign keys to the database.
+        foreign_keys (List[Dict]): The foreign keys of the table, given by their
+            column and the referenced table and column.
 
     Returns:
         None
@@ -373,19 +1099,12 @@ def _handle_foreign_keys(
     if not parent:
         return
 
-    kwargs = {
-        "table_name": table_name,
-        "foreign_key": f"{parent}_id",
-        "reference_table": parent,
-        "reference_column": f"{parent}_id",
-        "dbconnector": db_connector,
-    }
-
-    fk_commands.append(
-        partial(
-            db_connector.__commands__.add_foreign_key,
-            **kwargs,
-        )
+    foreign_keys.append(
+        {
+            "foreign_key": f"{parent}_id",
+            "reference_table": parent,
+            "reference_column": f"{parent}_id",
+        }
     )
 
 
@@ -413,6 +1132,53 @@ def _populate_schema(
     )
 
 
+def _is_inline_array(
+    attr,
+    array_storage: ArrayStorage,
+) -> bool:
+    """Checks whether a list of primitive values is stored in its parent table.
+
+    Binary storage only applies to numeric and boolean values, other lists
+    remain in sub tables.
+
+    Args:
+        attr: The list attribute.
+        array_storage (ArrayStorage): The requested array storage.
+
+    Returns:
+        bool: Whether the list is stored in a column of the parent table.
+    """
+
+    if array_storage == ArrayStorage.TABLE:
+        return False
+    elif array_storage == ArrayStorage.BINARY:
+        return _map_type(attr.type_, False) in BINARY_ARRAY_TYPES
+
+    return True
+
+
+def _populate_array_schema(
+    attr,
+    schema: Dict,
+    array_storage: ArrayStorage,
+) -> None:
+    """Populates the schema dictionary with the column of a list of primitive values.
+
+    Args:
+        attr: The list attribute to add to the schema.
+        schema: The schema dictionary to populate.
+        array_storage (ArrayStorage): The requested array storage.
+
+    Returns:
+        None
+    """
+
+    if array_storage == ArrayStorage.BINARY:
+        schema[attr.name] = "binary"
+    else:
+        schema[attr.name] = f"array<{_map_type(attr.type_, False)}>"
+
+
 def _map_type(
     dtype,
     required: bool,
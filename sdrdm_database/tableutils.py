@@ -24,7 +24,7 @@ def join_related(
     ), "Table must be a string or ibis.Table"
 
     if isinstance(table, str):
-        table = db.connection.table(table)
+        table = db.table(table)
 
     table_name = table.get_name()
     model = db.get_table_api(table_name)
@@ -68,7 +68,7 @@ def _join_related_rows(
         if not is_obj and not is_multiple:
             continue
 
-        to_join = db.connection.table(f"{model.__name__}_{attr.name}")
+        to_join = db.table(f"{model.__name__}_{attr.name}")
 
         if to_join.count().execute() == 0:
             continue
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from typing import List, Optional, Union
+
+from sdrdm_database.arrays import decode_array, decode_list, encode_array, is_ndarray
+
+
+def test_encode_decode_array():
+    array = np.arange(12, dtype=np.int32).reshape(3, 4)
+    decoded = decode_array(encode_array(array))
+
+    assert decoded.dtype == np.int32
+    assert decoded.shape == (3, 4)
+    assert np.array_equal(decoded, array)
+    assert not decoded.flags.writeable, "Decoded array is not a view on the buffer"
+
+    fortran = np.asfortranarray(np.arange(6.0).reshape(2, 3))
+    assert np.array_equal(decode_array(encode_array(fortran)), fortran)
+
+    with pytest.raises(ValueError):
+        encode_array([1, None])
+
+
+def test_decode_list():
+    assert decode_list(encode_array([1.5, 2.5])) == [1.5, 2.5]
+    assert decode_list(np.array([1, 2])) == [1, 2]
+    assert decode_list(["a", "b"]) == ["a", "b"]
+    assert decode_list(None) == []
+
+
+def test_is_ndarray():
+    assert is_ndarray(np.ndarray)
+    assert is_ndarray(Optional[np.ndarray])
+    assert is_ndarray(Union[List[float], np.ndarray])
+    assert not is_ndarray(bytes)
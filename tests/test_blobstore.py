@@ -0,0 +1,108 @@
+import os
+import ibis
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdrdm_database.arrays import decode_array
+from sdrdm_database import DBConnector
+from sdrdm_database.blobstore import (
+    BLOB_REFERENCE_PREFIX,
+    LocalBlobStore,
+    blob_key,
+    decode_blob,
+    encode_blob,
+)
+from sdrdm_database.dataio import _decode_blob_columns, _encode_binary
+
+
+def test_local_blob_store(tmp_path):
+    store = LocalBlobStore(str(tmp_path), threshold=16)
+    payload = b"x" * 32
+
+    reference = store.offload(payload)
+
+    assert reference.startswith(BLOB_REFERENCE_PREFIX)
+    assert store.exists(blob_key(reference))
+    assert bytes(store.resolve(reference)) == payload
+
+    # Identical payloads are stored once
+    assert store.offload(payload) == reference
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 1
+
+    # Small payloads and other values remain inline
+    assert store.offload(b"small") == b"small"
+    assert store.resolve(b"small") == b"small"
+    assert blob_key("not a reference") is None
+
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+    with pytest.raises(ValueError):
+        LocalBlobStore(str(tmp_path), threshold=0)
+
+
+def test_encode_binary(tmp_path):
+    store = LocalBlobStore(str(tmp_path), threshold=64)
+    array = np.arange(100, dtype=np.float64)
+
+    assert _encode_binary(b"raw") == b"raw"
+    assert np.array_equal(decode_array(_encode_binary(array)), array)
+
+    reference = _encode_binary(array, blob_store=store)
+    assert blob_key(reference) is not None
+
+    decoded = decode_array(store.resolve(reference))
+    assert np.array_equal(decoded, array)
+    assert not decoded.flags.writeable
+
+
+def test_blob_framing(tmp_path):
+    store = LocalBlobStore(str(tmp_path), threshold=64)
+    forged = BLOB_REFERENCE_PREFIX + b"0" * 8
+
+    # Inline payloads that look like references are escaped
+    for blob_store in (None, store):
+        encoded = encode_blob(forged, blob_store=blob_store)
+
+        assert blob_key(encoded) is None
+        assert bytes(decode_blob(encoded, blob_store=blob_store)) == forged
+
+    reference = encode_blob(b"x" * 64, blob_store=store)
+
+    with pytest.raises(ValueError, match="no blob store"):
+        decode_blob(reference)
+
+
+def test_decode_blob_columns(tmp_path):
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    db = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        dbtype="postgres",
+        host="localhost",
+        port=5432,
+        blob_store=LocalBlobStore(str(tmp_path), threshold=64),
+    )
+
+    db.connection = ibis.duckdb.connect()
+    db.connection.create_table(
+        "Root",
+        schema=ibis.schema({"Root_id": "string", "raw": "binary"}),
+    )
+
+    values = [b"x" * 64, b"small", None]
+    frame = pd.DataFrame(
+        {
+            "Root_id": ["a", "b", "c"],
+            "raw": [
+                encode_blob(value, db.blob_store) if value else None for value in values
+            ],
+        }
+    )
+
+    decoded = _decode_blob_columns(frame, db=db, table_name="Root")
+
+    assert decoded["raw"].tolist() == values
@@ -0,0 +1,124 @@
+from enum import Enum
+from types import SimpleNamespace
+
+from sdrdm_database import commands
+from sdrdm_database.commands import (
+    PostgresCommands,
+    _CSVRowStream,
+    _to_copy_field,
+    _to_copy_value,
+)
+
+
+class MockEnum(Enum):
+    VALUE = "value"
+
+
+def test_to_copy_value():
+    assert _to_copy_value(None) == "\\N"
+    assert _to_copy_value(True) == "true"
+    assert _to_copy_value(False) == "false"
+    assert _to_copy_value(b"\x01\xff") == "\\x01ff"
+    assert _to_copy_value(MockEnum.VALUE) == "value"
+    assert _to_copy_value({"a": 1}) == '{"a": 1}'
+    assert _to_copy_value(1.5) == 1.5
+
+
+def test_to_copy_value_arrays():
+    assert _to_copy_value([]) == "{}"
+    assert _to_copy_value([1.0, 2.0]) == "{1.0,2.0}"
+    assert _to_copy_value([True, None, MockEnum.VALUE]) == '{"true",NULL,"value"}'
+    assert _to_copy_value([[1, 2], [3, 4]]) == "{{1,2},{3,4}}"
+
+    # Separators, quotes and backslashes within elements are escaped
+    assert (
+        _to_copy_value(["a,b", '{"c"}', "d\\e", "NULL"])
+        == '{"a,b","{\\"c\\"}","d\\\\e","NULL"}'
+    )
+
+    # Quotes of the array literal are doubled within the CSV field
+    assert _to_copy_field(['Say "Hi"']) == '"{""Say \\""Hi\\""""}"'
+
+
+def test_csv_row_stream():
+    rows = [
+        {"name": "Hello, World", "value": 1},
+        {"name": None, "value": 2},
+        {"name": "\\N", "value": None},
+        {"name": 'Say "Hi"', "value": 3},
+    ]
+
+    stream = _CSVRowStream(rows=rows, columns=["name", "value"])
+    expected = (
+        '"Hello, World","1"\r\n' '\\N,"2"\r\n' '"\\N",\\N\r\n' '"Say ""Hi""","3"\r\n'
+    )
+
+    assert stream.read(5) == expected[:5]
+    assert stream.read() == expected[5:]
+    assert stream.read(10) == ""
+
+
+class MockCursor:
+    def __init__(self):
+        self.copies = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def copy_expert(self, sql, file):
+        # Read in small chunks, like psycopg2 does with its buffer size
+        chunks = iter(lambda: file.read(8), "")
+        self.copies.append((sql, "".join(chunks)))
+
+
+class MockConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def cursor(self):
+        return self._cursor
+
+
+def test_copy_rows(monkeypatch):
+    cursor = MockCursor()
+    monkeypatch.setattr(
+        commands.psycopg2, "connect", lambda **kwargs: MockConnection(cursor)
+    )
+
+    dbconnector = SimpleNamespace(
+        db_name="Test", username="root", password="root", host="localhost", port=5432
+    )
+
+    PostgresCommands.copy_rows(
+        batches={
+            "Root": [
+                {"Root_id": "a", "name": "\\N", "flag": True},
+                {"Root_id": "b", "name": None, "flag": False},
+            ],
+            "Root_values": [],
+            "Root_nested": [{"Root_nested_id": "c", "name": 'Say "Hi"'}],
+        },
+        dbconnector=dbconnector,
+    )
+
+    assert cursor.copies == [
+        (
+            'COPY "Root" ("Root_id", "name", "flag") FROM STDIN '
+            "WITH (FORMAT csv, NULL '\\N')",
+            '"a","\\N","true"\r\n"b",\\N,"false"\r\n',
+        ),
+        (
+            'COPY "Root_nested" ("Root_nested_id", "name") FROM STDIN '
+            "WITH (FORMAT csv, NULL '\\N')",
+            '"c","Say ""Hi"""\r\n',
+        ),
+    ]
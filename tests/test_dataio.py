@@ -0,0 +1,272 @@
+import ibis
+import os
+import pandas as pd
+import pytest
+import sqlalchemy as sa
+import uuid
+
+from typing import List, Optional
+from pydantic import BaseModel, Field, PrivateAttr
+
+from sdrdm_database import DBConnector, dataio
+from sdrdm_database.dataio import (
+    _align_rows,
+    _assemble_records,
+    _chunk_rows,
+    _construct_model,
+    _decode_key,
+    _decode_key_columns,
+    _encode_keys,
+    _fetch_related,
+    _flatten_datasets,
+    _group_by_key,
+    _key_columns,
+    _key_literal,
+    _limit_rows,
+    _split_dataset,
+)
+from sdrdm_database.arrays import decode_array
+
+
+class MockNested(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    __id__: str = PrivateAttr("nested")
+
+
+class MockRoot(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    values: List[int] = Field(default_factory=list)
+    nested: List[MockNested] = Field(default_factory=list)
+    __id__: str = PrivateAttr("root")
+
+
+def test_flatten_datasets():
+    datasets = [
+        MockRoot(name="first", values=[1, 2], nested=[MockNested(name="sub")]),
+        MockRoot(name="second", values=[3]),
+    ]
+
+    batches = _flatten_datasets(datasets)
+
+    assert list(batches.keys()) == [
+        "MockRoot",
+        "MockRoot_values",
+        "MockRoot_nested",
+    ], "Tables are not in parent-before-child order"
+
+    assert batches["MockRoot"] == [
+        {"name": "first", "MockRoot_id": "root"},
+        {"name": "second", "MockRoot_id": "root"},
+    ]
+
+    assert batches["MockRoot_values"] == [
+        {"values": 1, "MockRoot_id": "root"},
+        {"values": 2, "MockRoot_id": "root"},
+        {"values": 3, "MockRoot_id": "root"},
+    ]
+
+    assert batches["MockRoot_nested"] == [
+        {"name": "sub", "MockRoot_nested_id": "nested", "MockRoot_id": "root"}
+    ]
+
+
+def test_align_rows():
+    rows = [{"a": 1}, {"b": 2}]
+
+    assert _align_rows(rows) == [
+        {"a": 1, "b": None},
+        {"a": None, "b": 2},
+    ]
+
+
+def test_chunk_rows():
+    rows = [{"value": i} for i in range(5)]
+
+    assert [len(chunk) for chunk in _chunk_rows(rows, 2)] == [2, 2, 1]
+    assert list(_chunk_rows(rows, None)) == [rows]
+    assert list(_chunk_rows([], 2)) == []
+
+    with pytest.raises(ValueError):
+        list(_chunk_rows(rows, 0))
+
+
+def test_limit_rows():
+    table = ibis.table({"Root_id": "string", "name": "string"}, name="Root")
+
+    assert _limit_rows(table, "Root_id", None) is table
+    assert _limit_rows(table, "Root_id", 5).equals(table.order_by("Root_id").limit(5))
+    assert _limit_rows(table, "Root_id", None, offset=5).equals(
+        table.order_by("Root_id").limit(None, offset=5)
+    )
+
+
+def test_group_by_key():
+    groups = _group_by_key(
+        keys=["a", "b", "a"],
+        values=[1, 2, 3],
+    )
+
+    assert groups == {"a": [1, 3], "b": [2]}
+
+
+def test_construct_model():
+    dataset = {
+        "id": "root_id",
+        "name": "root",
+        "values": [1, 2],
+        "nested": [{"id": "nested_id", "name": "sub"}],
+    }
+
+    instance = _construct_model(MockRoot, dataset)
+
+    assert isinstance(instance.nested[0], MockNested)
+    assert instance.nested[0].name == "sub"
+    assert instance.values == [1, 2]
+    assert instance.__id__ == "root_id"
+    assert instance.nested[0].__id__ == "nested_id"
+
+
+def test_assemble_records():
+    frames = {
+        "MockRoot": pd.DataFrame(
+            {"MockRoot_id": ["r1", "r2"], "name": ["first", None]},
+        ),
+        "MockRoot_values": pd.DataFrame(
+            {"values": [1, 2, 3], "MockRoot_id": ["r1", "r2", "r1"]},
+        ),
+        "MockRoot_nested": pd.DataFrame(
+            {
+                "MockRoot_nested_id": ["n1"],
+                "name": ["sub"],
+                "MockRoot_id": ["r2"],
+            },
+        ),
+    }
+
+    records = _assemble_records(
+        frames=frames,
+        table_name="MockRoot",
+        model=MockRoot,
+    )
+
+    assert records == [
+        {"name": "first", "id": "r1", "values": [1, 3], "nested": []},
+        {
+            "name": None,
+            "id": "r2",
+            "values": [2],
+            "nested": [{"name": "sub", "id": "n1"}],
+        },
+    ]
+
+
+def test_split_dataset_inline_arrays():
+    dataset = MockRoot(name="root", values=[1, 2, 3])
+
+    row, primitive_arrays, _ = _split_dataset(
+        dataset=dataset,
+        table_name="MockRoot",
+        inline_arrays={"values": False},
+    )
+
+    assert row["values"] == [1, 2, 3]
+    assert primitive_arrays == []
+
+    row, primitive_arrays, _ = _split_dataset(
+        dataset=dataset,
+        table_name="MockRoot",
+        inline_arrays={"values": True},
+    )
+
+    assert decode_array(row["values"]).tolist() == [1, 2, 3]
+    assert primitive_arrays == []
+
+
+def test_native_keys():
+    key = uuid.uuid4()
+    rows = _encode_keys(
+        [{"Root_id": str(key), "Parent_id": None, "name": "a"}],
+        columns=["Root_id", "Parent_id"],
+    )
+
+    assert rows == [{"Root_id": key.bytes, "Parent_id": None, "name": "a"}]
+
+    assert _decode_key(key.bytes) == str(key)
+    assert _decode_key(key) == str(key)
+    assert _decode_key(str(key)) == str(key)
+
+    # Binaries of other columns are kept, even if named like keys
+    frame = _decode_key_columns(
+        pd.DataFrame(
+            {"Root_id": [key.bytes], "Parent_id": [key], "file_id": [key.bytes]}
+        ),
+        columns=["Root_id", "Parent_id"],
+    )
+
+    assert frame.to_dict(orient="records") == [
+        {"Root_id": str(key), "Parent_id": str(key), "file_id": key.bytes}
+    ]
+
+    assert _key_columns(MockRoot, "MockRoot") == {
+        "MockRoot_values": ("MockRoot_id",),
+        "MockRoot_nested": ("MockRoot_nested_id", "MockRoot_id"),
+        "MockRoot": ("MockRoot_id",),
+    }
+
+
+def test_key_literal():
+    key = uuid.uuid4()
+    table = ibis.table(
+        {"uuid_id": "uuid", "binary_id": "binary", "string_id": "string"}
+    )
+
+    assert _key_literal(table.uuid_id, str(key)).equals(
+        ibis.literal(str(key), type="uuid")
+    )
+    assert _key_literal(table.binary_id, str(key)).equals(ibis.literal(key.bytes))
+    assert _key_literal(table.string_id, "malformed") == "malformed"
+
+    # Malformed keys compare to no native key
+    for column in (table.uuid_id, table.binary_id):
+        assert _key_literal(column, "malformed").equals(ibis.null().cast(column.type()))
+
+
+def test_fetch_related_chunks(monkeypatch):
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    db = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        host="localhost",
+        port=5432,
+        dbtype="postgres",
+    )
+
+    db.connection = ibis.sqlite.connect()
+    db.connection.create_table(
+        "Child",
+        pd.DataFrame({"Child_id": list("abcde"), "Parent_id": list("pqrst")}),
+    )
+
+    statements = []
+    sa.event.listen(
+        db.connection.con,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    # Keys are split into IN lists of at most two keys
+    monkeypatch.setattr(dataio, "MAX_KEYS_PER_QUERY", 2)
+
+    frame = _fetch_related(
+        db=db,
+        table_name="Child",
+        key_col="Parent_id",
+        keys=["p", "q", "r", "t", "x"],
+    )
+
+    assert sorted(frame["Child_id"]) == ["a", "b", "c", "e"]
+    assert sum("IN" in statement for statement in statements) == 3
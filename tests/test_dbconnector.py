@@ -1,7 +1,54 @@
+import ibis
 import os
+import pyarrow as pa
+import pytest
+import sqlalchemy as sa
+import uuid
 
-from sdrdm_database import DBConnector
+from datetime import date, datetime
+from enum import Enum
+from types import SimpleNamespace
+from typing import List, Optional
+from pydantic import BaseModel, Field, PrivateAttr
+
+from sdrdm_database import DBConnector, dbconnector
 from sdrdm_database.commands import PostgresCommands, MySQLCommands
+from sdrdm_database.dataio import bulk_insert_into_database
+from sdrdm_database.tablecreator import (
+    MODEL_META_SCHEMA,
+    _MODEL_META_TABLE,
+    _create_table_schema,
+    _next_model_meta_version,
+    _to_sqla_table,
+)
+
+
+class MockNested(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    __id__: str = PrivateAttr(default_factory=lambda: str(uuid.uuid4()))
+
+
+class MockRoot(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    values: List[int] = Field(default_factory=list)
+    nested: List[MockNested] = Field(default_factory=list)
+    __id__: str = PrivateAttr(default_factory=lambda: str(uuid.uuid4()))
+
+
+class MockKind(Enum):
+    SMALL = "small"
+    LARGE = "large"
+
+
+class MockEvent(BaseModel):
+    id: Optional[str] = None
+    day: Optional[date] = None
+    time: Optional[datetime] = None
+    kind: Optional[MockKind] = None
+    days: List[date] = Field(default_factory=list)
+    __id__: str = PrivateAttr(default_factory=lambda: str(uuid.uuid4()))
 
 
 def test_commands():
@@ -31,3 +78,392 @@ def test_commands():
     )
 
     assert db.__commands__ == PostgresCommands, "Wrong commands class"
+
+
+def test_table_cache():
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    class MockBackend:
+        def __init__(self):
+            self.calls = []
+
+        def table(self, name):
+            self.calls.append(name)
+            return object()
+
+    db = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        host="localhost",
+        port=5432,
+        dbtype="postgres",
+    )
+
+    db.connection = MockBackend()
+
+    first = db.table("Test")
+    assert db.table("Test") is first, "Table handle is not cached"
+    assert db.connection.calls == ["Test"]
+
+    db.invalidate_tables("Test")
+    assert db.table("Test") is not first, "Table handle was not invalidated"
+
+    db.table("Other")
+    db.invalidate_tables()
+    db.table("Other")
+
+    assert db.connection.calls == ["Test", "Test", "Other", "Other"]
+
+
+def _model_meta_connector(tmp_path, monkeypatch):
+    """Returns a connector to a SQLite database with an empty __model_meta__ table."""
+
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    # Libraries are represented by their specifications
+    monkeypatch.setattr(
+        dbconnector,
+        "rebuild_api",
+        lambda specifications, libname, cache_dir=None: SimpleNamespace(
+            **{libname: specifications}
+        ),
+    )
+
+    db = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        host="localhost",
+        port=5432,
+        dbtype="postgres",
+    )
+
+    db.connection = ibis.sqlite.connect(str(tmp_path / "test.db"))
+
+    metadata = sa.MetaData()
+    table = _to_sqla_table(
+        db_connector=db,
+        metadata=metadata,
+        instruction={
+            "name": "__model_meta__",
+            "schema": MODEL_META_SCHEMA,
+            "primary_key": None,
+            "foreign_keys": [],
+            "is_primitive": True,
+        },
+    )
+
+    with db.connection.begin() as bind:
+        metadata.create_all(bind, tables=[table])
+
+    return db
+
+
+def _write_model_meta(db, statement):
+    with db.connection.begin() as bind:
+        version = _next_model_meta_version(bind)
+        bind.execute(statement(_MODEL_META_TABLE).values(version=version))
+
+
+def test_refresh_models_detects_updates(tmp_path, monkeypatch):
+    db = _model_meta_connector(tmp_path, monkeypatch)
+
+    _write_model_meta(
+        db,
+        lambda meta: sa.insert(meta).values(
+            table="Root", specifications='"v1"', obj_name="Root"
+        ),
+    )
+
+    with db.connection.begin() as bind:
+        bind.exec_driver_sql('CREATE TABLE "Root" ("Root_id" VARCHAR(36))')
+
+    assert db.get_table_api("Root") == "v1"
+    assert db.table("Root").columns == ["Root_id"]
+
+    # Another connector migrates the table and updates its row in place,
+    # which leaves the row count unchanged
+    other = SimpleNamespace(connection=ibis.sqlite.connect(str(tmp_path / "test.db")))
+
+    with other.connection.begin() as bind:
+        bind.exec_driver_sql('ALTER TABLE "Root" ADD COLUMN "name" TEXT')
+
+    _write_model_meta(
+        other,
+        lambda meta: sa.update(meta)
+        .where(meta.c.table == "Root")
+        .values(specifications='"v2"'),
+    )
+
+    db.model_refresh_interval = 3600
+    assert db.get_table_api("Root") == "v1", "Cached model was not reused"
+
+    db.model_refresh_interval = 0
+    assert db.get_table_api("Root") == "v2", "Updated model was not reloaded"
+    assert db.table("Root").columns == ["Root_id", "name"], "Stale table handle"
+
+
+def test_refresh_models_detects_new_models(tmp_path, monkeypatch):
+    db = _model_meta_connector(tmp_path, monkeypatch)
+    db.model_refresh_interval = 3600
+
+    _write_model_meta(
+        db,
+        lambda meta: sa.insert(meta).values(
+            table="Root", specifications='"root"', obj_name="Root"
+        ),
+    )
+
+    assert db.get_table_api("Root") == "root"
+
+    with pytest.raises(ValueError, match="not registered"):
+        db.get_table_api("Other")
+
+    # Models registered after loading are found, although the interval has not passed
+    _write_model_meta(
+        db,
+        lambda meta: sa.insert(meta).values(
+            table="Other", specifications='"other"', obj_name="Other"
+        ),
+    )
+
+    assert db.get_table_api("Other") == "other", "New model was not loaded"
+    assert db.get_table_api("Root") == "root"
+
+
+def test_copy_requires_postgres():
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    db = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        host="localhost",
+        port=3306,
+        dbtype="mysql",
+    )
+
+    with pytest.raises(ValueError, match="only supported for PostgreSQL"):
+        db.insert(copy=True)
+
+
+def _populated_connector(datasets, model=None):
+    """Returns a connector to an in-memory SQLite database holding the given datasets."""
+
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    db = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        host="localhost",
+        port=5432,
+        dbtype="postgres",
+    )
+
+    db.connection = ibis.sqlite.connect()
+
+    if model is None:
+        model = type(datasets[0])
+
+    metadata = sa.MetaData()
+    instructions = _create_table_schema(
+        data_model=model,
+        table_name=model.__name__,
+        schemes=[],
+    )
+
+    tables = [
+        _to_sqla_table(db_connector=db, metadata=metadata, instruction=instruction)
+        for instruction in reversed(instructions)
+    ]
+
+    with db.connection.begin() as bind:
+        metadata.create_all(bind, tables=tables)
+
+    if datasets:
+        bulk_insert_into_database(datasets=datasets, db=db, chunk_size=None)
+
+    return db
+
+
+def _mock_datasets(count):
+    return [
+        MockRoot(
+            name=f"root_{i}",
+            values=[i, i + 10],
+            nested=[MockNested(name=f"nested_{i}_{j}") for j in range(i)],
+        )
+        for i in range(count)
+    ]
+
+
+def test_iter_models(monkeypatch):
+    datasets = _mock_datasets(5)
+    db = _populated_connector(datasets)
+
+    # Record the size of each streamed batch
+    batches = []
+    stream_rows = dbconnector._stream_rows
+
+    def _recording_stream(**kwargs):
+        for rows in stream_rows(**kwargs):
+            batches.append(len(rows))
+            yield rows
+
+    monkeypatch.setattr(dbconnector, "_stream_rows", _recording_stream)
+
+    iterator = db.iter_models("MockRoot", batch_size=2, model=MockRoot)
+    first = next(iterator)
+
+    assert batches == [2], "Rows were not read lazily"
+
+    models = [first, *iterator]
+
+    assert batches == [2, 2, 1], "Rows were not read in batches"
+    assert [model.name for model in models] == [d.name for d in datasets]
+
+    # Related objects stay aligned with their parents across batches
+    for model, dataset in zip(models, datasets):
+        assert model.id == dataset.__id__
+        assert model.values == dataset.values
+        assert [nested.name for nested in model.nested] == [
+            nested.name for nested in dataset.nested
+        ]
+        assert [nested.id for nested in model.nested] == [
+            nested.__id__ for nested in dataset.nested
+        ]
+
+
+def test_get_frame():
+    datasets = _mock_datasets(4)
+    db = _populated_connector(datasets)
+
+    # Rows are paged by their ID
+    expected = sorted(datasets, key=lambda dataset: dataset.__id__)[1:3]
+    ids = [dataset.__id__ for dataset in expected]
+
+    frames = db.get_frame("MockRoot", max_rows=2, offset=1, model=MockRoot)
+
+    assert set(frames.keys()) == {"MockRoot", "MockRoot_values", "MockRoot_nested"}
+    assert frames["MockRoot"]["MockRoot_id"].tolist() == ids
+    assert frames["MockRoot"]["name"].tolist() == [d.name for d in expected]
+
+    # Sub tables only hold rows related to the retrieved rows
+    values = frames["MockRoot_values"]
+    assert sorted(zip(values["MockRoot_id"], values["values"])) == sorted(
+        (d.__id__, value) for d in expected for value in d.values
+    )
+
+    nested = frames["MockRoot_nested"]
+    assert sorted(zip(nested["MockRoot_id"], nested["MockRoot_nested_id"])) == sorted(
+        (d.__id__, n.__id__) for d in expected for n in d.nested
+    )
+
+
+def test_get_arrow():
+    datasets = _mock_datasets(4)
+    db = _populated_connector(datasets)
+    expected = sorted(datasets, key=lambda dataset: dataset.__id__)[1:3]
+
+    tables = db.get_arrow("MockRoot", max_rows=2, offset=1, model=MockRoot)
+
+    assert tables["MockRoot"].schema.field("MockRoot_id").type == pa.string()
+    assert tables["MockRoot_values"].schema.field("values").type == pa.int64()
+    assert tables["MockRoot_nested"].num_rows == sum(len(d.nested) for d in expected)
+
+    # Related objects are assembled into list and struct columns
+    table = db.get_arrow("MockRoot", max_rows=2, offset=1, model=MockRoot, nested=True)
+
+    assert table.schema.field("values").type == pa.list_(pa.int64())
+    assert table.schema.field("nested").type == pa.list_(
+        pa.struct([("id", pa.string()), ("name", pa.string())])
+    )
+
+    assert table.to_pylist() == [
+        {
+            "name": dataset.name,
+            "id": dataset.__id__,
+            "values": dataset.values,
+            "nested": [
+                {"id": nested.__id__, "name": nested.name} for nested in dataset.nested
+            ],
+        }
+        for dataset in expected
+    ]
+
+
+def test_get_page():
+    datasets = _mock_datasets(5)
+    db = _populated_connector(datasets)
+    expected = sorted(datasets, key=lambda dataset: dataset.__id__)
+
+    page, token = db.get_page("MockRoot", limit=2, model=MockRoot)
+
+    assert [model.id for model in page] == [d.__id__ for d in expected[:2]]
+    assert token == expected[1].__id__, "Token is not the ID of the last row"
+    assert [nested.name for nested in page[1].nested] == [
+        nested.name for nested in expected[1].nested
+    ]
+
+    page, token = db.get_page("MockRoot", limit=2, after=token, model=MockRoot)
+    assert [model.id for model in page] == [d.__id__ for d in expected[2:4]]
+
+    # The last page holds the remaining row and ends the iteration
+    page, token = db.get_page("MockRoot", limit=2, after=token, model=MockRoot)
+    assert [model.id for model in page] == [expected[4].__id__]
+    assert token is None
+
+    # Pages of exactly the remaining rows end the iteration as well
+    page, token = db.get_page(
+        "MockRoot", limit=3, after=expected[1].__id__, model=MockRoot
+    )
+    assert len(page) == 3
+    assert token is None
+
+    page, token = db.get_page(
+        "MockRoot", limit=2, after=expected[-1].__id__, model=MockRoot
+    )
+    assert page == []
+    assert token is None
+
+    for limit in (0, -1):
+        with pytest.raises(ValueError, match="Limit must be positive"):
+            db.get_page("MockRoot", limit=limit, model=MockRoot)
+
+
+def test_get_trusted():
+    db = _populated_connector([], model=MockEvent)
+
+    # Dates and enums are stored as strings
+    db.connection.insert(
+        "MockEvent",
+        [
+            {
+                "MockEvent_id": "a",
+                "day": "2024-01-03",
+                "time": "2024-01-03 12:30:00",
+                "kind": "large",
+            }
+        ],
+    )
+    db.connection.insert(
+        "MockEvent_days",
+        [
+            {"days": "2024-01-01", "MockEvent_id": "a"},
+            {"days": "2024-01-02", "MockEvent_id": "a"},
+        ],
+    )
+
+    # Trusted models hold the same types as validated ones
+    validated = db.get("MockEvent", model=MockEvent)[0]
+    trusted = db.get("MockEvent", model=MockEvent, trusted=True)[0]
+
+    for model in (validated, trusted):
+        assert model.day == date(2024, 1, 3)
+        assert model.time == datetime(2024, 1, 3, 12, 30)
+        assert model.kind is MockKind.LARGE
+        assert model.days == [date(2024, 1, 1), date(2024, 1, 2)]
+
+    assert trusted == validated
@@ -0,0 +1,552 @@
+import asyncio
+import ibis
+import os
+import pandas as pd
+import pytest
+import re
+import sqlalchemy as sa
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from strawberry.schema.name_converter import NameConverter
+from strawberry.types.nodes import SelectedField
+
+from sdrdm_database import DBConnector
+from sdrdm_database.graphql import (
+    _CostEstimator,
+    _compile_filter,
+    _connection_types,
+    _convert_model,
+    _run_blocking,
+    build_graphql_schema,
+)
+
+
+class MockRoot(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    value: Optional[float] = None
+
+
+class MockChild(BaseModel):
+    id: Optional[str] = None
+    values: List[float] = Field(default_factory=list)
+
+
+class MockParent(BaseModel):
+    id: Optional[str] = None
+    children: List[MockChild] = Field(default_factory=list)
+
+
+class MockOther(BaseModel):
+    id: Optional[str] = None
+    items: List[MockChild] = Field(default_factory=list)
+
+
+class MockEvent(BaseModel):
+    id: Optional[str] = None
+    day: Optional[date] = None
+    time: Optional[datetime] = None
+
+
+def _mock_db(models, tables):
+    """Returns a connector to an in-memory DuckDB database holding the given tables."""
+
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    db = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        dbtype="postgres",
+        host="localhost",
+        port=5432,
+    )
+
+    db.connection = ibis.duckdb.connect()
+
+    for name, rows in tables.items():
+        db.connection.create_table(name, pd.DataFrame(rows))
+
+    for model in models:
+        db.__specifications__[model.__name__] = (None, model.__name__)
+        db.__models__[model.__name__] = model
+
+    return db
+
+
+def test_compile_filter():
+    registry = {}
+    dtype = _convert_model(MockRoot, registry)
+    _, filter_type = _connection_types("MockRoot", dtype)
+
+    filter_fields = filter_type.__strawberry_definition__.fields
+    string_filter = filter_fields[0].type.of_type
+    float_filter = filter_fields[2].type.of_type
+
+    table = ibis.table(
+        {"MockRoot_id": "string", "name": "string", "value": "float64"},
+        name="MockRoot",
+    )
+
+    predicates = _compile_filter(
+        table=table,
+        table_name="MockRoot",
+        filter=filter_type(
+            id=string_filter(in_=["a", "b"]),
+            value=float_filter(gte=1.0, lt=2.0),
+        ),
+    )
+
+    expected = [
+        table.MockRoot_id.isin(["a", "b"]),
+        table.value >= 1.0,
+        table.value < 2.0,
+    ]
+
+    assert len(predicates) == len(expected)
+    assert all(
+        predicate.equals(other) for predicate, other in zip(predicates, expected)
+    )
+
+
+def test_run_blocking():
+    def thread_name(prefix):
+        return prefix + threading.current_thread().name
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="worker") as executor:
+        in_pool = asyncio.run(_run_blocking(executor, thread_name, prefix=""))
+
+    inline = asyncio.run(_run_blocking(None, thread_name, prefix=""))
+
+    assert in_pool.startswith("worker")
+    assert inline == threading.current_thread().name
+
+
+def test_cost_estimator():
+    dtype = _convert_model(MockParent, {})
+    estimator = _CostEstimator(db=None, row_budget=100, ttl=float("inf"))
+    estimator._row_counts = {
+        "MockParent": (10, 0.0),
+        "MockParent_children": (30, 0.0),
+        "MockChild_values": (60, 0.0),
+    }
+
+    def field(name, selections=()):
+        return SelectedField(name, {}, {}, list(selections), None)
+
+    estimate = estimator.estimate(
+        selections=[field("id"), field("children", [field("values")])],
+        dtype=dtype,
+        table_name="MockParent",
+        rows=5,
+        converter=NameConverter(),
+    )
+
+    # 5 parents, 3 children per parent and 2 values per child
+    assert estimate == 5 + 15 + 30
+
+
+def test_temporal_fields():
+    db = _mock_db(
+        models=[MockEvent],
+        tables={
+            "MockEvent": {
+                "MockEvent_id": ["a"],
+                "day": ["2024-01-02"],
+                "time": ["2024-01-02 03:04:05"],
+            }
+        },
+    )
+
+    schema = build_graphql_schema(db)
+    result = asyncio.run(schema.execute("{ mockEvent { id day time } }"))
+
+    assert result.errors is None
+    assert result.data == {
+        "mockEvent": [{"id": "a", "day": "2024-01-02", "time": "2024-01-02T03:04:05"}]
+    }
+
+
+def test_temporal_filters():
+    db = _mock_db(
+        models=[MockEvent],
+        tables={
+            "MockEvent": {
+                "MockEvent_id": ["a", "b", "c"],
+                "day": ["2024-01-01", "2024-01-02", "2024-01-03"],
+                "time": [
+                    "2024-01-01 12:00:00",
+                    "2024-01-02 12:00:00",
+                    "2024-01-03 12:00:00",
+                ],
+            }
+        },
+    )
+
+    schema = build_graphql_schema(db, connection=True)
+    result = asyncio.run(
+        schema.execute(
+            """{
+                mockEvent(filter: {
+                    day: {gte: "2024-01-02"},
+                    time: {lt: "2024-01-03T00:00:00"}
+                }) { edges { node { id } } }
+            }"""
+        )
+    )
+
+    assert result.errors is None
+    assert result.data == {"mockEvent": {"edges": [{"node": {"id": "b"}}]}}
+
+
+def _nested_db():
+    """Returns a connector holding 4 parents with 3 children of 2 values each."""
+
+    parents = [f"p{i}" for i in range(4)]
+    children = [f"{parent}c{j}" for parent in parents for j in range(3)]
+
+    return _mock_db(
+        models=[MockParent],
+        tables={
+            "MockParent": {"MockParent_id": parents},
+            "MockParent_children": {
+                "MockParent_children_id": children,
+                "MockParent_id": [child[:2] for child in children],
+            },
+            "MockChild_values": {
+                "values": [float(i) for i in range(2 * len(children))],
+                "MockParent_children_id": [child for child in children for _ in "ab"],
+            },
+        },
+    )
+
+
+def test_schema_max_depth():
+    db = _nested_db()
+
+    # DuckDB does not support concurrent transactions on a shared connection
+    schema = build_graphql_schema(db, connection=True, max_workers=1, max_depth=3)
+
+    result = asyncio.run(schema.execute("{ mockParent { edges { node { id } } } }"))
+    assert result.errors is None
+    assert len(result.data["mockParent"]["edges"]) == 4
+
+    result = asyncio.run(
+        schema.execute("{ mockParent { edges { node { children { id } } } } }")
+    )
+    assert result.data is None
+    assert "exceeds maximum operation depth of 3" in result.errors[0].message
+
+
+def test_schema_row_budget():
+    db = _nested_db()
+    query = """{
+        mockParent(first: 4) {
+            edges { node { id children { values } } }
+            pageInfo { hasNextPage }
+        }
+    }"""
+
+    # 4 parents, 12 children and 24 values exceed the budget
+    schema = build_graphql_schema(db, connection=True, max_workers=1, row_budget=30)
+    result = asyncio.run(schema.execute(query))
+
+    assert result.data is None
+    assert "exceeds the row budget of 30 rows" in result.errors[0].message
+
+    # Fetching the parents only fits into the budget
+    result = asyncio.run(
+        schema.execute("{ mockParent(first: 4) { edges { node { id } } } }")
+    )
+    assert result.errors is None
+    assert len(result.data["mockParent"]["edges"]) == 4
+
+    # Truncated queries fetch as many parents as the budget allows
+    schema = build_graphql_schema(
+        db, connection=True, max_workers=1, row_budget=30, truncate=True
+    )
+    result = asyncio.run(schema.execute(query))
+
+    assert result.errors is None
+    assert result.data["mockParent"]["pageInfo"] == {"hasNextPage": True}
+    assert [
+        edge["node"]["children"] for edge in result.data["mockParent"]["edges"]
+    ] == [
+        [{"values": [6.0 * i + 2 * j, 6.0 * i + 2 * j + 1]} for j in range(3)]
+        for i in range(3)
+    ]
+
+    # List fields fetch up to 10 rows, thus 10 + 30 + 60 rows are estimated
+    schema = build_graphql_schema(db, max_workers=1, row_budget=30, truncate=True)
+    result = asyncio.run(schema.execute("{ mockParent { id children { values } } }"))
+
+    assert result.errors is None
+    assert [parent["id"] for parent in result.data["mockParent"]] == ["p0", "p1", "p2"]
+
+
+def test_schema_options_validation():
+    db = _nested_db()
+
+    with pytest.raises(ValueError, match="max_workers"):
+        build_graphql_schema(db, max_workers=0)
+
+    with pytest.raises(ValueError, match="row_budget"):
+        build_graphql_schema(db, row_budget=0)
+
+
+def _record_queries(db, tables):
+    """Records the SELECT statements a connector runs on the given tables."""
+
+    queries = {table: [] for table in tables}
+
+    def record(conn, cursor, statement, *args):
+        match = re.match(r'SELECT .*?\bFROM (?:main\.)?"?(\w+)', statement, re.S)
+
+        if match and match.group(1) in queries:
+            queries[match.group(1)].append(statement)
+
+    sa.event.listen(db.connection.con, "before_cursor_execute", record)
+
+    return queries
+
+
+def test_batched_related_rows():
+    db = _nested_db()
+    queries = _record_queries(
+        db, tables=["MockParent", "MockParent_children", "MockChild_values"]
+    )
+
+    schema = build_graphql_schema(db, max_workers=1)
+    result = asyncio.run(schema.execute("{ mockParent { id children { values } } }"))
+
+    assert result.errors is None
+    assert [len(parent["children"]) for parent in result.data["mockParent"]] == [3] * 4
+    assert result.data["mockParent"][1]["children"][2] == {"values": [10.0, 11.0]}
+
+    # One statement per table, regardless of the number of parents and children
+    assert {table: len(statements) for table, statements in queries.items()} == {
+        "MockParent": 1,
+        "MockParent_children": 1,
+        "MockChild_values": 1,
+    }
+
+
+def test_projection():
+    db = _mock_db(
+        models=[MockRoot],
+        tables={"MockRoot": {"MockRoot_id": ["a"], "name": ["n"], "value": [1.0]}},
+    )
+    queries = _record_queries(db, tables=["MockRoot"])
+    schema = build_graphql_schema(db, max_workers=1)
+
+    result = asyncio.run(schema.execute("{ mockRoot { name } }"))
+
+    assert result.errors is None
+    assert result.data == {"mockRoot": [{"name": "n"}]}
+    assert '"MockRoot_id", t0.name' in queries["MockRoot"][-1]
+    assert "value" not in queries["MockRoot"][-1]
+
+    # Fields of fragments and inline fragments are selected as well
+    result = asyncio.run(
+        schema.execute(
+            """{ mockRoot { ...Values ... on MockRootType { id } } }
+            fragment Values on MockRootType { value }"""
+        )
+    )
+
+    assert result.errors is None
+    assert result.data == {"mockRoot": [{"value": 1.0, "id": "a"}]}
+    assert '"MockRoot_id", t0.value' in queries["MockRoot"][-1]
+    assert "name" not in queries["MockRoot"][-1]
+
+
+def test_projection_skips_sub_tables():
+    db = _nested_db()
+    queries = _record_queries(
+        db, tables=["MockParent", "MockParent_children", "MockChild_values"]
+    )
+
+    schema = build_graphql_schema(db, connection=True, max_workers=1)
+    result = asyncio.run(
+        schema.execute(
+            "{ mockParent { edges { node { ... on MockParentType { id } } } } }"
+        )
+    )
+
+    assert result.errors is None
+    assert len(result.data["mockParent"]["edges"]) == 4
+    assert len(queries["MockParent"]) == 1
+    assert queries["MockParent_children"] == [], "Unselected sub table was queried"
+    assert queries["MockChild_values"] == []
+
+    # Sub tables selected through a fragment are loaded
+    result = asyncio.run(
+        schema.execute(
+            """{ mockParent { edges { node { ...Children } } } }
+            fragment Children on MockParentType { children { id } }"""
+        )
+    )
+
+    assert result.errors is None
+    assert result.data["mockParent"]["edges"][0]["node"]["children"] == [
+        {"id": "p0c0"},
+        {"id": "p0c1"},
+        {"id": "p0c2"},
+    ]
+    assert len(queries["MockParent_children"]) == 1
+    assert queries["MockChild_values"] == []
+
+
+def _roots_db():
+    """Returns a connector holding two roots that share the MockChild sub model."""
+
+    return _mock_db(
+        models=[MockParent, MockOther, MockRoot],
+        tables={
+            "MockParent": {"MockParent_id": ["p"]},
+            "MockParent_children": {
+                "MockParent_children_id": ["c"],
+                "MockParent_id": ["p"],
+            },
+            "MockChild_values": {"values": [1.0], "MockParent_children_id": ["c"]},
+            "MockOther": {"MockOther_id": ["o"]},
+            "MockOther_items": {"MockOther_items_id": ["i"], "MockOther_id": ["o"]},
+            "MockRoot": {"MockRoot_id": ["r"], "name": ["n"], "value": [1.0]},
+        },
+    )
+
+
+def test_build_graphql_schema():
+    db = _roots_db()
+    schema = build_graphql_schema(db, max_workers=1)
+    sdl = schema.as_str()
+
+    # One list field per root table
+    assert "mockParent(id: String = null): [MockParentType!]!" in sdl
+    assert "mockOther(id: String = null): [MockOtherType!]!" in sdl
+    assert "mockRoot(id: String = null): [MockRootType!]!" in sdl
+    assert "mockChild" not in sdl, "Sub models are not root fields"
+
+    # Sub models used by several roots are converted once
+    assert sdl.count("type MockChildType {") == 1
+    assert "children: [MockChildType!]!" in sdl
+    assert "items: [MockChildType!]!" in sdl
+
+    result = asyncio.run(
+        schema.execute(
+            """{
+                mockParent { id children { __typename id values } }
+                mockOther(id: "o") { items { __typename id } }
+                mockRoot { name }
+            }"""
+        )
+    )
+
+    assert result.errors is None
+    assert result.data == {
+        "mockParent": [
+            {
+                "id": "p",
+                "children": [
+                    {"__typename": "MockChildType", "id": "c", "values": [1.0]}
+                ],
+            }
+        ],
+        "mockOther": [{"items": [{"__typename": "MockChildType", "id": "i"}]}],
+        "mockRoot": [{"name": "n"}],
+    }
+
+
+def test_build_graphql_schema_connections():
+    db = _roots_db()
+    schema = build_graphql_schema(db, connection=True, max_workers=1)
+    sdl = schema.as_str()
+
+    for name in ("MockParent", "MockOther", "MockRoot"):
+        field = name[0].lower() + name[1:]
+        assert (
+            f"{field}(first: Int! = 10, after: String = null, "
+            f"filter: {name}Filter = null): {name}Connection!"
+        ) in sdl
+
+    assert sdl.count("type MockChildType {") == 1
+
+    result = asyncio.run(
+        schema.execute(
+            """{
+                mockOther { edges { node { id items { id } } } totalCount }
+                mockRoot(filter: {name: {eq: "n"}}) { edges { node { value } } }
+            }"""
+        )
+    )
+
+    assert result.errors is None
+    assert result.data == {
+        "mockOther": {
+            "edges": [{"node": {"id": "o", "items": [{"id": "i"}]}}],
+            "totalCount": 1,
+        },
+        "mockRoot": {"edges": [{"node": {"value": 1.0}}]},
+    }
+
+
+def test_build_graphql_schema_without_models():
+    db = _mock_db(models=[], tables={})
+
+    with pytest.raises(ValueError, match="no models registered"):
+        build_graphql_schema(db)
+
+
+class MockStatistics:
+    """Connection that answers every query with a single value."""
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+        self.executed = []
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, query, params):
+        self.executed.append((str(query), params))
+        return self
+
+    def scalar(self):
+        return self.value
+
+
+def test_cost_estimator_statistics():
+    # Catalog statistics are read instead of counting the rows
+    connection = MockStatistics("postgres", 120.0)
+    estimator = _CostEstimator(SimpleNamespace(connection=connection), row_budget=100)
+
+    assert estimator._row_count("Parent_children") == 120
+    assert "pg_class" in connection.executed[0][0]
+    assert connection.executed[0][1] == {"name": '"Parent_children"'}
+
+    connection = MockStatistics("mysql", 7)
+    estimator = _CostEstimator(SimpleNamespace(connection=connection), row_budget=100)
+
+    assert estimator._row_count("Parent") == 7
+    assert "information_schema.tables" in connection.executed[0][0]
+    assert connection.executed[0][1] == {"name": "Parent"}
+
+    # Other backends and tables that have never been analyzed are counted
+    db = _nested_db()
+    estimator = _CostEstimator(db=db, row_budget=100)
+    assert estimator._row_count("MockParent_children") == 12
+
+    unanalyzed = SimpleNamespace(
+        connection=MockStatistics("postgres", -1.0), table=db.table
+    )
+    estimator = _CostEstimator(db=unanalyzed, row_budget=100)
+    assert estimator._row_count("MockChild_values") == 24
@@ -0,0 +1,267 @@
+import os
+import ibis
+import pytest
+import sqlalchemy as sa
+
+from typing import List, Optional
+from pydantic import Field, create_model
+from sdRDM import DataModel
+
+from sdrdm_database import tablecreator
+from sdrdm_database.dbconnector import DBConnector
+from sdrdm_database.migration import (
+    MigrationOperation,
+    MigrationPlan,
+    MigrationStep,
+    _added_foreign_key,
+    _backfill_column,
+    _diff_instructions,
+    apply_migration,
+)
+from sdrdm_database.tablecreator import _create_table_schema, create_tables
+
+
+Nested = create_model("Nested", name=(Optional[str], None))
+
+# Both versions share the name 'Root', which determines the table names
+OldRoot = create_model(
+    "Root",
+    value=(Optional[int], None),
+    removed=(Optional[str], None),
+    nested=(List[Nested], Field(default_factory=list)),
+)
+
+NewRoot = create_model(
+    "Root",
+    value=(Optional[float], None),
+    added=(Optional[str], None),
+    labels=(List[str], Field(default_factory=list)),
+)
+
+
+def test_diff_instructions():
+    old_instructions, new_instructions = [
+        _create_table_schema(
+            data_model=model,
+            table_name="Root",
+            schemes=[],
+        )
+        for model in (OldRoot, NewRoot)
+    ]
+
+    steps = _diff_instructions(old_instructions, new_instructions)
+
+    assert steps == [
+        MigrationStep(
+            operation=MigrationOperation.CREATE_TABLE,
+            table="Root_labels",
+        ),
+        MigrationStep(
+            operation=MigrationOperation.ALTER_COLUMN_TYPE,
+            table="Root",
+            column="value",
+            dtype="float64",
+            old_dtype="int64",
+        ),
+        MigrationStep(
+            operation=MigrationOperation.ADD_COLUMN,
+            table="Root",
+            column="added",
+            dtype="string",
+        ),
+        MigrationStep(
+            operation=MigrationOperation.DROP_COLUMN,
+            table="Root",
+            column="removed",
+            old_dtype="string",
+        ),
+        MigrationStep(
+            operation=MigrationOperation.DROP_TABLE,
+            table="Root_nested",
+        ),
+    ]
+
+
+def test_apply_migration_validation():
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    db_connector = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        dbtype="postgres",
+        host="localhost",
+        port=5432,
+    )
+    db_connector.connection = ibis.duckdb.connect()
+
+    instructions = _create_table_schema(
+        data_model=NewRoot,
+        table_name="Root",
+        schemes=[],
+    )
+
+    plan = MigrationPlan(
+        root="Root",
+        specifications={},
+        steps=[
+            MigrationStep(
+                operation=MigrationOperation.ADD_COLUMN,
+                table="Root",
+                column="added",
+                dtype="string",
+            )
+        ],
+    )
+    plan._instructions = instructions
+
+    # Backfilling None would never finish, since the rows remain empty
+    with pytest.raises(ValueError):
+        apply_migration(db_connector, plan, backfill={"Root": {"added": None}})
+
+    assert db_connector.connection.list_tables() == []
+
+    foreign_key = MigrationStep(
+        operation=MigrationOperation.ADD_COLUMN,
+        table="Root_labels",
+        column="Root_id",
+        dtype="key",
+    )
+    primary_key = MigrationStep(
+        operation=MigrationOperation.ADD_COLUMN,
+        table="Root",
+        column="Root_id",
+        dtype="key",
+    )
+    labels, root = instructions
+
+    assert _added_foreign_key(foreign_key, labels, "postgres") == ("Root", "Root_id")
+
+    with pytest.raises(ValueError):
+        _added_foreign_key(foreign_key, labels, "duckdb")
+
+    with pytest.raises(ValueError):
+        _added_foreign_key(primary_key, root, "postgres")
+
+
+def _sqlite_connector(tmp_path):
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    db_connector = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        dbtype="postgres",
+        host="localhost",
+        port=5432,
+    )
+    db_connector.connection = ibis.sqlite.connect(str(tmp_path / "test.db"))
+
+    return db_connector
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "duckdb"])
+def test_apply_migration(tmp_path, monkeypatch, backend):
+    db_connector = _sqlite_connector(tmp_path)
+
+    if backend == "duckdb":
+        db_connector.dbtype = "duckdb"
+        db_connector.connection = ibis.duckdb.connect()
+
+    # Specifications are not parsed, since the models are given as classes
+    monkeypatch.setattr(tablecreator, "convert_md_to_json", lambda md_content: "{}")
+
+    markdown_path = tmp_path / "model.md"
+    markdown_path.write_text("# Model")
+
+    old_model = create_model("Root", __base__=DataModel, name=(Optional[str], None))
+    new_model = create_model(
+        "Root",
+        __base__=DataModel,
+        name=(Optional[str], None),
+        added=(Optional[str], None),
+        labels=(List[str], Field(default_factory=list)),
+    )
+
+    create_tables(db_connector, old_model, markdown_path=str(markdown_path))
+    db_connector.connection.insert(
+        "Root",
+        [{"Root_id": str(index), "name": f"root-{index}"} for index in range(5)],
+    )
+
+    old_instructions, new_instructions = [
+        _create_table_schema(data_model=model, table_name="Root", schemes=[])
+        for model in (old_model, new_model)
+    ]
+
+    plan = MigrationPlan(
+        root="Root",
+        specifications="{}",
+        steps=_diff_instructions(old_instructions, new_instructions),
+    )
+    plan._instructions = new_instructions
+
+    # Columns that are not added by the plan are rejected before any change
+    with pytest.raises(ValueError):
+        apply_migration(db_connector, plan, backfill={"Root": {"name": "unknown"}})
+
+    assert sorted(db_connector.connection.list_tables()) == ["Root", "__model_meta__"]
+
+    apply_migration(
+        db_connector, plan, backfill={"Root": {"added": "new"}}, batch_size=2
+    )
+
+    assert "Root_labels" in db_connector.connection.list_tables()
+    assert "added" in db_connector.connection.table("Root").columns
+
+    with db_connector.connection.begin() as bind:
+        rows = bind.execute(sa.text('SELECT added FROM "Root"')).fetchall()
+
+    assert [row[0] for row in rows] == ["new"] * 5
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "duckdb"])
+def test_backfill_column_without_primary_key(tmp_path, backend):
+    db_connector = _sqlite_connector(tmp_path)
+
+    if backend == "duckdb":
+        db_connector.connection = ibis.duckdb.connect()
+
+    with db_connector.connection.begin() as bind:
+        bind.execute(
+            sa.text('CREATE TABLE "Root_labels" (labels VARCHAR, "Root_id" VARCHAR)')
+        )
+        bind.execute(
+            sa.text(
+                "INSERT INTO \"Root_labels\" VALUES (NULL, 'a'), (NULL, 'b'), (NULL, 'c')"
+            )
+        )
+
+    instruction = {"name": "Root_labels", "primary_key": None, "is_primitive": True}
+
+    # Rows of tables without primary key are addressed by their row id
+    statements = []
+    sa.event.listen(
+        db_connector.connection.con,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    _backfill_column(
+        db_connector=db_connector,
+        table_name="Root_labels",
+        column="labels",
+        value="label",
+        instruction=instruction,
+        batch_size=2,
+    )
+
+    assert (
+        len([statement for statement in statements if statement.startswith("UPDATE")])
+        == 2
+    )
+
+    with db_connector.connection.begin() as bind:
+        rows = bind.execute(sa.text('SELECT labels FROM "Root_labels"')).fetchall()
+
+    assert [row[0] for row in rows] == ["label"] * 3
@@ -0,0 +1,19 @@
+import os
+
+from sdrdm_database.modelutils import _specifications_hash, get_cache_dir
+
+
+def test_specifications_hash():
+    first = _specifications_hash({"a": 1, "b": [1, 2]}, "Test")
+    second = _specifications_hash({"b": [1, 2], "a": 1}, "Test")
+
+    assert first == second, "Hash depends on key order"
+    assert first != _specifications_hash({"a": 1, "b": [1, 2]}, "Other")
+    assert first != _specifications_hash({"a": 2, "b": [1, 2]}, "Test")
+
+
+def test_get_cache_dir(monkeypatch):
+    monkeypatch.setenv("SDRDM_DB_CACHE_DIR", "/tmp/sdrdm_cache")
+
+    assert get_cache_dir() == "/tmp/sdrdm_cache"
+    assert get_cache_dir("~/cache") == os.path.expanduser("~/cache")
@@ -1,13 +1,33 @@
-from functools import partial
-from typing import Optional
-from pydantic import BaseModel
+import git
+import os
+from typing import List, Optional
+from pydantic import BaseModel, Field, create_model
+from sdRDM import DataModel
+import ibis
 import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql as mysql_dialect, postgresql
+from sdrdm_database import tablecreator
+from sdrdm_database.arrays import ArrayStorage
 from sdrdm_database.dbconnector import DBConnector
 from sdrdm_database.tablecreator import (
     _create_table_schema,
+    _existing_key_type,
+    _fetch_specs,
     _map_type,
     _populate_schema,
     _handle_foreign_keys,
+    _index_name,
+    _key_type,
+    _parent_id_indexes,
+    _resolve_ref,
+    _to_sqla_table,
+    _validate_array_storage,
+    _validate_index,
+    create_tables,
+    KEY_TYPE,
+    MAX_IDENTIFIER_LENGTH,
+    TableIndex,
 )
 
 
@@ -16,6 +36,52 @@ class MockDataModel(BaseModel):
     bar: Optional[int] = None
 
 
+class MockChild(DataModel):
+    name: Optional[str] = None
+
+
+class MockRoot(DataModel):
+    name: Optional[str] = None
+    children: List[MockChild] = Field(default_factory=list)
+
+
+class MockOther(DataModel):
+    name: Optional[str] = None
+
+
+# Tables of an extended model share the name of the existing ones
+MockExtendedRoot = create_model(
+    "MockRoot",
+    __base__=MockRoot,
+    others=(List[MockOther], Field(default_factory=list)),
+)
+
+
+def _create_tables_connector(tmp_path, monkeypatch):
+    """Returns a connector to an empty SQLite database and the path of a model."""
+
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    # Specifications are not parsed, since the model is given as a class
+    monkeypatch.setattr(tablecreator, "convert_md_to_json", lambda md_content: "{}")
+
+    db = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        host="localhost",
+        port=5432,
+        dbtype="postgres",
+    )
+
+    db.connection = ibis.sqlite.connect(str(tmp_path / "test.db"))
+
+    markdown_path = tmp_path / "model.md"
+    markdown_path.write_text("# Model")
+
+    return db, str(markdown_path)
+
+
 def test_map_type():
     # Test mapping of integer type
     assert _map_type(int, True) == "!int64", "Wrong mapping of mandatory integer type"
@@ -55,75 +121,425 @@ def test_populate_schema():
 
 
 def test_handle_foreign_keys():
-    db_connector = DBConnector(
-        db_name="Test",
-        username="root",
-        password="root",
-        dbtype="mysql",
-        host="localhost",
-        port=3306,
-    )
-
     parent = "parent"
     table_name = "table_name"
-    fk_commands = []
+    foreign_keys = []
 
     _handle_foreign_keys(
         parent=parent,
         table_name=table_name,
-        db_connector=db_connector,
-        fk_commands=fk_commands,
+        foreign_keys=foreign_keys,
     )
 
-    expected_kwargs = {
-        "table_name": table_name,
+    expected = {
         "foreign_key": f"{parent}_id",
         "reference_table": "parent",
         "reference_column": f"{parent}_id",
-        "dbconnector": db_connector,
     }
 
-    assert fk_commands[0].keywords == expected_kwargs
-    assert fk_commands[0].func == db_connector.__commands__.add_foreign_key
+    assert foreign_keys == [expected]
 
 
 def test_create_table_schema():
-    db_connector = DBConnector(
-        db_name="Test",
-        username="root",
-        password="root",
-        dbtype="mysql",
-        host="localhost",
-        port=3306,
-    )
-
     data_model = MockDataModel
     table_name = "table_name"
     schemes = []
 
     result = _create_table_schema(
-        db_connector=db_connector,
         data_model=data_model,
         table_name=table_name,
         schemes=schemes,
     )
 
-    pk_command = result[0].pop("pk_command")
-    expected_pk = partial(
-        db_connector.__commands__.add_primary_key,
-        table_name=table_name,
-        primary_key=f"{table_name}_id",
-        dbconnector=db_connector,
-    )
-
     expected_schema = {
         "name": "table_name",
         "schema": {"foo": "!string", "bar": "int64"},
-        "fk_commands": [],
+        "primary_key": f"{table_name}_id",
+        "foreign_keys": [],
         "is_primitive": False,
         "obj_name": "MockDataModel",
     }
 
     assert result == [expected_schema]
-    assert pk_command.keywords == expected_pk.keywords
-    assert pk_command.func == expected_pk.func
+
+
+def test_array_storage():
+    class MockArrayModel(BaseModel):
+        values: List[float] = Field(default_factory=list)
+        labels: List[str] = Field(default_factory=list)
+
+    db_connector = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        dbtype="mysql",
+        host="localhost",
+        port=3306,
+    )
+
+    def schemas(array_storage):
+        instructions = _create_table_schema(
+            data_model=MockArrayModel,
+            table_name="Root",
+            schemes=[],
+            array_storage=array_storage,
+        )
+
+        return {
+            instruction["name"]: instruction["schema"] for instruction in instructions
+        }
+
+    assert schemas(ArrayStorage.TABLE) == {
+        "MockArrayModel_values": {"values": "!float64"},
+        "MockArrayModel_labels": {"labels": "!string"},
+        "Root": {},
+    }
+
+    assert schemas(ArrayStorage.NATIVE) == {
+        "Root": {"values": "array<float64>", "labels": "array<string>"},
+    }
+
+    # Binary storage only applies to numeric and boolean lists
+    assert schemas(ArrayStorage.BINARY) == {
+        "MockArrayModel_labels": {"labels": "!string"},
+        "Root": {"values": "binary"},
+    }
+
+    with pytest.raises(ValueError):
+        _validate_array_storage(
+            db_connector=db_connector,
+            array_storage=ArrayStorage.NATIVE,
+        )
+
+
+def test_to_sqla_table():
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    db_connector = DBConnector(
+        db_name="Test",
+        username="root",
+        password="root",
+        dbtype="postgres",
+        host="localhost",
+        port=5432,
+    )
+    db_connector.connection = ibis.sqlite.connect()
+
+    class MockParent(BaseModel):
+        child: Optional[MockDataModel] = None
+
+    instructions = _create_table_schema(
+        data_model=MockParent,
+        table_name="MockParent",
+        schemes=[],
+    )
+
+    metadata = sa.MetaData()
+    parent, child = [
+        _to_sqla_table(
+            db_connector=db_connector,
+            metadata=metadata,
+            instruction=instruction,
+        )
+        for instruction in instructions[::-1]
+    ]
+
+    assert [column.name for column in parent.primary_key] == ["MockParent_id"]
+    assert [column.name for column in child.primary_key] == ["MockParent_child_id"]
+    assert [fk.target_fullname for fk in child.c["MockParent_id"].foreign_keys] == [
+        "MockParent.MockParent_id"
+    ]
+    assert child.c["foo"].nullable is False
+
+
+def test_native_keys():
+    os.environ["TESTING_STAGE"] = "unit_tests"
+
+    def connector(dbtype):
+        db_connector = DBConnector(
+            db_name="Test",
+            username="root",
+            password="root",
+            dbtype=dbtype,
+            host="localhost",
+        )
+        db_connector.connection = ibis.sqlite.connect()
+
+        return db_connector
+
+    postgres, mysql = connector("postgres"), connector("mysql")
+
+    assert _key_type(db_connector=postgres, native_keys=False) is KEY_TYPE
+
+    class MockParent(BaseModel):
+        child: Optional[MockDataModel] = None
+
+    instructions = _create_table_schema(
+        data_model=MockParent,
+        table_name="MockParent",
+        schemes=[],
+    )
+
+    for db_connector, dialect, expected in [
+        (postgres, postgresql.dialect(), "UUID"),
+        (mysql, mysql_dialect.dialect(), "BINARY(16)"),
+    ]:
+        metadata = sa.MetaData()
+        _, child = [
+            _to_sqla_table(
+                db_connector=db_connector,
+                metadata=metadata,
+                instruction=instruction,
+                key_type=_key_type(db_connector=db_connector, native_keys=True),
+            )
+            for instruction in instructions[::-1]
+        ]
+
+        for column in ["MockParent_child_id", "MockParent_id"]:
+            assert child.c[column].type.compile(dialect=dialect) == expected
+
+    # SQLite has no commands and thus cannot be instantiated directly
+    sqlite = connector("postgres")
+    sqlite.dbtype = "sqlite"
+
+    with pytest.raises(ValueError):
+        _key_type(db_connector=sqlite, native_keys=True)
+
+
+def test_indexes():
+    class MockParent(BaseModel):
+        child: Optional[MockDataModel] = None
+
+    instructions = _create_table_schema(
+        data_model=MockParent,
+        table_name="MockParent",
+        schemes=[],
+    )
+
+    assert _parent_id_indexes(instructions) == [
+        TableIndex(table="MockParent_child", columns=["MockParent_id"])
+    ]
+
+    _validate_index(
+        spec=TableIndex(table="MockParent_child", columns=["foo", "MockParent_id"]),
+        instructions=instructions,
+    )
+
+    with pytest.raises(ValueError):
+        _validate_index(
+            spec=TableIndex(table="MockParent_child", columns=["unknown"]),
+            instructions=instructions,
+        )
+
+    with pytest.raises(ValueError):
+        _validate_index(
+            spec=TableIndex(table="unknown", columns=["foo"]),
+            instructions=instructions,
+        )
+
+    assert _index_name("table", ["a", "b"]) == "ix_table_a_b"
+    assert len(_index_name("t" * 100, ["a"])) == MAX_IDENTIFIER_LENGTH
+
+
+def test_fetch_specs(tmp_path):
+    repo_dir = tmp_path / "repo"
+    spec_path = repo_dir / "specifications" / "model.md"
+    spec_path.parent.mkdir(parents=True)
+
+    repo = git.Repo.init(repo_dir)
+    author = git.Actor("Test", "test@example.com")
+
+    spec_path.write_text("# Version 1")
+    repo.index.add([str(spec_path)])
+    first = repo.index.commit("v1", author=author, committer=author).hexsha
+
+    spec_path.write_text("# Version 2")
+    repo.index.add([str(spec_path)])
+    second = repo.index.commit("v2", author=author, committer=author).hexsha
+
+    cache_dir = str(tmp_path / "cache")
+    url = str(repo_dir)
+
+    assert _fetch_specs(url, cache_dir=cache_dir) == ("# Version 2", second)
+    assert _fetch_specs(url, ref=first, cache_dir=cache_dir) == ("# Version 1", first)
+
+    # Cached specifications are available without the repository
+    repo_dir.rename(tmp_path / "moved")
+
+    assert _fetch_specs(url, cache_dir=cache_dir) == ("# Version 2", second)
+    assert _fetch_specs(url, ref=first, cache_dir=cache_dir) == ("# Version 1", first)
+
+    with pytest.raises(ValueError):
+        _fetch_specs(url, ref="unknown", cache_dir=cache_dir)
+
+
+def test_resolve_ref(tmp_path):
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+
+    repo = git.Repo.init(repo_dir)
+    author = git.Actor("Test", "test@example.com")
+
+    # Annotated tags are signed by the configured user
+    with repo.config_writer() as config:
+        config.set_value("user", "name", author.name)
+        config.set_value("user", "email", author.email)
+
+    first = repo.index.commit("v1", author=author, committer=author).hexsha
+    second = repo.index.commit("v2", author=author, committer=author).hexsha
+
+    repo.create_tag("v1", ref=first, message="Version 1")
+    repo.create_head("feature/v1", commit=second)
+    repo.create_head("both", commit=first)
+    repo.create_tag("both", ref=second)
+
+    url, cache_dir = str(repo_dir), str(tmp_path / "cache")
+
+    # Annotated tags resolve to their commit, not to branches sharing the suffix
+    assert _resolve_ref(url, "v1", cache_dir) == first
+    assert _resolve_ref(url, "feature/v1", cache_dir) == second
+    assert _resolve_ref(url, "refs/tags/both", cache_dir) == second
+
+    with pytest.raises(ValueError, match="ambiguous"):
+        _resolve_ref(url, "both", cache_dir)
+
+    with pytest.raises(ValueError, match="not found"):
+        _resolve_ref(url, "v", cache_dir)
+
+
+def test_fetch_specs_not_a_tip(tmp_path, monkeypatch):
+    work_dir = tmp_path / "work"
+    spec_path = work_dir / "specifications" / "model.md"
+    spec_path.parent.mkdir(parents=True)
+
+    repo = git.Repo.init(work_dir)
+    author = git.Actor("Test", "test@example.com")
+
+    spec_path.write_text("# Version 1")
+    repo.index.add([str(spec_path)])
+    first = repo.index.commit("v1", author=author, committer=author).hexsha
+
+    spec_path.write_text("# Version 2")
+    repo.index.add([str(spec_path)])
+    repo.index.commit("v2", author=author, committer=author)
+
+    bare_dir = tmp_path / "bare.git"
+    repo.clone(str(bare_dir), bare=True)
+
+    # Protocol version 0 only serves commits that are the tip of a branch or tag
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", "protocol.version")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "0")
+
+    with pytest.raises(git.GitCommandError):
+        git.Repo.init(tmp_path / "shallow").git.fetch(str(bare_dir), first, depth=1)
+
+    assert _fetch_specs(
+        str(bare_dir), ref=first, cache_dir=str(tmp_path / "cache")
+    ) == ("# Version 1", first)
+
+
+def test_create_tables_indexes(tmp_path, monkeypatch):
+    db, markdown_path = _create_tables_connector(tmp_path, monkeypatch)
+
+    # Record which indexes are created in which mode
+    calls = []
+    create_indexes = tablecreator._create_indexes
+
+    def _recording_create_indexes(bind, specs, dbtype, concurrently=False):
+        calls.append(
+            (
+                [spec.table for spec in specs],
+                concurrently,
+                bind.get_execution_options().get("isolation_level"),
+            )
+        )
+        return create_indexes(bind, specs, dbtype, concurrently=concurrently)
+
+    monkeypatch.setattr(tablecreator, "_create_indexes", _recording_create_indexes)
+
+    create_tables(db, MockRoot, markdown_path=markdown_path)
+
+    # Indexes of new tables are created within the transaction
+    assert calls == [(["MockRoot_children"], False, None)]
+
+    calls.clear()
+    create_tables(
+        db,
+        MockRoot,
+        markdown_path=markdown_path,
+        indexes=[TableIndex(table="MockRoot", columns=["name"])],
+    )
+
+    # Indexes of existing tables are built concurrently outside of it
+    assert calls == [
+        ([], False, None),
+        (["MockRoot_children", "MockRoot"], True, "AUTOCOMMIT"),
+    ]
+
+    inspector = sa.inspect(db.connection.con)
+    assert [index["name"] for index in inspector.get_indexes("MockRoot")] == [
+        "ix_MockRoot_name"
+    ]
+
+
+def test_create_tables_existing_duckdb(tmp_path, monkeypatch):
+    db, markdown_path = _create_tables_connector(tmp_path, monkeypatch)
+    db.dbtype = "duckdb"
+    db.connection = ibis.duckdb.connect()
+
+    create_tables(db, MockRoot, markdown_path=markdown_path)
+
+    # DuckDB does not support AUTOCOMMIT, thus indexes of existing tables use a transaction
+    create_tables(
+        db,
+        MockRoot,
+        markdown_path=markdown_path,
+        indexes=[TableIndex(table="MockRoot", columns=["name"])],
+    )
+
+    with db.connection.begin() as bind:
+        indexes = bind.exec_driver_sql(
+            "SELECT index_name FROM duckdb_indexes() WHERE table_name = 'MockRoot'"
+        ).fetchall()
+
+    assert indexes == [("ix_MockRoot_name",)]
+
+
+def test_create_tables_existing_key_type(tmp_path, monkeypatch):
+    db, markdown_path = _create_tables_connector(tmp_path, monkeypatch)
+
+    create_tables(db, MockRoot, markdown_path=markdown_path)
+    tables = sorted(db.connection.list_tables())
+
+    # New tables cannot reference existing keys of another type
+    with pytest.raises(ValueError, match="without native keys"):
+        create_tables(
+            db, MockExtendedRoot, markdown_path=markdown_path, native_keys=True
+        )
+
+    assert sorted(db.connection.list_tables()) == tables
+
+    create_tables(db, MockExtendedRoot, markdown_path=markdown_path)
+
+    columns = sa.inspect(db.connection.con).get_columns("MockRoot_others")
+    assert {column["name"]: str(column["type"]) for column in columns}[
+        "MockRoot_id"
+    ] == "VARCHAR(36)"
+
+    # Keys stored as UUID are used for new tables, if requested
+    db.connection = ibis.duckdb.connect()
+
+    with db.connection.begin() as bind:
+        bind.exec_driver_sql('CREATE TABLE "MockRoot" ("MockRoot_id" UUID)')
+
+    instructions = _create_table_schema(
+        data_model=MockRoot, table_name="MockRoot", schemes=[]
+    )
+
+    assert isinstance(
+        _existing_key_type(db, instructions, ["MockRoot"], sa.Uuid()), sa.Uuid
+    )
+
+    with pytest.raises(ValueError, match="with native keys"):
+        _existing_key_type(db, instructions, ["MockRoot"], KEY_TYPE)